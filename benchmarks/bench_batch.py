@@ -0,0 +1,53 @@
+"""GameController で 1 試合ずつ回す場合と BatchEngine でまとめて回す場合の試合/秒を比較する。
+
+    python benchmarks/bench_batch.py [試合数]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pcrb'))
+
+from batch import BatchEngine
+from controller import GameController
+from robot import Robot
+from table_robots.robot_06_tactician import robot_logic as logic_a
+from table_robots.robot_07_basic_bot import robot_logic as logic_b
+
+
+def python_only(logic):
+    """batch_policy を使わず、試合ごとに robot_logic を呼ばせるためのラッパー"""
+    def wrapper(robot, game_info, memos):
+        return logic(robot, game_info, memos)
+    return wrapper
+
+
+def run_controller(matches):
+    start = time.perf_counter()
+    for seed in range(matches):
+        controller = GameController(max_turn=100, headless=True, seed=seed, cycle_detection=False)
+        controller.set_robots(
+            Robot("Robot A", 1, 3, logic_a, controller), Robot("Robot B", 7, 3, logic_b, controller))
+        controller.game_loop()
+    return matches / (time.perf_counter() - start)
+
+
+def run_batch(matches, logic1, logic2):
+    start = time.perf_counter()
+    BatchEngine(matches, seeds=range(matches)).run(logic1, logic2)
+    return matches / (time.perf_counter() - start)
+
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    single = run_controller(min(matches, 1000))
+    python_bots = run_batch(min(matches, 1000), python_only(logic_a), python_only(logic_b))
+    vector_bots = run_batch(matches, logic_a, logic_b)  # ルール表ボットは batch_policy を持つ
+
+    print(f"controller           : {single:12.0f} matches/sec")
+    print(f"batch (robot_logic)  : {python_bots:12.0f} matches/sec ({python_bots / single:.1f}x)")
+    print(f"batch (batch_policy) : {vector_bots:12.0f} matches/sec ({vector_bots / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
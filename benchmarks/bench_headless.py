@@ -0,0 +1,53 @@
+"""従来の game_loop（print + ファイル出力）とヘッドレスモードのターン/秒を比較する。
+
+    python benchmarks/bench_headless.py [試合数]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pcrb'))
+
+from controller import GameController
+from robot import Robot
+from robots.robot_06_tactician import robot_logic as logic_a
+from robots.robot_07_basic_bot import robot_logic as logic_b
+from sinks import BufferSink
+
+
+def run(matches, **controller_kwargs):
+    turns = 0
+    start = time.perf_counter()
+    for _ in range(matches):
+        controller = GameController(max_turn=100, **controller_kwargs)
+        robot1 = Robot("Robot A", 1, 3, logic_a, controller)
+        robot2 = Robot("Robot B", 7, 3, logic_b, controller)
+        controller.set_robots(robot1, robot2)
+        controller.game_loop()
+        turns += controller.turn
+    return turns / (time.perf_counter() - start)
+
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                legacy = run(matches)
+        finally:
+            os.chdir(cwd)
+    buffered = run(matches, sink=BufferSink())
+    headless = run(matches, headless=True)
+
+    print(f"legacy   : {legacy:12.0f} turns/sec")
+    print(f"buffer   : {buffered:12.0f} turns/sec ({buffered / legacy:.1f}x)")
+    print(f"headless : {headless:12.0f} turns/sec ({headless / legacy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
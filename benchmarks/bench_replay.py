@@ -0,0 +1,66 @@
+"""replay の HP 列を多数のファイルから読み込む速さを、NDJSON と列指向バイナリ形式（binreplay）で比較する。
+
+    python benchmarks/bench_replay.py [ファイル数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pcrb'))
+
+import binreplay
+from binreplay import BinaryReplay
+from controller import GameController
+from replay import ReplayWriter, load_replay
+from robot import Robot
+from robots.robot_06_tactician import robot_logic as logic_a
+from robots.robot_07_basic_bot import robot_logic as logic_b
+
+
+def play(seed):
+    controller = GameController(max_turn=100, headless=True, seed=seed, cycle_detection=False)
+    controller.set_robots(Robot("Robot A", 1, 3, logic_a, controller), Robot("Robot B", 7, 3, logic_b, controller))
+    return controller.game_loop()[1]
+
+
+def write_files(directory, count):
+    games = [play(seed) for seed in range(min(count, 100))]
+    json_paths, binary_paths = [], []
+    for index in range(count):
+        game_state = games[index % len(games)]
+        json_path = os.path.join(directory, f"{index}.ndjson")
+        writer = ReplayWriter(json_path)
+        writer.header(game_state[0])
+        for entry in game_state[1:]:
+            writer.turn(entry)
+        writer.close()
+        binary_path = os.path.join(directory, f"{index}.pcrb")
+        binreplay.write(binary_path, game_state)
+        json_paths.append(json_path)
+        binary_paths.append(binary_path)
+    return json_paths, binary_paths
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    with tempfile.TemporaryDirectory() as directory:
+        json_paths, binary_paths = write_files(directory, count)
+        json_size = sum(os.path.getsize(path) for path in json_paths)
+        binary_size = sum(os.path.getsize(path) for path in binary_paths)
+
+        start = time.perf_counter()
+        json_hp = [[entry["robots"][0]["hp"] for entry in load_replay(path)[1:]] for path in json_paths]
+        json_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        binary_hp = [BinaryReplay(path).column("hp")[:, 0] for path in binary_paths]
+        binary_time = time.perf_counter() - start
+        assert [list(hp) for hp in binary_hp[:10]] == json_hp[:10]
+
+    print(f"ndjson : {json_time:8.3f} sec, {json_size / 1e6:8.1f} MB")
+    print(f"binary : {binary_time:8.3f} sec, {binary_size / 1e6:8.1f} MB ({json_time / binary_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
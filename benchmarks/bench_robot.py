@@ -0,0 +1,30 @@
+"""Robot の生成コストと属性アクセスのコストを計測する。
+
+    python benchmarks/bench_robot.py [回数]
+"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pcrb'))
+
+from controller import GameController
+from robot import Robot
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    controller = GameController(headless=True)
+    robot = Robot("Robot A", 1, 3, None, controller)
+
+    construct = timeit.timeit(lambda: Robot("Robot A", 1, 3, None, controller), number=number)
+    access = timeit.timeit(lambda: (robot.hp, robot.sp, robot.position, robot.parry.is_active), number=number)
+    action = timeit.timeit(lambda: (robot.parry.is_active, robot.attack.cost), number=number)
+
+    print(f"construct : {construct / number * 1e6:8.2f} us/robot")
+    print(f"access    : {access / number * 1e6:8.2f} us/(hp, sp, position, parry.is_active)")
+    print(f"action    : {action / number * 1e6:8.2f} us/(parry.is_active, attack.cost)")
+
+
+if __name__ == "__main__":
+    main()
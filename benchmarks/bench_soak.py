@@ -0,0 +1,84 @@
+"""ソークモード（``GameController(soak=True)``）の長時間試合のターン/秒とピーク RSS を計測する。
+
+    python benchmarks/bench_soak.py [ターン数...]
+
+ターン数ごとに別プロセスで 1 試合を行い、ヘッドレス・ソークモード・ソークモード + ログ出力
+（``sinks.RotatingFileSink``）・ソークモード + 局面のハッシュ（``hash_states=True``）を比較する。
+ソークモードではピーク RSS がターン数によらずほぼ一定になり、最後にターン数を増やしたときの RSS の増加を表示する
+（ターン数に比例して増えるものがあればここで分かる）。
+"""
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'pcrb'))
+
+from controller import GameController
+from robot import Robot
+from sinks import RotatingFileSink
+
+MODES = ("headless", "soak", "soak+log", "soak+hash")
+SOAK_RSS_GROWTH_MB = 4.0  # ソークモードで許容するピーク RSS の増加
+
+
+def walker_with_memo(robot, game_info, memos):
+    # 倒れずに最後まで続き、毎ターンメモを書くロボット
+    return random.choice(["left", "right", "rest"]), {"turn": game_info["turn"]}
+
+
+def run(max_turn, mode, workdir):
+    if mode == "headless":
+        controller = GameController(max_turn=max_turn, headless=True, seed=1)
+    elif mode == "soak":
+        controller = GameController(max_turn=max_turn, headless=True, seed=1, soak=True)
+    elif mode == "soak+hash":
+        controller = GameController(max_turn=max_turn, headless=True, seed=1, soak=True, hash_states=True)
+    else:
+        sink = RotatingFileSink(
+            os.path.join(workdir, "game_log.txt"), os.path.join(workdir, "game_state.ndjson"),
+            max_bytes=4 * 1024 * 1024, backup_count=2)
+        controller = GameController(max_turn=max_turn, sink=sink, seed=1, soak=True)
+    controller.set_robots(
+        Robot("Robot A", 1, 3, walker_with_memo, controller),
+        Robot("Robot B", 7, 3, walker_with_memo, controller),
+    )
+    start = time.perf_counter()
+    controller.game_loop()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux では KB 単位
+    return controller.turn / elapsed, peak_mb
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        with tempfile.TemporaryDirectory() as workdir:
+            turns_per_sec, peak_mb = run(int(sys.argv[2]), sys.argv[3], workdir)
+        print(f"{turns_per_sec} {peak_mb}")
+        return
+
+    turn_counts = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    growth = {}
+    for mode in MODES:
+        peaks = []
+        for max_turn in turn_counts:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", str(max_turn), mode],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            turns_per_sec, peak_mb = map(float, output.split())
+            peaks.append(peak_mb)
+            print(f"{mode:9s} {max_turn:>10,d} turns : {turns_per_sec:10.0f} turns/sec, peak RSS {peak_mb:7.1f} MB")
+        growth[mode] = peaks[-1] - peaks[0]
+
+    for mode in MODES:
+        if mode.startswith("soak"):
+            verdict = "ok" if growth[mode] <= SOAK_RSS_GROWTH_MB else "GROWS WITH TURNS"
+            print(f"{mode:9s} peak RSS growth {growth[mode]:+6.1f} MB : {verdict}")
+
+
+if __name__ == "__main__":
+    main()
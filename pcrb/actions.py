@@ -1,319 +1,478 @@
 from abc import ABC
 from abc import abstractmethod
+from collections import namedtuple
 
+import events
+from registry import ACTIONS
 from utils import is_adjacent
 
 
 class Action(ABC):
-    def __init__(self, actor, controller, **kwargs):
-        super().__init__()
-        self.actor = actor
-        self.controller = controller
+    """行動ルール。
+
+    各サブクラスはレジストリ登録時に 1 つだけインスタンス化され、全ロボットで共有される。
+    ロボットごとの可変状態（フラグ・クールダウン・罠）は ``actor.state``（robot.RobotState）
+    に置き、ルールオブジェクト自体は状態を持たない。
+    """
+    # 行動レジストリへの登録情報（サブクラスで上書き）
+    action_names = ()  # robot_logic が返す行動名
+    robot_attr = None  # Robot 上の属性名
+    call_style = "self"  # "target" / "name" / "self"（registry.ActionSpec 参照）
+    highlight = "self"  # 描画時のハイライト形状
+    marker = None  # 描画キー（省略時は robot_attr）
+    # ``robot.<attr>.<name>`` で参照できる RobotState のフィールド（name -> フィールド名）
+    state_fields = {}
+    # 同時手番モードで解決する段階（小さい順。simultaneous.py 参照）
+    simultaneous_phase = 0
+    # call_style が "target" の行動が対象に取れる敵までの距離（arena.Arena が空間インデックスで探す）
+    target_distance = None
+    # ルールセット（ruleset.Ruleset）で変えられる数値パラメータ名。クラス属性の値が既定値になる
+    parameters = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.Params = namedtuple(f"{cls.__name__}Params", cls.parameters)
+        if cls.action_names:
+            ACTIONS.register(cls)
 
     @abstractmethod
-    def __call__(self, **kwargs):
+    def __call__(self, actor, *args):
         """行動を実行するメソッド（子クラスで実装が必要）"""
         pass
 
+    def params(self, controller):
+        """``controller`` のルールセットでのこの行動のパラメータ（``Params``）"""
+        return getattr(controller.ruleset, self.robot_attr)
+
+    def sp_horizon(self, params=None):
+        """これ以上の SP ではルールの挙動が変わらない値（cycle.CycleDetector が使う）"""
+        return getattr(self if params is None else params, "cost", 0)
+
 
 class Attack(Action):
+    action_names = ("attack",)
+    robot_attr = "attack"
+    call_style = "target"
+    highlight = "adjacent"
+    simultaneous_phase = 4
+    target_distance = 1
+
+    parameters = ("power", "cost")
     power = 20
     cost = 10
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-
-    def __call__(self, target, turn):
-        if self.actor.sp >= self.cost:
-            if is_adjacent(self.actor, target):
+    def __call__(self, actor, target, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        if actor.sp >= params.cost:
+            if is_adjacent(actor, target):
                 if target.is_parrying():
-                    self.actor.stun(1)
+                    actor.stun(1)
+                    if controller.events is not None:
+                        controller.events.emit(turn, events.PARRY_STUN, actor, target)
                 else:
-                    damage = target.receive_attack(self.power)
-                    self.actor.use_sp(self.cost)
-                    self.controller.log_action(turn, f"{self.actor.name} attacks {target.name} at ({target.x}, {target.y}) for {damage} damage.")
+                    damage = target.receive_attack(params.power)
+                    actor.use_sp(params.cost)
+                    if controller.events is not None:
+                        controller.events.emit(
+                            turn, events.ATTACK_HIT, actor, target, x=target.x, y=target.y, amount=damage)
             else:
-                self.controller.log_action(turn, f"{self.actor.name} tried to attack a non-adjacent location.")
+                if controller.events is not None:
+                    controller.events.emit(turn, events.ATTACK_OUT_OF_RANGE, actor, target)
         else:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to attack!")
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["attack"])
 
 
 class Move(Action):
-    cost = 5
+    action_names = ("up", "down", "left", "right")
+    robot_attr = "move"
+    call_style = "name"
+    highlight = "step"
+    simultaneous_phase = 1
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
+    parameters = ("cost",)
+    cost = 5
 
-    def __call__(self, direction, turn):
-        if self.actor.sp < self.cost:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to move!")
+    def __call__(self, actor, direction, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        if actor.sp < params.cost:
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["move"])
             return
 
         # 移動先の座標を計算
-        if direction == "up":
-            new_x, new_y = self.actor.x, max(0, self.actor.y - 1)
-        elif direction == "down":
-            new_x, new_y = self.actor.x, min(self.controller.y_max - 1, self.actor.y + 1)
-        elif direction == "left":
-            new_x, new_y = max(0, self.actor.x - 1), self.actor.y
-        elif direction == "right":
-            new_x, new_y = min(self.controller.x_max - 1, self.actor.x + 1), self.actor.y
-        else:
-            self.controller.log_action(turn, f"{self.actor.name} tried to move in an invalid direction.")
+        target = self.target(actor, direction)
+        if target is None:
+            if controller.events is not None:
+                controller.events.emit(turn, events.MOVE_INVALID, actor)
+            return
+        new_x, new_y = target
+
+        if controller.board.is_wall(new_x, new_y):
+            if controller.events is not None:
+                controller.events.emit(turn, events.MOVE_WALL, actor, x=new_x, y=new_y)
             return
 
         # 移動先に他のロボットがいないかチェック
-        if self.controller.is_position_occupied(new_x, new_y):
-            self.controller.log_action(
-                turn, f"{self.actor.name} tried to move to ({new_x}, {new_y}), but the path is blocked.")
+        if controller.is_position_occupied(new_x, new_y):
+            if controller.events is not None:
+                controller.events.emit(turn, events.MOVE_BLOCKED, actor, x=new_x, y=new_y)
         else:
-            self.actor.set_position(new_x, new_y)
-            self.actor.use_sp(self.cost)
-            self.controller.log_action(
-                turn, f"{self.actor.name} moved {direction} to ({self.actor.x}, {self.actor.y}), HP: {self.actor.hp}, SP: {self.actor.sp}")
+            actor.set_position(new_x, new_y)
+            actor.use_sp(params.cost)
+            if controller.events is not None:
+                controller.events.emit(
+                    turn, events.MOVE, actor, arg=events.DIRECTION_INDEX[direction], x=actor.x, y=actor.y,
+                    amount=actor.hp, extra=actor.sp)
+
+    def target(self, actor, direction):
+        """移動先の座標（盤外は端に丸める）。不正な方向なら None"""
+        controller = actor.controller
+        if direction == "up":
+            return actor.x, max(0, actor.y - 1)
+        if direction == "down":
+            return actor.x, min(controller.y_max - 1, actor.y + 1)
+        if direction == "left":
+            return max(0, actor.x - 1), actor.y
+        if direction == "right":
+            return min(controller.x_max - 1, actor.x + 1), actor.y
+        return None
 
 
 class Defend(Action):
+    action_names = ("defend",)
+    robot_attr = "defend"
+    state_fields = {"is_active": "defend_active"}
+
+    parameters = ("reduction", "cost")
     reduction = 0.5  # 防御中のダメージ軽減率
     cost = 10  # 防御のコスト
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-        self.is_active = False
-
-    def __call__(self, turn):
-        if self.actor.sp >= self.cost:
-            self.actor.use_sp(self.cost)
-            self.is_active = True
-            self.controller.log_action(turn, f"{self.actor.name} is now in defense mode, reducing incoming damage.")
+    def __call__(self, actor, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        if actor.sp >= params.cost:
+            actor.use_sp(params.cost)
+            actor.state.set("defend_active", True)
+            if controller.events is not None:
+                controller.events.emit(turn, events.DEFEND, actor)
         else:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to defend!")
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["defend"])
 
-    def update(self):
-        self.is_active = False
+    def update(self, actor):
+        actor.state.set("defend_active", False)
 
 
 class RangedAttack(Action):
+    action_names = ("ranged_attack",)
+    robot_attr = "ranged_attack"
+    call_style = "target"
+    highlight = "ranged"
+    simultaneous_phase = 4
+    target_distance = 2
+
+    parameters = ("cost", "power")
     cost = 15  # 遠距離攻撃のコスト
     power = 15  # 遠距離攻撃の威力
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-
-    def __call__(self, target, turn):
-        distance = abs(self.actor.x - target.x) + abs(self.actor.y - target.y)
+    def __call__(self, actor, target, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        distance = abs(actor.x - target.x) + abs(actor.y - target.y)
         if distance == 2:
-            if self.actor.sp >= self.cost:
-                self.actor.use_sp(self.cost)
-                damage = target.receive_attack(self.power)
-                self.controller.log_action(
-                    turn, f"{self.actor.name} performs a ranged attack on {target.name} for {damage} damage!")
+            if actor.sp >= params.cost:
+                actor.use_sp(params.cost)
+                damage = target.receive_attack(params.power)
+                if controller.events is not None:
+                    controller.events.emit(
+                        turn, events.RANGED_HIT, actor, target, x=target.x, y=target.y, amount=damage)
             else:
-                self.controller.log_action(
-                    turn, f"{self.actor.name} does not have enough SP to perform a ranged attack!")
+                if controller.events is not None:
+                    controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["ranged_attack"])
         else:
-            self.controller.log_action(
-                turn, f"{self.actor.name} cannot perform a ranged attack on {target.name} due to incorrect distance (distance: {distance}).")
+            if controller.events is not None:
+                controller.events.emit(turn, events.RANGED_OUT_OF_RANGE, actor, target, arg=distance)
 
 
 class Parry(Action):
+    action_names = ("parry",)
+    robot_attr = "parry"
+    state_fields = {"is_active": "parry_active", "cooldown_counter": "parry_cooldown"}
+
+    parameters = ("cooldown_duration", "cost")
     cooldown_duration = 2  # クールタイムの初期値(何ターン後に使えるか)
     cost = 15  # パリィのコスト
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-        self.is_active = False  # パリィ中かどうか
-        self.cooldown_counter = 0  # パリィのクールタイム
-
-    def __call__(self, turn):
-        if self.actor.sp >= self.cost and not self.is_active and self.cooldown_counter == 0:
-            self.is_active = True
-            self.actor.use_sp(self.cost)
-            self.cooldown_counter = self.cooldown_duration
-            self.controller.log_action(turn, f"{self.actor.name} started parrying!")
-        elif self.cooldown_counter > 0:
-            self.controller.log_action(turn, f"{self.actor.name}'s parry is on cooldown.")
+    def __call__(self, actor, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        state = actor.state
+        if actor.sp >= params.cost and not state.parry_active and state.parry_cooldown == 0:
+            state.set("parry_active", True)
+            actor.use_sp(params.cost)
+            state.set("parry_cooldown", params.cooldown_duration)
+            if controller.events is not None:
+                controller.events.emit(turn, events.PARRY, actor)
+        elif state.parry_cooldown > 0:
+            if controller.events is not None:
+                controller.events.emit(turn, events.PARRY_COOLDOWN, actor, arg=state.parry_cooldown)
         else:
-            self.controller.log_action(turn, f"{self.actor.name} doesn't have enough SP.")
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["parry"])
 
-    def update(self, is_active=False, is_cooldown=False):
+    def update(self, actor, is_active=False, is_cooldown=False):
+        state = actor.state
         if is_active:
-            self.is_active = False
+            state.set("parry_active", False)
         if is_cooldown:
-            assert self.cooldown_counter > 0
-            self.cooldown_counter -= 1
+            assert state.parry_cooldown > 0
+            state.set("parry_cooldown", state.parry_cooldown - 1)
         if (not is_active) and (not is_cooldown):
             assert False
 
 
 class Rest(Action):
-    recovery_value = 15
+    action_names = ("rest",)
+    robot_attr = "rest"
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
+    parameters = ("recovery_value",)
+    recovery_value = 15
 
-    def __call__(self, turn):
-        self.actor.recovery_sp(self.recovery_value)
-        self.controller.log_action(turn, f"{self.actor.name} rests and recovers {self.recovery_value} SP. Total SP: {self.actor.sp}")
+    def __call__(self, actor, turn):
+        params = self.params(actor.controller)
+        actor.recovery_sp(params.recovery_value)
+        if actor.controller.events is not None:
+            actor.controller.events.emit(turn, events.REST, actor, amount=params.recovery_value, extra=actor.sp)
 
 
 class Trap(Action):
+    action_names = ("trap_up", "trap_down", "trap_left", "trap_right")
+    robot_attr = "trap"
+    call_style = "name"
+    highlight = "step"
+    state_fields = {"traps": "traps"}
+    simultaneous_phase = 3
+
+    parameters = ("cost", "damage")
     cost = 15  # 罠設置のコスト
     damage = 25  # 罠のダメージ
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-        self.traps = []  # 設置された罠のリスト
-
-    def __call__(self, direction, turn):
-        if self.actor.sp < self.cost:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to set a trap!")
+    def __call__(self, actor, direction, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        if actor.sp < params.cost:
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["trap"])
             return
 
         # 罠を設置する位置を計算
-        if direction == "trap_up":
-            position = (self.actor.x, max(0, self.actor.y - 1))
-        elif direction == "trap_down":
-            position = (self.actor.x, min(self.controller.y_max - 1, self.actor.y + 1))
-        elif direction == "trap_left":
-            position = (max(0, self.actor.x - 1), self.actor.y)
-        elif direction == "trap_right":
-            position = (min(self.controller.x_max - 1, self.actor.x + 1), self.actor.y)
-        else:
-            self.controller.log_action(turn, f"{self.actor.name} tried to set a trap in an invalid direction.")
+        position = self.target(actor, direction)
+        if position is None:
+            if controller.events is not None:
+                controller.events.emit(turn, events.TRAP_INVALID, actor)
+            return
+
+        if controller.board.is_wall(*position):
+            if controller.events is not None:
+                controller.events.emit(turn, events.TRAP_WALL, actor, x=position[0], y=position[1])
             return
 
         # 設置先に他のロボットがいないかチェック
-        if self.controller.is_position_occupied(*position):
-            self.controller.log_action(turn, f"{self.actor.name} tried to set a trap at {position}, but the position is occupied.")
+        if controller.is_position_occupied(*position):
+            if controller.events is not None:
+                controller.events.emit(turn, events.TRAP_OCCUPIED, actor, x=position[0], y=position[1])
             return
 
         # 設置先にトラップがないかチェック（自分または相手のトラップ）
-        if self.controller.is_trap_at_position(*position):
-            self.controller.log_action(turn, f"{self.actor.name} tried to set a trap at {position}, but a trap is already there.")
+        if controller.is_trap_at_position(*position):
+            if controller.events is not None:
+                controller.events.emit(turn, events.TRAP_EXISTS, actor, x=position[0], y=position[1])
             return
 
         # 罠を設置
-        self.actor.use_sp(self.cost)
-        self.traps.append(position)
-        self.controller.log_action(turn, f"{self.actor.name} set a trap at {position}.")
-
-    def check_trap(self, target):
+        actor.use_sp(params.cost)
+        actor.state.add_trap(position)
+        controller.board.add_trap(actor, *position)
+        if controller.events is not None:
+            controller.events.emit(turn, events.TRAP_PLACED, actor, x=position[0], y=position[1])
+
+    def target(self, actor, direction):
+        """罠を設置するマス（盤外は端に丸める）。不正な方向なら None"""
+        controller = actor.controller
+        if direction == "trap_up":
+            return actor.x, max(0, actor.y - 1)
+        if direction == "trap_down":
+            return actor.x, min(controller.y_max - 1, actor.y + 1)
+        if direction == "trap_left":
+            return max(0, actor.x - 1), actor.y
+        if direction == "trap_right":
+            return min(controller.x_max - 1, actor.x + 1), actor.y
+        return None
+
+    def check_trap(self, actor, target):
         """敵が罠にかかったかを確認し、ダメージを与える"""
-        if target.position in self.traps:
-            self.traps.remove(target.position)
-            damage = target.receive_attack(self.damage)
-            self.controller.log_action(self.controller.turn, f"{target.name} stepped on a trap and took {damage} damage!")
+        controller = actor.controller
+        params = self.params(controller)
+        position = target.position
+        if controller.board.trap_owner(*position) is actor:
+            actor.state.remove_trap(position)
+            controller.board.remove_trap(*position)
+            damage = target.receive_attack(params.damage)
+            if controller.events is not None:
+                controller.events.emit(
+                    controller.turn, events.TRAP_TRIGGERED, actor, target, x=position[0], y=position[1], amount=damage)
 
 
 class Steal(Action):
+    action_names = ("steal",)
+    robot_attr = "steal"
+    call_style = "target"
+    highlight = "adjacent"
+    simultaneous_phase = 4
+    target_distance = 1
+
+    parameters = ("cost", "steal_amount")
     cost = 10  # スタミナを盗む行動のコスト
     steal_amount = 15  # 奪うスタミナの量
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-
-    def __call__(self, target, turn):
-        if self.actor.sp < self.cost:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to steal!")
+    def __call__(self, actor, target, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        if actor.sp < params.cost:
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["steal"])
             return
 
-        if is_adjacent(self.actor, target):
+        if is_adjacent(actor, target):
             if target.sp > 0:
-                stolen_sp = min(self.steal_amount, target.sp)
+                stolen_sp = min(params.steal_amount, target.sp)
                 target.use_sp(stolen_sp)
-                self.actor.recovery_sp(stolen_sp)
-                self.actor.use_sp(self.cost)
-                self.controller.log_action(
-                    turn, f"{self.actor.name} steals {stolen_sp} SP from {target.name}.")
+                actor.recovery_sp(stolen_sp)
+                actor.use_sp(params.cost)
+                if controller.events is not None:
+                    controller.events.emit(turn, events.STEAL, actor, target, amount=stolen_sp)
             else:
-                self.controller.log_action(turn, f"{target.name} has no SP to steal!")
+                if controller.events is not None:
+                    controller.events.emit(turn, events.STEAL_EMPTY, actor, target)
         else:
-            self.controller.log_action(turn, f"{self.actor.name} tried to steal from a non-adjacent target.")
+            if controller.events is not None:
+                controller.events.emit(turn, events.STEAL_OUT_OF_RANGE, actor, target)
+
+    def sp_horizon(self, params=None):
+        params = self if params is None else params
+        return max(params.cost, params.steal_amount)
 
 
 class Teleport(Action):
-    cost = 20  # テレポートのコスト
+    action_names = ("teleport",)
+    robot_attr = "teleport"
+    simultaneous_phase = 2
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
+    parameters = ("cost",)
+    cost = 20  # テレポートのコスト
 
-    def __call__(self, turn):
-        if self.actor.sp < self.cost:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to teleport!")
+    def __call__(self, actor, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        if actor.sp < params.cost:
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["teleport"])
             return
 
-        import random
-        # ランダムな位置を生成（フィールド内に収まるように調整）
-        new_x = random.randint(0, self.controller.x_max - 1)
-        new_y = random.randint(0, self.controller.y_max - 1)
-
-        # 移動先に他のロボットがいないかチェック
-        if self.controller.is_position_occupied(new_x, new_y):
-            self.controller.log_action(turn, f"{self.actor.name} tried to teleport to ({new_x}, {new_y}), but the position is occupied.")
+        # ロボットのいない床マスから一様に選ぶ
+        position = controller.board.random_free_cell(controller.rng)
+        controller.rng_draws += 1
+        if position is None:
+            if controller.events is not None:
+                controller.events.emit(turn, events.TELEPORT_BLOCKED, actor)
             return
+        new_x, new_y = position
 
         # テレポートを実行
-        self.actor.use_sp(self.cost)
-        self.actor.set_position(new_x, new_y)
-        self.controller.log_action(turn, f"{self.actor.name} teleported to ({new_x}, {new_y}).")
+        actor.use_sp(params.cost)
+        actor.set_position(new_x, new_y)
+        if controller.events is not None:
+            controller.events.emit(turn, events.TELEPORT, actor, x=new_x, y=new_y)
 
 
 class Camouflage(Action):
+    action_names = ("camouflage",)
+    robot_attr = "camouflage"
+    state_fields = {
+        "is_active": "camouflage_active",  # カモフラージュ中かどうか
+        "remaining_turns": "camouflage_remaining",  # カモフラージュの残りターン数
+        "last_known_position": "camouflage_last_position",  # カモフラージュ開始時の位置
+    }
+
+    parameters = ("cost", "duration")
     cost = 20  # カモフラージュのコスト
     duration = 3  # カモフラージュの持続ターン数
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-        self.is_active = False  # カモフラージュ中かどうか
-        self.remaining_turns = 0  # カモフラージュの残りターン数
-        self.last_known_position = None  # カモフラージュ開始時の位置を保持
-
-    def __call__(self, turn):
-        if self.actor.sp < self.cost:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to activate camouflage!")
+    def __call__(self, actor, turn):
+        controller = actor.controller
+        params = self.params(controller)
+        state = actor.state
+        if actor.sp < params.cost:
+            if controller.events is not None:
+                controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["camouflage"])
             return
 
-        if not self.is_active:
-            self.actor.use_sp(self.cost)
-            self.is_active = True
-            self.remaining_turns = self.duration
-            self.last_known_position = self.actor.position  # 現在の位置を記録
-            self.controller.log_action(turn, f"{self.actor.name} activates camouflage and hides its position for {self.duration} turns!")
+        if not state.camouflage_active:
+            actor.use_sp(params.cost)
+            state.set("camouflage_active", True)
+            state.set("camouflage_remaining", params.duration)
+            state.set("camouflage_last_position", actor.position)  # 現在の位置を記録
+            if controller.events is not None:
+                controller.events.emit(turn, events.CAMOUFLAGE_START, actor, arg=params.duration)
         else:
-            self.controller.log_action(turn, f"{self.actor.name} is already camouflaged!")
+            if controller.events is not None:
+                controller.events.emit(turn, events.CAMOUFLAGE_ACTIVE, actor)
 
-    def update(self):
+    def update(self, actor):
         """ターンごとにカモフラージュの状態を更新"""
-        if self.is_active:
-            self.remaining_turns -= 1
-            if self.remaining_turns <= 0:
-                self.is_active = False
-                self.controller.log_action(self.controller.turn, f"{self.actor.name}'s camouflage has worn off.")
+        state = actor.state
+        if state.camouflage_active:
+            state.set("camouflage_remaining", state.camouflage_remaining - 1)
+            if state.camouflage_remaining <= 0:
+                state.set("camouflage_active", False)
+                if actor.controller.events is not None:
+                    actor.controller.events.emit(actor.controller.turn, events.CAMOUFLAGE_END, actor)
 
 
 class Scan(Action):
+    action_names = ("scan",)
+    robot_attr = "scan"
+    state_fields = {
+        "is_active": "scan_active",  # スキャン中かどうか
+        "remaining_turns": "scan_remaining",  # スキャンの残りターン数
+    }
+
+    parameters = ("cost", "duration")
     cost = 10  # スキャンのコスト
     duration = 1  # スキャンの持続ターン数
 
-    def __init__(self, actor, controller):
-        super().__init__(actor, controller)
-        self.is_active = False  # スキャン中かどうか
-        self.remaining_turns = 0  # スキャンの残りターン数
-
-    def __call__(self, turn):
-        if self.actor.sp < self.cost:
-            self.controller.log_action(turn, f"{self.actor.name} does not have enough SP to scan!")
+    def __call__(self, actor, turn):
+        params = self.params(actor.controller)
+        if actor.sp < params.cost:
+            if actor.controller.events is not None:
+                actor.controller.events.emit(turn, events.NO_SP, actor, arg=events.ACTION_INDEX["scan"])
             return
 
-        self.actor.use_sp(self.cost)
-        self.is_active = True
-        self.remaining_turns = self.duration
+        actor.use_sp(params.cost)
+        actor.state.set("scan_active", True)
+        actor.state.set("scan_remaining", params.duration)
+        if actor.controller.events is not None:
+            actor.controller.events.emit(turn, events.SCAN_START, actor, arg=params.duration)
 
-    def update(self):
+    def update(self, actor):
         """ターンごとにスキャンの状態を更新"""
-        if self.is_active:
-            self.remaining_turns -= 1
-            if self.remaining_turns <= 0:
-                self.is_active = False
-                self.controller.log_action(self.controller.turn, f"{self.actor.name}'s scan effect has worn off.")
+        state = actor.state
+        if state.scan_active:
+            state.set("scan_remaining", state.scan_remaining - 1)
+            if state.scan_remaining <= 0:
+                state.set("scan_active", False)
+                if actor.controller.events is not None:
+                    actor.controller.events.emit(actor.controller.turn, events.SCAN_END, actor)
@@ -0,0 +1,190 @@
+"""行動の記録（action trace）だけの replay と、robot_logic を呼ばずにそれを再実行する ``TraceReplayer``。
+
+``ActionTrace`` は設定（シードを含む）、初期配置、robot_logic を呼んだ順の行動コード（``registry.ACTIONS``）と
+メモの参照（重複を除いたメモの表の番号）だけを持つ。手番のロボットは game_loop と同じく
+ターンの偶奇で決まる（同時手番モードでは 1 ターンに robot1, robot2 の順に 2 つ）。
+エンジンは同じシードなら同じ乱数を使うので、記録した行動を順に適用すればどのターンの状態も作り直せる::
+
+    trace = ActionTrace.from_game_state(game_state, (controller.memos1, controller.memos2))
+    replayer = TraceReplayer(trace)
+    replayer.seek(50).snapshot()  # ターン 50 を終えた時点の状態（罠・クールダウンなども含む）
+    game_state = trace.replay()
+
+持ち時間の罰則が ``"forfeit"`` の試合では、行動なし（None）の記録を時間切れの負けとして再実行する。
+"""
+import base64
+from collections import namedtuple
+
+import simultaneous
+from actions import ACTIONS
+from controller import GameController
+from registry import NONE_CODE
+from replay import TRACE
+from robot import Robot
+from terrain import load_map
+
+_TRAP = ACTIONS.rule("trap")
+
+_ActionTrace = namedtuple("ActionTrace", ["settings", "names", "positions", "codes", "memos", "memo_refs"])
+
+
+def _memo_key(memo):
+    return tuple(memo.items())
+
+
+class ActionTrace(_ActionTrace):
+    """行動の記録。
+
+    :param settings: ``game_state[0]["settings"]``（シードを含む）
+    :param names: robot1 / robot2 の名前
+    :param positions: robot1 / robot2 の初期位置
+    :param codes: robot_logic を呼んだ順の行動コード（bytes。実際に行われた行動で、スタン中は ``"stun"``）
+    :param memos: 重複を除いたメモ（0 番は空のメモ）
+    :param memo_refs: ``codes`` と同じ順の、各呼び出しで返したメモの番号
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_game_state(cls, game_state, memos=None):
+        """game_state（``replay.load_replay`` で読んだものでもよい）から作る。
+
+        :param memos: robot1 / robot2 のメモ（``GameController.memos1`` / ``memos2``）。省略時は空のメモとして記録する
+        """
+        settings = game_state[0]["settings"]
+        start = game_state[1]["robots"]
+        actions = []
+        for entry in game_state[2:]:
+            if "actions" in entry:
+                actions.extend(action["action"] for action in entry["actions"])
+            else:
+                actions.append(entry["action"]["action"])
+        table = [{}]
+        refs = []
+        if memos is not None:
+            ids = {(): 0}
+            counts = [0, 0]
+            for index in range(len(actions)):
+                side = index & 1  # 奇数ターン（同時手番なら各ターンの 1 つ目）が robot1
+                memo = memos[side][counts[side]]
+                counts[side] += 1
+                key = _memo_key(memo)
+                ref = ids.get(key)
+                if ref is None:
+                    ref = ids[key] = len(table)
+                    table.append(dict(memo))
+                refs.append(ref)
+        if not any(refs):
+            refs = []  # すべて空のメモ
+        return cls(
+            settings, tuple(robot["name"] for robot in start), tuple(tuple(robot["position"]) for robot in start),
+            ACTIONS.encode(actions), tuple(table), tuple(refs))
+
+    @classmethod
+    def from_controller(cls, controller):
+        """試合を終えた GameController から作る（ソークモードでは game_state を残さないので作れない）"""
+        if controller.soak:
+            raise ValueError("Soak mode does not keep the game_state needed for an action trace.")
+        return cls.from_game_state(controller.game_state, (controller.memos1, controller.memos2))
+
+    def memo(self, index):
+        """``index`` 番目の呼び出しで返したメモ"""
+        return self.memos[self.memo_refs[index]] if self.memo_refs else self.memos[0]
+
+    def to_dict(self):
+        data = {
+            "settings": self.settings,
+            "names": list(self.names),
+            "positions": [list(position) for position in self.positions],
+            "codes": base64.b64encode(self.codes).decode("ascii"),
+        }
+        if self.memo_refs:
+            data["memos"] = list(self.memos)
+            data["memo_refs"] = list(self.memo_refs)
+        return {TRACE: data}
+
+    @classmethod
+    def from_dict(cls, data):
+        data = data[TRACE]
+        return cls(
+            data["settings"], tuple(data["names"]), tuple(tuple(position) for position in data["positions"]),
+            base64.b64decode(data["codes"]), tuple(data.get("memos", ({},))), tuple(data.get("memo_refs", ())))
+
+    def replay(self):
+        """再実行して game_state を返す"""
+        return TraceReplayer(self).run()
+
+
+class TraceReplayer:
+    """``ActionTrace`` を robot_logic を呼ばずに ``GameController`` で再実行する。
+
+    ``controller`` は通常の試合と同じように game_state・メモを記録するので、途中のターンでも
+    ``controller.snapshot()`` や ``controller.game_state`` で状態を読める。
+    """
+
+    def __init__(self, trace, sink=None):
+        self.trace = trace
+        settings = trace.settings
+        self._forfeit = (settings.get("time_control") or {}).get("penalty") == "forfeit"
+        (x1, y1), (x2, y2) = trace.positions
+        self.controller = GameController(
+            max_turn=settings["max_turn"], x_max=settings["x_max"], y_max=settings["y_max"],
+            robot1_initial_position={'x': x1, 'y': y1}, robot2_initial_position={'x': x2, 'y': y2},
+            sink=sink, headless=True, seed=settings["seed"], simultaneous=settings.get("simultaneous", False),
+            terrain=None if "map" not in settings else load_map(f"{settings['map']}.txt"),
+            ruleset=settings.get("ruleset"), time_control=settings.get("time_control"), cycle_detection=False)
+        self.controller.set_robots(
+            Robot(trace.names[0], x1, y1, None, self.controller), Robot(trace.names[1], x2, y2, None, self.controller))
+        self._index = 0  # 次に適用する記録
+
+    def finished(self):
+        return self._index >= len(self.trace.codes)
+
+    def _take(self, robot, memos):
+        """次の記録を robot_logic の応答の代わりに取り出す"""
+        index = self._index
+        self._index += 1
+        memos.append(self.trace.memo(index))
+        code = self.trace.codes[index]
+        if code == NONE_CODE and self._forfeit:
+            robot.forfeit()
+        return ACTIONS.name(code)
+
+    def step(self):
+        """1 ターン進めて、そのターンの game_state のエントリを返す"""
+        controller = self.controller
+        robot1, robot2 = controller.robot1, controller.robot2
+        if controller.simultaneous:
+            _TRAP.check_trap(robot1, robot2)
+            _TRAP.check_trap(robot2, robot1)
+            intents = [
+                (robot1, robot2, self._take(robot1, controller.memos1)),
+                (robot2, robot1, self._take(robot2, controller.memos2)),
+            ]
+            simultaneous.resolve(controller, intents)
+            actions = [action for _, _, action in intents]
+            controller.save_game_state(robot1.name, actions[0], actions)
+        else:
+            robot, enemy, memos = (
+                (robot1, robot2, controller.memos1) if controller.turn % 2 != 0 else (robot2, robot1, controller.memos2))
+            _TRAP.check_trap(robot, enemy)
+            action = self._take(robot, memos)
+            controller.resolve_action(robot, enemy, action)
+            controller.save_game_state(robot.name, action)
+        controller.turn += 1
+        return controller.game_state[-1]
+
+    def seek(self, turn):
+        """ターン ``turn`` を終えた状態まで進め（戻る場合は最初からやり直す）、controller を返す"""
+        controller = self.controller
+        if turn < controller.turn - 1:
+            controller.reset(self.trace.settings["seed"])
+            self._index = 0
+        while controller.turn <= turn and not self.finished():
+            self.step()
+        return controller
+
+    def run(self):
+        """最後まで再実行して game_state を返す"""
+        while not self.finished():
+            self.step()
+        return self.controller.game_state
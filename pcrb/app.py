@@ -5,16 +5,19 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 import streamlit as st
 import ast
 import traceback
-import json
 
-from pcrb.controller import GameController
-from pcrb.robot import Robot
+from pcrb.pool import worker_pool
+from pcrb.replay import dumps as replay_dumps
+from pcrb.replaystore import open_store
 from pcrb.constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
 
 # 許可する関数とモジュール
 ALLOWED_FUNCTIONS = {"robot_logic"}
 ALLOWED_MODULES = ["random", "math"]
-GAME_STATE_FILE = "./game_state.json"  # 既存の game_state.json ファイル
+GAME_STATE_FILE = "./game_state.json"  # 既存の replay ファイル（replay.load_replay で読む）
+REPLAY_STORE_DIR = "./replays"  # 対戦の replay を保存するストア（replaystore.ReplayStore）
+# アップロードされたロボットの持ち時間（秒、clock.TimeControl）。遅いロボットは時間切れの手を休憩にする
+UPLOAD_TIME_CONTROL = {"bank": 10.0, "increment": 0.05, "move_limit": 1.0, "penalty": "default"}
 
 
 # ----------------------------- セキュリティ関連ユーティリティ -----------------------------
@@ -71,23 +74,29 @@ def load_player_module(file_content: str):
 
 # ----------------------------- ゲーム実行 -----------------------------
 
-def play_game(robot1_logic, robot2_logic, robot1_name=PLAYER_ROBOT_NAME, robot2_name=ENEMY_ROBOT_NAME):
-    controller = GameController(max_turn=100, x_max=9, y_max=7)
-    robot1 = Robot(robot1_name, 1, 3, robot1_logic, controller)
-    robot2 = Robot(robot2_name, 7, 3, robot2_logic, controller)
-    controller.set_robots(robot1, robot2)
-    winner, game_state = controller.game_loop()
-    return winner, game_state
+def play_game(robot1_logic, robot2_logic, robot1_name=PLAYER_ROBOT_NAME, robot2_name=ENEMY_ROBOT_NAME, seed=None):
+    """ワーカーごとに使い回す試合コンテキストで 1 試合を行う（ファイル出力なし）。
+
+    返す ``winner`` は再利用される Robot なので、名前は次の試合の前に読み取ること。
+    シードは ``game_state[0]['settings']['seed']`` に、各ロボットの思考時間は ``game_state[0]['clock']`` に記録される。
+    """
+    return worker_pool().play(
+        robot1_logic, robot2_logic, robot1_name, robot2_name, seed, time_control=UPLOAD_TIME_CONTROL,
+        max_turn=100, x_max=9, y_max=7)
+
+
+def replay_store():
+    """対戦の replay を保存するストア（プロセスごとに 1 つを使い回す）"""
+    return open_store(REPLAY_STORE_DIR)
 
 
 def game_state_download_button(game_state: dict) -> None:
-    """game_state を JSON としてダウンロード可能にするボタンを描画。"""
-    json_bytes = json.dumps(game_state, ensure_ascii=False, indent=4).encode("utf-8")
+    """game_state を replay（NDJSON）としてダウンロード可能にするボタンを描画。"""
     st.download_button(
-        label="game_state.json をダウンロード",
-        data=json_bytes,
-        file_name="game_state.json",
-        mime="application/json",
+        label="game_state.ndjson をダウンロード",
+        data=replay_dumps(game_state).encode("utf-8"),
+        file_name="game_state.ndjson",
+        mime="application/x-ndjson",
     )
 
 
@@ -0,0 +1,297 @@
+"""任意の数のロボットによるバトルロイヤル・チーム戦。
+
+``GameController`` は 2 体の対戦に特化している（robot1 / robot2、向きの補正など）。
+``Arena`` は同じ行動ルールと ``board.Board`` をそのまま使い、N 体のロボットを登録順に 1 体ずつ行動させる::
+
+    arena = Arena(x_max=20, y_max=20, headless=True, seed=1)
+    arena.add_robot("A1", 1, 1, logic_a, team="A")
+    arena.add_robot("B1", 18, 18, logic_b, team="B")
+    winner, game_state = arena.game_loop()
+
+攻撃・遠距離攻撃・スティールの対象は、盤面インデックスで行動ルールの ``target_distance`` の距離にいる
+敵だけを調べて選ぶ（HP が最も低い敵、同じなら上から時計回りで最初の敵）。罠は立ったマスの持ち主を
+盤面から引くので、いずれもロボット数によらない。向きの補正は行わない（"up" は常に y が減る方向）。
+"""
+import random
+
+import events
+from actions import ACTIONS
+from board import Board
+from events import EventLog
+from memo import MemoStore
+from memo import view_for
+from observation import RobotView
+from rng import call_with_rng
+from rng import child_seed
+from rng import new_seed
+from robot import Robot
+from ruleset import DEFAULT_RULESET
+from sinks import NullSink
+from sinks import legacy_sink
+
+_TRAP = ACTIONS.rule("trap")
+
+
+class Arena:
+    def __init__(
+            self, max_turn=100, x_max=9, y_max=7, sink=None, headless=False, seed=None, ruleset=None, events=False):
+        """
+        :param max_turn: ターン数の上限（1 ターンに 1 体が行動する）
+        :param sink: ログ・状態イベントの出力先（``sinks`` モジュール参照）
+        :param headless: ``True`` で sink 省略時に ``NullSink`` を使う
+        :param seed: 試合の乱数シード。省略時は新しいシードを生成する
+        :param ruleset: 行動のコスト・威力などと初期 HP / SP（``ruleset.Ruleset``）
+        :param events: ``True`` で行動イベント（``events.EventLog``）を記録し、
+            試合の終わりにロボットごとの集計を ``game_state[0]["events"]`` に記録する
+        """
+        self.ruleset = DEFAULT_RULESET if ruleset is None else ruleset
+        self.max_turn = max_turn
+        self.x_max = x_max
+        self.y_max = y_max
+        self.board = Board(x_max, y_max)
+        self.robots = []  # 登録順（行動順）
+        self.teams = {}  # ロボット → チーム名
+        self.memos = {}  # ロボット → メモ（memo.MemoStore）
+        self.views = {}  # ロボット → robot_logic に渡す読み取り専用ビュー
+        self.bot_rngs = {}  # ロボット → ロボットのコードが使う乱数
+        self.action_codes = bytearray()
+        self.turn = 0
+        self.rng = random.Random()
+        self.rng_draws = 0
+        self.seed = new_seed() if seed is None else seed
+        self.rng.seed(child_seed(self.seed, "engine"))
+        if sink is None:
+            sink = NullSink() if headless else legacy_sink()
+        self.sink = sink
+        self.log_enabled = sink.enabled
+        self.record_events = events
+        self.events = None  # 行動イベント（記録しない場合は None）
+        if events or sink.enabled:
+            self.events = EventLog(sink=sink if sink.enabled else None)
+        self._alive = {}  # チーム → 生存数
+        self._next = 0  # 次に行動を確認するロボットの添字
+        self.game_state = [{
+            'settings': {
+                'max_turn': max_turn,
+                'x_max': x_max,
+                'y_max': y_max,
+                'seed': self.seed,
+                'arena': True,
+            }
+        }]
+        if self.ruleset != DEFAULT_RULESET:
+            self.game_state[0]['settings']['ruleset'] = self.ruleset.to_dict()
+
+    def log_action(self, turn, message):
+        self.sink.log(turn, message)
+
+    def debug(self, message):
+        self.sink.debug(message)
+
+    def is_position_occupied(self, x, y):
+        return self.board.is_occupied(x, y)
+
+    def is_trap_at_position(self, x, y):
+        return self.board.has_trap(x, y)
+
+    def add_robot(self, name, x, y, robot_logic, team=None):
+        """ロボットを登録して返す。``team`` を省略すると 1 体だけのチーム（個人戦）になる"""
+        if self.turn:
+            raise RuntimeError("Robots must be added before the game starts.")
+        if not self.board.in_bounds(x, y) or self.board.is_occupied(x, y):
+            raise ValueError(f"Invalid initial position for {name}: ({x}, {y})")
+        robot = Robot(name, x, y, robot_logic, self)
+        team = name if team is None else team
+        self.robots.append(robot)
+        self.teams[robot] = team
+        self.memos[robot] = MemoStore()
+        self.views[robot] = RobotView(robot)
+        self.bot_rngs[robot] = random.Random(child_seed(self.seed, f"robot{len(self.robots)}"))
+        self._alive[team] = self._alive.get(team, 0) + 1
+        self.board.place(robot, x, y)
+        return robot
+
+    def is_enemy(self, robot, other):
+        return self.teams[robot] != self.teams[other]
+
+    def alive_teams(self):
+        return [team for team, count in self._alive.items() if count > 0]
+
+    def find_target(self, robot, distance):
+        """距離 ``distance`` にいる敵のうち HP が最も低いもの（いなければ None）"""
+        enemies = [
+            other for other in self.board.robots_at_distance(robot.x, robot.y, distance)
+            if self.is_enemy(robot, other)
+        ]
+        return min(enemies, key=lambda enemy: enemy.hp) if enemies else None
+
+    # ------------------------------------------------------------------
+    # ターン処理
+    # ------------------------------------------------------------------
+    def next_robot(self):
+        """次に行動する生存中のロボット"""
+        robots = self.robots
+        for _ in range(len(robots)):
+            robot = robots[self._next]
+            self._next = (self._next + 1) % len(robots)
+            if robot.is_alive():
+                return robot
+        return None
+
+    def check_trap(self, robot):
+        owner = self.board.trap_owner(robot.x, robot.y)
+        if owner is not None and self.is_enemy(robot, owner):
+            _TRAP.check_trap(owner, robot)
+
+    def run_logic(self, robot):
+        self.check_trap(robot)
+        if not robot.is_alive():  # 罠で倒れた場合は行動できない
+            self._fall(robot)
+            return "stun", {}
+
+        game_info = self.build_game_info(robot)
+        memos = self.memos[robot]
+        response = call_with_rng(
+            robot.robot_logic, self.bot_rngs[robot], self.views[robot], game_info, view_for(memos, robot.robot_logic))
+        if isinstance(response, str):
+            action, memo = response, {}
+        elif isinstance(response, (list, tuple)) and len(response) == 2:
+            action, memo = response
+        else:
+            assert False, f"Unexpected response format from robot_logic: {response} (type: {type(response)})"
+        memos.append(memo)
+
+        if self.resolve_action(robot, action) == "stun":
+            return "stun", {}
+        return action, memo
+
+    def resolve_action(self, robot, action):
+        """スタン判定・ターン開始処理のあと行動を実行し、実際に行われた行動名を返す"""
+        if robot.stun_counter > 0:
+            return "stun"
+
+        robot.start_turn()
+        spec = ACTIONS.get(action)
+        if spec is None:
+            raise ValueError("Unexpected robot action detected!")
+        target = None
+        if spec.call_style == "target":
+            target = self.find_target(robot, spec.rule.target_distance)
+            if target is None:
+                if self.events is not None:
+                    self.events.emit(self.turn, events.NO_TARGET, robot, arg=events.ACTION_INDEX[spec.rule.robot_attr])
+                return action
+        spec.handler(robot, target, action, self.turn)
+        if target is not None and not target.is_alive():
+            self._fall(target)
+        return action
+
+    def _fall(self, robot):
+        """倒れたロボットを盤面から取り除く（罠は残る）"""
+        self.board.remove(robot, robot.x, robot.y)
+        self._alive[self.teams[robot]] -= 1
+        if self.events is not None:
+            self.events.emit(self.turn, events.DOWN, robot)
+
+    def build_game_info(self, robot):
+        """``robot`` から見たゲーム状況。
+
+        ``enemies`` / ``allies`` に生存中の各ロボットの情報を入れ、2 体用のロボットがそのまま動くよう
+        最も近い敵の情報を ``enemy_hp`` / ``enemy_position``（スキャン中は ``enemy_sp`` / ``enemy_traps``）にも入れる。
+        カモフラージュ中の敵の位置は、スキャンしていなければ最後に知られている位置になる。
+        """
+        scanning = robot.state.scan_active
+        enemies = []
+        allies = []
+        nearest = None
+        nearest_distance = None
+        for other in self.robots:
+            if other is robot or not other.is_alive():
+                continue
+            if not self.is_enemy(robot, other):
+                allies.append({"name": other.name, "hp": other.hp, "sp": other.sp, "position": other.position})
+                continue
+            position = other.position
+            if not scanning and other.state.camouflage_active:
+                position = other.state.camouflage_last_position
+            entry = {"name": other.name, "team": self.teams[other], "hp": other.hp, "position": position}
+            if scanning:
+                entry["sp"] = other.sp
+                entry["traps"] = list(other.state.traps)
+            enemies.append(entry)
+            distance = abs(position[0] - robot.x) + abs(position[1] - robot.y)
+            if nearest is None or distance < nearest_distance:
+                nearest, nearest_distance = entry, distance
+
+        info = {
+            "turn": self.turn,
+            "max_turn": self.max_turn,
+            "board_size": {"x_max": self.x_max, "y_max": self.y_max},
+            "team": self.teams[robot],
+            "enemies": enemies,
+            "allies": allies,
+        }
+        if nearest is not None:
+            info["enemy_hp"] = nearest["hp"]
+            info["enemy_position"] = nearest["position"]
+            if scanning:
+                info["enemy_sp"] = nearest["sp"]
+                info["enemy_traps"] = nearest["traps"]
+        return info
+
+    def save_game_state(self, robot_name, action):
+        state = {
+            "turn": self.turn,
+            "robots": [
+                {
+                    "name": robot.name,
+                    "team": self.teams[robot],
+                    "position": robot.position,
+                    "hp": robot.hp,
+                    "sp": robot.sp,
+                    "defense_mode": robot.state.defend_active,
+                }
+                for robot in self.robots
+            ],
+            'action': {
+                'robot_name': robot_name,
+                'action': action
+            }
+        }
+        self.game_state.append(state)
+        self.action_codes.append(ACTIONS.code(action))
+        if self.log_enabled:
+            self.sink.state(state)
+
+    def game_loop(self):
+        """生き残ったチームが 1 つになるか ``max_turn`` に達するまで進め、``(勝ったチーム, game_state)`` を返す。
+
+        ``max_turn`` に達した場合は生存ロボットの HP 合計が最も多いチーム（同じなら登録順で先のチーム）の勝ち。
+        """
+        if self.turn == 0:
+            if self.log_enabled:
+                self.sink.begin(self.game_state[0])
+            self.save_game_state(None, None)
+            self.turn = 1
+        while len(self.alive_teams()) > 1 and self.turn < self.max_turn:
+            robot = self.next_robot()
+            if self.log_enabled:
+                self.log_action(self.turn, f"\n--- Turn {self.turn} : {robot.name} turn ---")
+            action, _ = self.run_logic(robot)
+            self.save_game_state(robot.name, action)
+            self.turn += 1
+
+        winner = self.winner()
+        if self.record_events:
+            self.game_state[0]['events'] = self.events.summary()
+        if self.log_enabled:
+            self.log_action(self.turn, f"\n{winner} wins!")
+        self.sink.finish(self.game_state)
+        return winner, self.game_state
+
+    def winner(self):
+        hp = {}
+        for robot in self.robots:
+            team = self.teams[robot]
+            hp[team] = hp.get(team, 0) + max(robot.hp, 0)
+        return max(hp, key=lambda team: (self._alive[team] > 0, hp[team]))
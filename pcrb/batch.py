@@ -0,0 +1,553 @@
+import random
+
+import numpy as np
+
+from actions import ACTIONS
+from constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
+from controller import GameController
+from memo import MemoStore
+from registry import NONE_CODE, STUN_CODE
+from rng import call_with_rng, child_seed, new_seed, uses_random
+from robot import Robot
+from ruleset import DEFAULT_RULESET
+from snapshot import MatchSnapshot, RobotSnapshot
+
+
+_NO_POSITION = -1  # camouflage_last_position が None
+
+
+def _adjust_table(adjust):
+    """robot_logic の行動コード → 向き補正後の行動コード"""
+    table = np.arange(256, dtype=np.uint8)
+    for spec in ACTIONS:
+        table[spec.code] = ACTIONS.code(adjust(spec.name))
+    return table
+
+
+def _valid_table():
+    table = np.zeros(256, dtype=bool)
+    for spec in ACTIONS:
+        table[spec.code] = True
+    return table
+
+
+# ------------------------------------------------------------------
+# ベクトル化した行動ルール（actions.py の各ルールと同じ挙動）
+# f(engine, mask, actor_side, enemy_side, action_name)
+# ------------------------------------------------------------------
+def _attack(engine, mask, a, e, name):
+    rule = engine.ruleset.attack
+    ok = mask & (engine.sp[a] >= rule.cost) & engine.adjacent()
+    parried = ok & engine.parry_active[e]
+    engine.stun[a][parried] = 1
+    hit = ok & ~parried
+    engine.damage(e, hit, rule.power)
+    engine.sp[a][hit] -= rule.cost
+
+
+_STEPS = {
+    "up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0),
+    "trap_up": (0, -1), "trap_down": (0, 1), "trap_left": (-1, 0), "trap_right": (1, 0),
+}
+
+
+def _move(engine, mask, a, e, name):
+    rule = engine.ruleset.move
+    ok = mask & (engine.sp[a] >= rule.cost)
+    new_x, new_y = engine.step_target(a, name)
+    go = ok & ~engine.occupied(new_x, new_y)
+    engine.x[a][go] = new_x[go]
+    engine.y[a][go] = new_y[go]
+    engine.sp[a][go] -= rule.cost
+
+
+def _defend(engine, mask, a, e, name):
+    rule = engine.ruleset.defend
+    ok = mask & (engine.sp[a] >= rule.cost)
+    engine.sp[a][ok] -= rule.cost
+    engine.defend[a][ok] = True
+
+
+def _ranged_attack(engine, mask, a, e, name):
+    rule = engine.ruleset.ranged_attack
+    distance = np.abs(engine.x[a] - engine.x[e]) + np.abs(engine.y[a] - engine.y[e])
+    ok = mask & (distance == 2) & (engine.sp[a] >= rule.cost)
+    engine.sp[a][ok] -= rule.cost
+    engine.damage(e, ok, rule.power)
+
+
+def _parry(engine, mask, a, e, name):
+    rule = engine.ruleset.parry
+    ok = mask & (engine.sp[a] >= rule.cost) & ~engine.parry_active[a] & (engine.parry_cooldown[a] == 0)
+    engine.parry_active[a][ok] = True
+    engine.sp[a][ok] -= rule.cost
+    engine.parry_cooldown[a][ok] = rule.cooldown_duration
+
+
+def _rest(engine, mask, a, e, name):
+    engine.sp[a][mask] += engine.ruleset.rest.recovery_value
+
+
+def _trap(engine, mask, a, e, name):
+    rule = engine.ruleset.trap
+    ok = mask & (engine.sp[a] >= rule.cost)
+    new_x, new_y = engine.step_target(a, name)
+    ok &= ~engine.occupied(new_x, new_y)
+    rows = np.flatnonzero(ok)
+    cells = new_y[rows] * engine.x_max + new_x[rows]
+    free = engine.trap_owner[rows, cells] == 0
+    rows, cells = rows[free], cells[free]
+    engine.sp[a][rows] -= rule.cost
+    engine.trap_owner[rows, cells] = a + 1
+    engine.trap_serial[rows, cells] = engine.trap_counter[rows]
+    engine.trap_counter[rows] += 1
+    engine.trap_count[a][rows] += 1
+
+
+def _steal(engine, mask, a, e, name):
+    rule = engine.ruleset.steal
+    ok = mask & (engine.sp[a] >= rule.cost) & engine.adjacent() & (engine.sp[e] > 0)
+    stolen = np.minimum(rule.steal_amount, engine.sp[e])
+    engine.sp[e][ok] -= stolen[ok]
+    engine.sp[a][ok] += stolen[ok] - rule.cost
+
+
+def _teleport(engine, mask, a, e, name):
+    rule = engine.ruleset.teleport
+    size = engine.x_max * engine.y_max
+    for row in np.flatnonzero(mask & (engine.sp[a] >= rule.cost)):
+        # board.Board.random_free_cell と同じ引き方（占有マスを飛ばして数える）
+        occupied = sorted((
+            int(engine.y[0][row] * engine.x_max + engine.x[0][row]),
+            int(engine.y[1][row] * engine.x_max + engine.x[1][row]),
+        ))
+        free = size - len(occupied)
+        engine.rng_draws[row] += 1
+        if free <= 0:
+            continue
+        index = engine.match_rng(row).randrange(free)
+        for cell in occupied:
+            if index >= cell:
+                index += 1
+            else:
+                break
+        engine.sp[a][row] -= rule.cost
+        engine.x[a][row] = index % engine.x_max
+        engine.y[a][row] = index // engine.x_max
+
+
+def _camouflage(engine, mask, a, e, name):
+    rule = engine.ruleset.camouflage
+    ok = mask & (engine.sp[a] >= rule.cost) & ~engine.camouflage_active[a]
+    engine.sp[a][ok] -= rule.cost
+    engine.camouflage_active[a][ok] = True
+    engine.camouflage_remaining[a][ok] = rule.duration
+    engine.camouflage_last_x[a][ok] = engine.x[a][ok]
+    engine.camouflage_last_y[a][ok] = engine.y[a][ok]
+
+
+def _scan(engine, mask, a, e, name):
+    rule = engine.ruleset.scan
+    ok = mask & (engine.sp[a] >= rule.cost)
+    engine.sp[a][ok] -= rule.cost
+    engine.scan_active[a][ok] = True
+    engine.scan_remaining[a][ok] = rule.duration
+
+
+# Robot 上の属性名 → ベクトル化ルール。新しい行動を追加したらここにも追加する
+VECTOR_RULES = {
+    "attack": _attack,
+    "move": _move,
+    "defend": _defend,
+    "ranged_attack": _ranged_attack,
+    "parry": _parry,
+    "rest": _rest,
+    "trap": _trap,
+    "steal": _steal,
+    "teleport": _teleport,
+    "camouflage": _camouflage,
+    "scan": _scan,
+}
+
+
+class BatchObservation:
+    """ベクトル化ポリシーに渡す、手番のロボットから見た全試合の状態（game_info 相当）。
+
+    各属性は試合数 N の配列（読み取り専用として扱うこと）。``active`` が False の試合は
+    決着済みで、返した行動は使われない。``enemy_x`` / ``enemy_y`` は game_info の
+    ``enemy_position`` と同じく、敵がカモフラージュ中で自分がスキャンしていなければ最後に見えた位置。
+    ``enemy_sp`` は ``scan_active`` の試合でのみ意味を持つ。
+    """
+
+    def __init__(self, engine, side, active):
+        enemy = 1 - side
+        self.side = side
+        self.turn = engine.turn
+        self.max_turn = engine.max_turn
+        self.x_max = engine.x_max
+        self.y_max = engine.y_max
+        self.active = active
+        self.x = engine.x[side]
+        self.y = engine.y[side]
+        self.hp = engine.hp[side]
+        self.sp = engine.sp[side]
+        self.parry_cooldown = engine.parry_cooldown[side]
+        self.camouflage_active = engine.camouflage_active[side]
+        self.scan_active = engine.scan_active[side]
+        hidden = ~self.scan_active & engine.camouflage_active[enemy]
+        self.enemy_x = np.where(hidden, engine.camouflage_last_x[enemy], engine.x[enemy])
+        self.enemy_y = np.where(hidden, engine.camouflage_last_y[enemy], engine.y[enemy])
+        self.enemy_hp = engine.hp[enemy]
+        self.enemy_sp = engine.sp[enemy]
+        self._engine = engine
+
+    @property
+    def enemy_traps(self):
+        """(N, マス数) の真偽値配列。スキャン中の試合でのみ敵の罠が立つ"""
+        owner = self._engine.trap_owner == 2 - self.side
+        return owner & self.scan_active[:, None]
+
+
+class BatchEngine:
+    """N 試合を NumPy 配列で同時に（ロックステップで）進める対戦エンジン。
+
+    全試合が同じターン番号で進むので手番（奇数ターンが robot1）も共通になり、
+    各ルールは「その行動を選んだ試合」のマスクに対する配列演算として適用される。
+    同じシードなら ``GameController`` と完全に同じ結果になる。
+
+    robot_logic は試合ごとに呼び出す（``game_info`` は GameController と同じもの）。
+    ``robot_logic.batch_policy`` があれば、代わりに全試合分を 1 回で返すベクトル化ポリシー
+    ``batch_policy(BatchObservation) -> 行動コードの配列`` として呼び出す。
+    """
+
+    def __init__(self, matches, max_turn=100, x_max=9, y_max=7,
+                 robot1_initial_position=None, robot2_initial_position=None,
+                 seeds=None, names=(PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME), record=False, ruleset=None):
+        """
+        :param seeds: 試合ごとのシード（省略時は新しく生成する）
+        :param ruleset: 行動のコスト・威力などと初期 HP / SP（``ruleset.Ruleset``。省略時は既定）
+        :param record: ``True`` で毎ターンの状態を記録し ``game_state(i)`` を使えるようにする
+        """
+        self.n = matches
+        self.max_turn = max_turn
+        self.x_max = x_max
+        self.y_max = y_max
+        self.names = names
+        self.seeds = [new_seed() for _ in range(matches)] if seeds is None else list(seeds)
+        if len(self.seeds) != matches:
+            raise ValueError("seeds must have one entry per match.")
+        self.record = record
+        self.ruleset = DEFAULT_RULESET if ruleset is None else ruleset
+
+        missing = {spec.attr for spec in ACTIONS} - set(VECTOR_RULES)
+        if missing:
+            raise NotImplementedError(f"No vectorized rule for: {sorted(missing)}")
+        self._rules = [(spec.code, spec.name, VECTOR_RULES[spec.attr]) for spec in ACTIONS]
+        self._adjust = (
+            _adjust_table(GameController.adjust_action_for_robot1),
+            _adjust_table(GameController.adjust_action_for_robot2),
+        )
+        self._valid = _valid_table()
+
+        # robot_logic を試合ごとに呼ぶための作業用コントローラ（game_info の生成に使う）
+        self._scratch = GameController(
+            max_turn=max_turn, x_max=x_max, y_max=y_max,
+            robot1_initial_position=robot1_initial_position,
+            robot2_initial_position=robot2_initial_position,
+            headless=True, ruleset=self.ruleset,
+        )
+        self._initial_positions = (self._scratch.robot1_initial_position, self._scratch.robot2_initial_position)
+        self._scratch.set_robots(
+            Robot(names[0], self._initial_positions[0]['x'], self._initial_positions[0]['y'], None, self._scratch),
+            Robot(names[1], self._initial_positions[1]['x'], self._initial_positions[1]['y'], None, self._scratch),
+        )
+        self.reset()
+
+    def reset(self):
+        """全試合を初期状態に戻す"""
+        n = self.n
+        pos1, pos2 = self._initial_positions
+        self.turn = 1
+        self.x = np.array([[pos1['x']] * n, [pos2['x']] * n], dtype=np.int64)
+        self.y = np.array([[pos1['y']] * n, [pos2['y']] * n], dtype=np.int64)
+        self.hp = np.full((2, n), float(self.ruleset.initial_hp))
+        self.hp_is_float = np.full((2, n), isinstance(self.ruleset.initial_hp, float))  # 防御で半減したダメージを受けると HP が float になる
+        self.sp = np.full((2, n), self.ruleset.initial_sp, dtype=np.int64)
+        self.stun = np.zeros((2, n), dtype=np.int64)
+        self.defend = np.zeros((2, n), dtype=bool)
+        self.parry_active = np.zeros((2, n), dtype=bool)
+        self.parry_cooldown = np.zeros((2, n), dtype=np.int64)
+        self.camouflage_active = np.zeros((2, n), dtype=bool)
+        self.camouflage_remaining = np.zeros((2, n), dtype=np.int64)
+        self.camouflage_last_x = np.full((2, n), _NO_POSITION, dtype=np.int64)
+        self.camouflage_last_y = np.full((2, n), _NO_POSITION, dtype=np.int64)
+        self.scan_active = np.zeros((2, n), dtype=bool)
+        self.scan_remaining = np.zeros((2, n), dtype=np.int64)
+        # 罠: マスごとの持ち主（0: なし, 1: robot1, 2: robot2）と設置順
+        cells = self.x_max * self.y_max
+        self.trap_owner = np.zeros((n, cells), dtype=np.int8)
+        self.trap_serial = np.zeros((n, cells), dtype=np.int64)
+        self.trap_counter = np.zeros(n, dtype=np.int64)
+        self.trap_count = np.zeros((2, n), dtype=np.int64)
+
+        self.active = np.ones(n, dtype=bool)
+        self.turns = np.full(n, self.turn, dtype=np.int64)  # 試合終了時の turn（GameController.turn と同じ）
+        self.rng_draws = np.zeros(n, dtype=np.int64)
+        self.action_codes = np.zeros((max(self.max_turn, 1), n), dtype=np.uint8)
+        self._match_rngs = {}
+        self._bot_rngs = ({}, {})
+        self._memos = ([MemoStore() for _ in range(n)], [MemoStore() for _ in range(n)])
+        self._history = [] if self.record else None
+        if self.record:
+            self._record()
+
+    # ------------------------------------------------------------------
+    # ルールから使う補助
+    # ------------------------------------------------------------------
+    def adjacent(self):
+        return np.abs(self.x[0] - self.x[1]) + np.abs(self.y[0] - self.y[1]) == 1
+
+    def occupied(self, x, y):
+        """(x, y) にどちらかのロボットがいる試合のマスク"""
+        return ((x == self.x[0]) & (y == self.y[0])) | ((x == self.x[1]) & (y == self.y[1]))
+
+    def step_target(self, side, name):
+        """移動・罠設置の対象マス（盤外は端に丸める）"""
+        dx, dy = _STEPS[name]
+        return (
+            np.clip(self.x[side] + dx, 0, self.x_max - 1),
+            np.clip(self.y[side] + dy, 0, self.y_max - 1),
+        )
+
+    def damage(self, side, mask, amount):
+        """robot.Robot.receive_attack と同じ（防御中は軽減）"""
+        defend = self.defend[side]
+        reduced = amount * self.ruleset.defend.reduction
+        damage = np.where(defend, reduced, amount)
+        self.hp[side][mask] -= np.maximum(damage, 0)[mask]
+        # Python の演算と同じく、float のダメージを受けたら HP は float になる
+        self.hp_is_float[side] |= mask & np.where(defend, isinstance(reduced, float), isinstance(amount, float))
+
+    def match_rng(self, row):
+        """試合 ``row`` のエンジン用乱数（GameController.rng と同じ系列）"""
+        rng = self._match_rngs.get(row)
+        if rng is None:
+            rng = self._match_rngs[row] = random.Random(child_seed(self.seeds[row], "engine"))
+        return rng
+
+    def _bot_rng(self, side, row):
+        rngs = self._bot_rngs[side]
+        rng = rngs.get(row)
+        if rng is None:
+            rng = rngs[row] = random.Random(child_seed(self.seeds[row], f"robot{side + 1}"))
+        return rng
+
+    # ------------------------------------------------------------------
+    # ターン進行
+    # ------------------------------------------------------------------
+    def run(self, robot1_logic, robot2_logic):
+        """全試合を決着まで進め、勝者の配列（0: robot1, 1: robot2）を返す"""
+        logics = (robot1_logic, robot2_logic)
+        while self.turn < self.max_turn and self.active.any():
+            side = 0 if self.turn % 2 != 0 else 1
+            self.step(side, logics[side])
+        self.turns[self.active] = self.turn
+        return self.winner
+
+    @property
+    def winner(self):
+        return np.where(self.hp[0] > self.hp[1], 0, 1)
+
+    def step(self, side, logic):
+        """1 ターン進める（``GameController.run_logic`` + ``save_game_state`` 相当）"""
+        enemy = 1 - side
+        active = self.active.copy()
+
+        self._check_traps(active, side, enemy)
+        codes = self._collect_actions(active, side, logic)
+
+        stunned = active & (self.stun[side] > 0)
+        acting = active & ~stunned
+        if (acting & ~self._valid[codes]).any():
+            raise ValueError("Unexpected robot action detected!")
+        self._start_turn(acting, side)
+        for code, name, apply in self._rules:
+            mask = acting & (codes == code)
+            if mask.any():
+                apply(self, mask, side, enemy, name)
+
+        recorded = np.where(stunned, STUN_CODE, codes).astype(np.uint8)
+        recorded[~active] = NONE_CODE
+        self.action_codes[self.turn] = recorded
+        if self.record:
+            self._record()
+
+        self.turn += 1
+        ended = active & ~((self.hp[0] > 0) & (self.hp[1] > 0))
+        self.turns[ended] = self.turn
+        self.active = active & ~ended
+
+    def _check_traps(self, active, side, enemy):
+        """手番のロボットの罠を敵が踏んでいればダメージ（actions.Trap.check_trap）"""
+        if not self.trap_count[side].any():
+            return
+        rows = np.flatnonzero(active)
+        cells = self.y[enemy][rows] * self.x_max + self.x[enemy][rows]
+        hit = self.trap_owner[rows, cells] == side + 1
+        rows, cells = rows[hit], cells[hit]
+        if rows.size == 0:
+            return
+        self.trap_owner[rows, cells] = 0
+        self.trap_count[side][rows] -= 1
+        mask = np.zeros(self.n, dtype=bool)
+        mask[rows] = True
+        self.damage(enemy, mask, self.ruleset.trap.damage)
+
+    def _start_turn(self, acting, side):
+        """robot.Robot.start_turn（スタンしていないロボットのみ）"""
+        self.defend[side][acting] = False
+        self.parry_active[side][acting] = False
+        cooldown = self.parry_cooldown[side]
+        cooldown[acting & (cooldown > 0)] -= 1
+        for active, remaining in (
+                (self.camouflage_active[side], self.camouflage_remaining[side]),
+                (self.scan_active[side], self.scan_remaining[side])):
+            ticking = acting & active
+            remaining[ticking] -= 1
+            active[ticking & (remaining <= 0)] = False
+
+    def _collect_actions(self, active, side, logic):
+        policy = getattr(logic, "batch_policy", None)
+        if policy is not None:
+            codes = np.asarray(policy(BatchObservation(self, side, active)), dtype=np.uint8)
+            return self._adjust[side][codes]
+
+        codes = np.zeros(self.n, dtype=np.uint8)
+        controller = self._scratch
+        controller.turn = self.turn
+        robots = (controller.robot1, controller.robot2)
+        robot = robots[side]
+        view = controller.robot_views[side]
+        adjust = controller.adjust_action_for_robot1 if side == 0 else controller.adjust_action_for_robot2
+        memos = self._memos[side]
+        rngs = uses_random(logic)
+        window = getattr(logic, "memo_window", None)
+        columns = self._snapshot_columns()
+        for row in np.flatnonzero(active).tolist():
+            robots[0].restore(self._robot_snapshot(columns[0], 0, row))
+            robots[1].restore(self._robot_snapshot(columns[1], 1, row))
+            game_info = controller.build_game_info(robot)
+            if rngs:
+                response = call_with_rng(logic, self._bot_rng(side, row), view, game_info, memos[row].view(window))
+            else:
+                response = logic(view, game_info, memos[row].view(window))
+
+            if isinstance(response, str):
+                action = response
+                memo = {}
+            elif isinstance(response, (list, tuple)) and len(response) == 2:
+                action, memo = response
+            else:
+                assert False, f"Unexpected response format from robot_logic: {response} (type: {type(response)})"
+            memos[row].append(memo)
+            spec = ACTIONS.get(adjust(action))
+            codes[row] = NONE_CODE if spec is None else spec.code  # 不正な行動は NONE_CODE（行動時にエラー）
+        return codes
+
+    # ------------------------------------------------------------------
+    # 結果の取り出し
+    # ------------------------------------------------------------------
+    def traps(self, side, row):
+        """試合 ``row`` のロボット ``side`` の罠の座標（設置順）"""
+        if not self.trap_count[side][row]:
+            return ()
+        cells = np.flatnonzero(self.trap_owner[row] == side + 1)
+        cells = cells[np.argsort(self.trap_serial[row][cells], kind="stable")]
+        return tuple((int(cell) % self.x_max, int(cell) // self.x_max) for cell in cells)
+
+    def _snapshot_columns(self):
+        """RobotSnapshot の各フィールドを Python のリストにしたもの（ロボットごと）"""
+        return tuple(
+            tuple(column[side].tolist() for column in (
+                self.x, self.y, self.hp, self.sp, self.stun,
+                self.defend,
+                self.parry_active, self.parry_cooldown,
+                self.camouflage_active, self.camouflage_remaining, self.camouflage_last_x, self.camouflage_last_y,
+                self.scan_active, self.scan_remaining,
+                self.hp_is_float, self.trap_count,
+            ))
+            for side in (0, 1)
+        )
+
+    def _robot_snapshot(self, columns, side, row):
+        (x, y, hp, sp, stun, defend, parry_active, parry_cooldown,
+         camouflage_active, camouflage_remaining, last_x, last_y,
+         scan_active, scan_remaining, hp_is_float, trap_count) = columns
+        return RobotSnapshot(
+            x[row], y[row], hp[row] if hp_is_float[row] else int(hp[row]), sp[row], stun[row],
+            defend[row],
+            parry_active[row], parry_cooldown[row],
+            camouflage_active[row], camouflage_remaining[row],
+            None if last_x[row] == _NO_POSITION else (last_x[row], last_y[row]),
+            scan_active[row], scan_remaining[row],
+            self.traps(side, row) if trap_count[row] else (),
+        )
+
+    def robot_snapshot(self, side, row):
+        """試合 ``row`` のロボット ``side`` の RobotSnapshot"""
+        return self._robot_snapshot(self._snapshot_columns()[side], side, row)
+
+    def snapshot(self, row):
+        """試合 ``row`` の現在の状態（``GameController.snapshot`` と同じ形）"""
+        turn = self.turn if self.active[row] else int(self.turns[row])
+        return MatchSnapshot(
+            turn, self.match_rng(row).getstate(), self.robot_snapshot(0, row), self.robot_snapshot(1, row))
+
+    def codes(self, row):
+        """試合 ``row`` の action_codes（``GameController.action_codes`` と同じ bytes）"""
+        return bytes(self.action_codes[:int(self.turns[row]), row])
+
+    def _record(self):
+        self._history.append((
+            self.x.copy(), self.y.copy(), self.hp.copy(), self.hp_is_float.copy(), self.sp.copy(), self.defend.copy(),
+        ))
+
+    def game_state(self, row):
+        """試合 ``row`` の game_state（``GameController.game_state`` と同じリスト。``record=True`` が必要）"""
+        if not self.record:
+            raise ValueError("BatchEngine(record=True) is required to build game_state.")
+        settings = dict(self._scratch.game_state[0]['settings'])  # ルールセットなども同じ形式で記録する
+        settings['seed'] = self.seeds[row]
+        game_state = [{'settings': settings}]
+        for turn in range(int(self.turns[row])):
+            x, y, hp, hp_is_float, sp, defend = self._history[turn]
+            robots = []
+            for side in (0, 1):
+                value = float(hp[side][row])
+                robots.append({
+                    "name": self.names[side],
+                    "position": (int(x[side][row]), int(y[side][row])),
+                    "hp": value if hp_is_float[side][row] else int(value),
+                    "sp": int(sp[side][row]),
+                    "defense_mode": bool(defend[side][row]),
+                })
+            if turn == 0:
+                action = {'robot_name': None, 'action': None}
+            else:
+                action = {
+                    'robot_name': self.names[0 if turn % 2 != 0 else 1],
+                    'action': ACTIONS.name(int(self.action_codes[turn][row])),
+                }
+            game_state.append({"turn": turn, "robots": robots, "action": action})
+        return game_state
+
+
+def play_batch(robot1_logic, robot2_logic, matches, seed=None, **settings):
+    """``matches`` 試合をまとめて行い、終了した BatchEngine を返す。
+
+    ``seed`` を指定すると各試合のシードを ``rng.child_seed(seed, 試合番号)`` で導出する。
+    """
+    seeds = None if seed is None else [child_seed(seed, index) for index in range(matches)]
+    engine = BatchEngine(matches, seeds=seeds, **settings)
+    engine.run(robot1_logic, robot2_logic)
+    return engine
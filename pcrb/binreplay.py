@@ -0,0 +1,290 @@
+"""replay（game_state）の列指向バイナリ形式（``.pcrb``）。
+
+ファイルは固定のマジック・ヘッダ（設定とシードを含む ``game_state[0]``、ロボット名、各列の型と位置の JSON）の後に、
+ターンごとの固定長の列（ターン番号・手番のロボット・行動コード・位置・HP・SP・フラグなど）を列ごとに並べたもの。
+``BinaryReplay`` はファイルを ``mmap`` で開き、列を ``numpy.frombuffer`` のビューとして読むので、ターン N への移動や 1 列の読み込みでファイル全体を解析しない::
+
+    binreplay.write("game.pcrb", game_state)
+    hp = BinaryReplay("game.pcrb").column("hp")  # shape (ターン数, ロボット数)
+    state = BinaryReplay("game.pcrb").at_turn(50)  # game_state の 1 エントリと同じ dict
+
+列で表せないエントリ（未知のキーや行動名など）は元の dict をそのまま末尾の JSON に残すので、
+``game_state()`` / ``to_json`` で元の game_state（JSON として同じもの）に戻せる。
+"""
+import json
+import math
+import mmap
+import os
+import struct
+
+import numpy as np
+
+import zobrist
+from actions import ACTIONS
+from replay import ReplayWriter, load_replay
+
+MAGIC = b"PCRBCOL1"
+VERSION = 1
+
+_LENGTH = struct.Struct("<I")
+_ALIGN = 8
+
+# 行のフラグ（"flags" 列）
+HAS_ACTIONS = 1  # 同時手番モードの "actions" がある
+HAS_HASH = 2  # zobrist の "hash" がある
+# ロボットごとのフラグ（"robot_flags" 列）
+DEFENSE = 1  # defense_mode
+HP_FLOAT = 2  # HP が float（防御で軽減されたダメージ）
+
+NO_ACTOR = -1  # 行動したロボットなし（turn 0）
+
+
+def _dumps(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+def _columns(rows, robots, has_actions, has_hash):
+    """列名 → (型, 1 行の形)"""
+    columns = {
+        "turn": ("<i4", ()),
+        "actor": ("i1", ()),
+        "action": ("u1", ()),
+        "flags": ("u1", ()),
+        "x": ("<i2", (robots,)),
+        "y": ("<i2", (robots,)),
+        "hp": ("<f8", (robots,)),
+        "sp": ("<i4", (robots,)),
+        "robot_flags": ("u1", (robots,)),
+    }
+    if has_actions:
+        columns["actions"] = ("u1", (robots,))
+    if has_hash:
+        columns["hash"] = ("<u8", ())
+    return {name: np.zeros((rows,) + shape, dtype=dtype) for name, (dtype, shape) in columns.items()}
+
+
+def _code(action):
+    try:
+        return ACTIONS.code(action)
+    except (KeyError, TypeError):
+        return 0  # 元のエントリを extras に残す
+
+
+def _encode(columns, row, entry, names):
+    columns["turn"][row] = entry["turn"]
+    action = entry["action"]
+    name = action["robot_name"]
+    columns["actor"][row] = names.index(name) if name in names else NO_ACTOR
+    columns["action"][row] = _code(action["action"])
+    flags = 0
+    if "actions" in entry and "actions" in columns:
+        flags |= HAS_ACTIONS
+        for side, robot_action in enumerate(entry["actions"][:len(names)]):
+            columns["actions"][row, side] = _code(robot_action["action"])
+    if "hash" in entry and "hash" in columns:
+        flags |= HAS_HASH
+        columns["hash"][row] = int(entry["hash"], 16)
+    columns["flags"][row] = flags
+    for side, robot in enumerate(entry["robots"][:len(names)]):
+        columns["x"][row, side], columns["y"][row, side] = robot["position"]
+        columns["hp"][row, side] = robot["hp"]
+        columns["sp"][row, side] = robot["sp"]
+        columns["robot_flags"][row, side] = (
+            (DEFENSE if robot["defense_mode"] else 0) | (HP_FLOAT if type(robot["hp"]) is float else 0))
+
+
+def write(path, game_state):
+    """game_state を列指向バイナリ形式で ``path`` に書き出す"""
+    header, entries = game_state[0], game_state[1:]
+    first = entries[0]["robots"] if entries else []
+    names = [robot["name"] for robot in first]
+    teams = [robot["team"] for robot in first] if first and "team" in first[0] else None
+    columns = _columns(
+        len(entries), len(names),
+        any("actions" in entry for entry in entries), any("hash" in entry for entry in entries))
+    decoder = _Decoder(columns, names, teams)
+    extras = {}
+    for row, entry in enumerate(entries):
+        try:
+            _encode(columns, row, entry, names)
+            exact = _dumps(decoder.entry(row)) == _dumps(entry)
+        except (KeyError, TypeError, ValueError, OverflowError, IndexError):
+            exact = False
+        if not exact:
+            extras[row] = entry  # 列で表せないエントリはそのまま残す
+
+    layout = []
+    offset = 0
+    for name, array in columns.items():
+        layout.append([name, array.dtype.str, list(array.shape), offset])
+        offset += -(-array.nbytes // _ALIGN) * _ALIGN
+    extras_bytes = _dumps({str(row): entry for row, entry in extras.items()}).encode("utf-8")
+    meta = _dumps({
+        "version": VERSION, "header": header, "names": names, "teams": teams, "rows": len(entries),
+        "columns": layout, "extras": [offset, len(extras_bytes)],
+    }).encode("utf-8")
+    start = len(MAGIC) + _LENGTH.size + len(meta)
+    padding = -start % _ALIGN
+    with open(path, "wb") as f:
+        f.write(MAGIC + _LENGTH.pack(len(meta) + padding) + meta + b" " * padding)
+        for array in columns.values():
+            data = array.tobytes()
+            f.write(data + b"\0" * (-len(data) % _ALIGN))
+        f.write(extras_bytes)
+
+
+class _Decoder:
+    """列の 1 行を game_state のエントリ（dict）に戻す"""
+
+    def __init__(self, columns, names, teams):
+        self.columns = columns
+        self.names = names
+        self.teams = teams
+
+    def entry(self, row):
+        columns = self.columns
+        names = self.names
+        x, y, hp, sp, robot_flags = (
+            columns[name][row] for name in ("x", "y", "hp", "sp", "robot_flags"))
+        robots = []
+        for side, name in enumerate(names):
+            robot = {"name": name}
+            if self.teams is not None:
+                robot["team"] = self.teams[side]
+            flags = int(robot_flags[side])
+            value = float(hp[side])
+            robot["position"] = (int(x[side]), int(y[side]))
+            robot["hp"] = value if flags & HP_FLOAT else int(value)
+            robot["sp"] = int(sp[side])
+            robot["defense_mode"] = bool(flags & DEFENSE)
+            robots.append(robot)
+        actor = int(columns["actor"][row])
+        entry = {
+            "turn": int(columns["turn"][row]),
+            "robots": robots,
+            "action": {
+                "robot_name": None if actor == NO_ACTOR else names[actor],
+                "action": ACTIONS.name(int(columns["action"][row])),
+            },
+        }
+        flags = int(columns["flags"][row])
+        if flags & HAS_ACTIONS:
+            codes = columns["actions"][row]
+            entry["actions"] = [
+                {"robot_name": name, "action": ACTIONS.name(int(code))} for name, code in zip(names, codes)]
+        if flags & HAS_HASH:
+            entry["hash"] = zobrist.to_hex(int(columns["hash"][row]))
+        return entry
+
+
+class _LazyColumns:
+    """``_Decoder`` 用に、使う列だけをビューにする"""
+
+    def __init__(self, replay):
+        self._replay = replay
+
+    def __getitem__(self, name):
+        return self._replay.column(name)
+
+
+class BinaryReplay:
+    """列指向バイナリ形式の replay を memory map で読む。
+
+    :param source: ファイルのパス、またはバイト列（Streamlit のアップロードなど）
+    """
+
+    def __init__(self, source):
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = bytes(source)
+        start = len(MAGIC) + _LENGTH.size
+        if buffer[:len(MAGIC)] != MAGIC:
+            raise ValueError("Not a binary replay file.")
+        (length,) = _LENGTH.unpack(buffer[len(MAGIC):start])
+        meta = json.loads(buffer[start:start + length])
+        if meta["version"] != VERSION:
+            raise ValueError(f"Unsupported binary replay version: {meta['version']}")
+        self.header = meta["header"]  # game_state[0]
+        self.names = meta["names"]
+        self.teams = meta["teams"]
+        self._rows = meta["rows"]
+        self._base = start + length
+        self._layout = {name: (dtype, tuple(shape), offset) for name, dtype, shape, offset in meta["columns"]}
+        self._columns = {}
+        offset, size = meta["extras"]
+        self._extras_range = (self._base + offset, self._base + offset + size)
+        self._extras = None
+        self._buffer = buffer
+        self._decoder = _Decoder(_LazyColumns(self), self.names, self.teams)
+
+    def __len__(self):
+        """ターン数（game_state[1:] の長さ）"""
+        return self._rows
+
+    @property
+    def extras(self):
+        """列で表せず元の dict のまま残したエントリ（行番号 → エントリ）"""
+        if self._extras is None:
+            start, end = self._extras_range
+            self._extras = {int(row): entry for row, entry in json.loads(self._buffer[start:end]).items()}
+        return self._extras
+
+    def columns(self):
+        return list(self._layout)
+
+    def column(self, name):
+        """列（ファイルの読み取り専用ビュー。ロボットごとの列は shape (ターン数, ロボット数)）"""
+        column = self._columns.get(name)
+        if column is None:
+            dtype, shape, offset = self._layout[name]
+            column = np.frombuffer(
+                self._buffer, dtype=dtype, count=math.prod(shape), offset=self._base + offset).reshape(shape)
+            self._columns[name] = column
+        return column
+
+    def __getitem__(self, row):
+        """``row`` 行目のエントリ（``game_state[row + 1]`` と同じ dict）"""
+        if not -self._rows <= row < self._rows:
+            raise IndexError(row)
+        row %= self._rows
+        extras = self.extras
+        if extras and row in extras:
+            return extras[row]
+        return self._decoder.entry(row)
+
+    def index(self, turn):
+        """ターン ``turn`` の行番号"""
+        turns = self.column("turn")
+        row = int(np.searchsorted(turns, turn))
+        if row >= self._rows or turns[row] != turn:
+            raise KeyError(turn)
+        return row
+
+    def at_turn(self, turn):
+        """ターン ``turn`` のエントリ"""
+        return self[self.index(turn)]
+
+    def __iter__(self):
+        for row in range(self._rows):
+            yield self[row]
+
+    def game_state(self):
+        """元の game_state（リスト）"""
+        return [self.header] + list(self)
+
+
+def from_json(source, path):
+    """JSON の replay（NDJSON・gzip・従来の JSON 配列。``replay.load_replay`` 参照）をバイナリ形式に変換する"""
+    write(path, load_replay(source))
+
+
+def to_json(source, path):
+    """バイナリ形式の replay を NDJSON（``.gz`` なら gzip）に変換する"""
+    replay = BinaryReplay(source)
+    writer = ReplayWriter(path)
+    writer.header(replay.header)
+    for entry in replay:
+        writer.turn(entry)
+    writer.close()
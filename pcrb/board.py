@@ -0,0 +1,137 @@
+class Board:
+    """盤面の占有・罠インデックス。
+
+    セルごとの情報を ``y * x_max + x`` で引ける 1 次元配列に保持し、
+    「そのマスにロボット／罠があるか」を O(1) で判定する。
+    ロボットの座標や罠リストの正本は各 Robot / Trap 側にあり、
+    ここはそれらを変更するたびに同期される索引である。
+    """
+
+    def __init__(self, x_max, y_max, walls=None):
+        """
+        :param walls: 壁のマスを 1 にした長さ ``x_max * y_max`` の列（``terrain.Terrain.walls``）
+        """
+        self.x_max = x_max
+        self.y_max = y_max
+        self.size = x_max * y_max
+        self._robots = [None] * self.size  # マスにいるロボット
+        self._trap_owners = [None] * self.size  # マスにある罠の持ち主
+        self._occupied = set()  # ロボットがいるマスのインデックス
+        self._walls = bytearray(self.size) if walls is None else bytes(walls)
+        # 壁がある場合の床マスの一覧と、床マスの通し番号（random_free_cell 用）
+        self._floor = None
+        self._floor_rank = None
+        if any(self._walls):
+            self._floor = [index for index in range(self.size) if not self._walls[index]]
+            self._floor_rank = {index: rank for rank, index in enumerate(self._floor)}
+
+    def index(self, x, y):
+        return y * self.x_max + x
+
+    def position(self, index):
+        return index % self.x_max, index // self.x_max
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.x_max and 0 <= y < self.y_max
+
+    def is_wall(self, x, y):
+        return self._walls[y * self.x_max + x] == 1
+
+    def clear(self):
+        """ロボットと罠を取り除く（壁は残る）"""
+        self._robots = [None] * self.size
+        self._trap_owners = [None] * self.size
+        self._occupied = set()
+
+    # ------------------------------------------------------------------
+    # ロボット
+    # ------------------------------------------------------------------
+    def robot_at(self, x, y):
+        return self._robots[y * self.x_max + x]
+
+    def is_occupied(self, x, y):
+        return self._robots[y * self.x_max + x] is not None
+
+    def place(self, robot, x, y):
+        index = y * self.x_max + x
+        self._robots[index] = robot
+        self._occupied.add(index)
+
+    def move(self, robot, old_position, new_position):
+        old_index = self.index(*old_position)
+        if self._robots[old_index] is robot:
+            self._robots[old_index] = None
+            self._occupied.discard(old_index)
+        self.place(robot, *new_position)
+
+    def remove(self, robot, x, y):
+        """マスからロボットを取り除く（倒れたロボットなど）"""
+        index = y * self.x_max + x
+        if self._robots[index] is robot:
+            self._robots[index] = None
+            self._occupied.discard(index)
+
+    def robots_at_distance(self, x, y, distance):
+        """(x, y) からマンハッタン距離がちょうど ``distance`` のマスにいるロボット。
+
+        調べるのは距離 ``distance`` の菱形の周上 ``4 * distance`` マスだけなので、
+        ロボット数によらず一定のコストで引ける。順序は上から時計回り。
+        """
+        if distance == 0:
+            robot = self._robots[y * self.x_max + x]
+            return [] if robot is None else [robot]
+        robots = []
+        x_max, y_max, cells = self.x_max, self.y_max, self._robots
+        for step in range(4 * distance):
+            side, offset = divmod(step, distance)
+            if side == 0:    # 上 → 右
+                dx, dy = offset, offset - distance
+            elif side == 1:  # 右 → 下
+                dx, dy = distance - offset, offset
+            elif side == 2:  # 下 → 左
+                dx, dy = -offset, distance - offset
+            else:            # 左 → 上
+                dx, dy = offset - distance, -offset
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < x_max and 0 <= ny < y_max:
+                robot = cells[ny * x_max + nx]
+                if robot is not None:
+                    robots.append(robot)
+        return robots
+
+    def random_free_cell(self, rng):
+        """ロボットのいない床マスを一様に 1 つ選んで返す（空きがなければ None）
+
+        空きマスの一覧は作らず、占有マスを飛ばしながら番号を数えるため
+        コストは盤面サイズではなくロボット数に比例する。壁がある場合は床マスの通し番号で数える。
+        """
+        floor = self._floor
+        free = (self.size if floor is None else len(floor)) - len(self._occupied)
+        if free <= 0:
+            return None
+        index = rng.randrange(free)
+        if floor is None:
+            ranks = sorted(self._occupied)
+        else:
+            ranks = sorted(self._floor_rank[occupied] for occupied in self._occupied)
+        for rank in ranks:
+            if index >= rank:
+                index += 1
+            else:
+                break
+        return self.position(index if floor is None else floor[index])
+
+    # ------------------------------------------------------------------
+    # 罠
+    # ------------------------------------------------------------------
+    def trap_owner(self, x, y):
+        return self._trap_owners[y * self.x_max + x]
+
+    def has_trap(self, x, y):
+        return self._trap_owners[y * self.x_max + x] is not None
+
+    def add_trap(self, owner, x, y):
+        self._trap_owners[y * self.x_max + x] = owner
+
+    def remove_trap(self, x, y):
+        self._trap_owners[y * self.x_max + x] = None
@@ -0,0 +1,120 @@
+"""ロボットごとの持ち時間（チェスクロック）。
+
+``GameController(time_control=TimeControl(...))`` を指定すると、robot_logic の呼び出しを
+``time.perf_counter``（単調増加の時計）で計り、ロボットごとの持ち時間から差し引く。
+1 手ごとに ``increment`` 秒を加算し（フィッシャー方式）、1 手が ``move_limit`` 秒を超えた場合か
+持ち時間が尽きた場合は ``penalty`` を適用する。
+
+- ``"default"``: 応答を捨てて ``default_action`` を行う（メモは空）
+- ``"skip"``: そのターンは何もしない（行動は ``None`` として記録する）
+- ``"forfeit"``: HP を 0 にして負けにする
+
+実行中の robot_logic を途中で止めることはできないので、判定は呼び出しが戻ったあとに行う
+（同時手番モードで executor を使う場合だけは、残り時間を過ぎた時点で応答を待つのをやめる）。
+試合の終わりに各ロボットの合計時間などを ``game_state[0]["clock"]`` に記録する。
+"""
+import time
+from collections import namedtuple
+
+PENALTIES = ("default", "skip", "forfeit")
+
+_TimeControl = namedtuple(
+    "TimeControl", ["bank", "increment", "move_limit", "penalty", "default_action"])
+
+
+class TimeControl(_TimeControl):
+    """持ち時間の設定（秒）。
+
+    :param bank: 初期の持ち時間。``None`` で無制限
+    :param increment: 1 手ごとに加算する時間
+    :param move_limit: 1 手の上限。``None`` で無制限
+    :param penalty: 時間切れのときの扱い（``PENALTIES`` のいずれか）
+    :param default_action: ``penalty="default"`` で代わりに行う行動
+    """
+    __slots__ = ()
+
+    def __new__(cls, bank=None, increment=0.0, move_limit=None, penalty="default", default_action="rest"):
+        if penalty not in PENALTIES:
+            raise ValueError(f"Unknown time penalty: {penalty} (expected one of {PENALTIES})")
+        return super().__new__(cls, bank, increment, move_limit, penalty, default_action)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def to_dict(self):
+        return self._asdict()
+
+
+class ChessClock:
+    """ロボットごとの持ち時間と計測値。
+
+    :param control: ``TimeControl``（``None`` なら計測だけ行い、時間切れにはならない）
+    :param players: ロボットの数
+    """
+
+    def __init__(self, control=None, players=2):
+        self.control = control
+        self.players = players
+        self.reset()
+
+    def reset(self):
+        bank = None if self.control is None else self.control.bank
+        self.remaining = [bank] * self.players  # 残りの持ち時間（無制限なら None）
+        self.total = [0.0] * self.players  # 合計の思考時間
+        self.longest = [0.0] * self.players  # 最も長かった 1 手
+        self.calls = [0] * self.players
+        self.timeouts = [0] * self.players  # 時間切れになった回数
+
+    @staticmethod
+    def measure(func, *args):
+        """``func(*args)`` を呼び、``(戻り値, 経過秒)`` を返す"""
+        start = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - start
+
+    def budget(self, index):
+        """この手に使える時間（制限がなければ None）。executor の待ち時間に使う"""
+        control = self.control
+        if control is None:
+            return None
+        limits = [limit for limit in (control.move_limit, self.remaining[index]) if limit is not None]
+        return max(min(limits), 0.0) if limits else None
+
+    def charge(self, index, elapsed, expired=False):
+        """1 手分の時間を記録して持ち時間から引く。時間切れなら True を返す
+
+        :param expired: 応答を待ちきれなかった（executor の待ち時間を過ぎた）場合は True
+        """
+        self.total[index] += elapsed
+        self.calls[index] += 1
+        if elapsed > self.longest[index]:
+            self.longest[index] = elapsed
+        control = self.control
+        if control is None:
+            return False
+        timeout = expired or (control.move_limit is not None and elapsed > control.move_limit)
+        remaining = self.remaining[index]
+        if remaining is not None:
+            remaining -= elapsed
+            if remaining < 0:
+                timeout = True
+                remaining = 0.0
+            self.remaining[index] = remaining + control.increment
+        if timeout:
+            self.timeouts[index] += 1
+        return timeout
+
+    def summary(self, names):
+        """replay に記録する集計（ロボット名 → 値）"""
+        return {
+            name: {
+                "total": self.total[index],
+                "calls": self.calls[index],
+                "mean": self.total[index] / self.calls[index] if self.calls[index] else 0.0,
+                "longest": self.longest[index],
+                "timeouts": self.timeouts[index],
+                "remaining": self.remaining[index],
+            }
+            for index, name in enumerate(names)
+        }
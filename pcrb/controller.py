@@ -1,51 +1,226 @@
-import json
-
-from utils import is_valid_memo
+import random
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from types import MappingProxyType
+
+from actions import ACTIONS
+from board import Board
+from clock import PENALTIES
+from clock import ChessClock
+from clock import TimeControl
+from cycle import CycleDetector
+from events import EventLog
+from rng import call_with_rng
+from rng import child_seed
+from rng import new_seed
+from rng import uses_random
+import events
+import simultaneous
+import zobrist
+from memo import MemoStore
+from memo import view_for
+from observation import ABSENT
+from observation import new_game_info
+from observation import RobotView
+from robot import Robot
+from ruleset import DEFAULT_RULESET
+from ruleset import Ruleset
+from snapshot import ForwardModel
+from snapshot import MatchSnapshot
+from terrain import DIRECTIONS
+from terrain import Terrain
+from terrain import load_map
+from sinks import NullSink
+from sinks import legacy_sink
+
+_TRAP = ACTIONS.rule("trap")
+_SOAK_EVENTS = 256  # ソークモードで 1 つのイベントログに溜める件数
 
 
 class GameController:
     def __init__(
-            self, max_turn=100, x_max=9, y_max=7, robot1_initial_position=None, robot2_initial_position=None):
+            self, max_turn=100, x_max=9, y_max=7, robot1_initial_position=None, robot2_initial_position=None,
+            sink=None, headless=False, forward_model=False, seed=None, cycle_detection=True,
+            simultaneous=False, executor=None, terrain=None, soak=False, memo_limit=None, ruleset=None,
+            time_control=None, events=False, hash_states=False):
+        """
+        :param sink: ログ・状態イベントの出力先（``sinks`` モジュール参照）。
+            省略時は従来どおり標準出力と game_log.txt / game_state.json（中身は NDJSON。``replay`` 参照）に出力する。
+        :param headless: ``True`` で sink 省略時に ``NullSink`` を使い、print もファイル出力も行わない。
+        :param forward_model: ``True`` で game_info に先読み用の ``forward_model``（snapshot.ForwardModel）を渡す。
+        :param seed: 試合の乱数シード。省略時は新しいシードを生成する。
+            同じシードと同じロボットなら同じ game_state になる。
+        :param cycle_detection: ``True`` で、両ロボットが決定的と宣言されていてログ出力がない場合に
+            局面の繰り返しを検出し、残りのターンを早送りする（``cycle.CycleDetector``）。
+        :param simultaneous: ``True`` で同時手番モード。毎ターン両ロボットが同じ局面を見て行動を選び、
+            ``simultaneous`` モジュールの規則で同時に解決する。game_state の各ターンに両者の行動
+            （``actions``）を記録し、action_codes には 1 ターンに 2 つ（robot1, robot2）のコードを追加する。
+        :param executor: 同時手番モードで 2 体の robot_logic を並行に呼ぶ ``concurrent.futures`` の Executor。
+            ProcessPoolExecutor の場合はロボットのビューと game_info をその時点の値のコピーにして渡すので、
+            robot_logic はモジュールレベルの関数にし、``forward_model`` は使わないこと。
+        :param terrain: 壁のある盤面（``terrain.Terrain`` かマップファイルのパス）。
+            指定すると盤面の大きさと、省略した初期位置はマップから取り、game_info に距離場による
+            ``enemy_distance`` / ``next_step`` と ``terrain`` を渡す。
+        :param soak: ``True`` で長時間試合向けのソークモード。``max_turn`` によらずメモリを一定に保つため、
+            game_state には設定と最新ターンだけを残し（各ターンの状態はシンクへ流す）、
+            action_codes は記録せず、メモは ``memo_limit`` 件に制限する。サイクル検出は行わない。
+            ``events=True`` でもイベントログは直近の数百件だけを持ち、それより前は集計（``EventLog.fold``）だけを残す。
+        :param memo_limit: ロボットごとに保持するメモの件数（少なくとも直近この件数を残す）。
+            省略時は無制限、ソークモードでは 256。
+        :param ruleset: 行動のコスト・威力などと初期 HP / SP（``ruleset.Ruleset``、その辞書、または JSON のパス）。
+            省略時は既定のルールセット。試合の合間に ``set_ruleset`` で差し替えられる。
+        :param time_control: ロボットごとの持ち時間（``clock.TimeControl`` またはその辞書）。
+            robot_logic の呼び出し時間は常に ``clock`` で計測し、指定した場合は時間切れに罰則を適用して、
+            試合の終わりに集計を ``game_state[0]["clock"]`` に記録する。指定した場合はサイクル検出を行わない。
+            試合の合間に ``set_time_control`` で差し替えられる。
+        :param events: ``True`` で行動イベント（``events.EventLog``）をシンクの有無によらず記録し、
+            試合の終わりにロボットごとの集計を ``game_state[0]["events"]`` に記録する。
+            ログを出すシンクでは常に記録し、文章は ``sink.event`` で組み立てる。
+            記録する場合はサイクル検出を行わない。
+        :param hash_states: ``True`` で game_state の各ターンに局面の Zobrist ハッシュ（``state_hash`` の 16 進文字列）を
+            ``"hash"`` として記録する（``zobrist.first_divergence`` で 2 つの replay を比べられる）。
+            記録する場合はサイクル検出を行わない。
+        """
+        self.set_ruleset(ruleset)
+        if terrain is not None and not isinstance(terrain, Terrain):
+            terrain = load_map(terrain)
+        self.terrain = terrain
+        if terrain is not None:
+            x_max, y_max = terrain.x_max, terrain.y_max
+            if robot1_initial_position is None and "A" in terrain.starts:
+                robot1_initial_position = dict(zip("xy", terrain.starts["A"]))
+            if robot2_initial_position is None and "B" in terrain.starts:
+                robot2_initial_position = dict(zip("xy", terrain.starts["B"]))
         self.robot1 = None
         self.robot2 = None
-        self.memos1 = []
-        self.memos2 = []
+        self.robot_views = (None, None)  # robot_logic に渡す読み取り専用ビュー（robot1, robot2）
+        self._infos = (new_game_info(), new_game_info())  # ロボットごとに使い回す (game_info, 中身)
+        self._board_size = MappingProxyType({"x_max": x_max, "y_max": y_max})
+        self.action_codes = bytearray()  # ターンごとの行動コード（registry.ACTIONS 参照）
         self.turn = 0
         self.max_turn = max_turn
         self.x_max = x_max
         self.y_max = y_max
         self.robot1_initial_position = {'x': 1, 'y': 3} if robot1_initial_position is None else robot1_initial_position
         self.robot2_initial_position = {'x': 7, 'y': 3} if robot2_initial_position is None else robot2_initial_position
-        self.log_file = open("game_log.txt", "w")
-        self.game_state_file = open("game_state.json", "w")
-
-        self.game_state = [{
-            'settings': {
-                'max_turn': self.max_turn,
-                'x_max': self.x_max,
-                'y_max': self.y_max,
-            }
-        }]
+        self.board = Board(x_max, y_max, None if terrain is None else terrain.walls)
+        self.rng = random.Random()  # 試合ごとの乱数（テレポートなど）
+        self.bot_rngs = (random.Random(), random.Random())  # ロボットのコードが使う乱数（robot1, robot2）
+        self.rng_draws = 0  # rng を使った回数（状態が変わったかの安価な判定用）
+        self._restored_rng = (None, 0)  # 直前に restore した乱数状態と、その時点の rng_draws
+        self.seed = None
+        self.reseed(seed)
+        self._forward_model = None  # simulate 用の作業コントローラ（遅延生成）
+        self.forward_model = forward_model
+        self.set_time_control(time_control)
+        self.cycle_detection = cycle_detection and not simultaneous and not soak
+        self.soak = soak
+        self.memo_limit = 256 if soak and memo_limit is None else memo_limit
+        self.memos1 = MemoStore(self.memo_limit)
+        self.memos2 = MemoStore(self.memo_limit)
+        self.simultaneous = simultaneous
+        self.executor = executor
+        if sink is None:
+            sink = NullSink() if headless else legacy_sink()
+        self.sink = sink
+        self.log_enabled = sink.enabled
+        self.record_events = events
+        self.hash_states = hash_states
+        self.events = self._new_event_log()  # 行動イベント（記録しない場合は None）
+
+        self.game_state = self._initial_game_state()
+
+    def _initial_game_state(self):
+        settings = {
+            'max_turn': self.max_turn,
+            'x_max': self.x_max,
+            'y_max': self.y_max,
+            'seed': self.seed,
+        }
+        if self.simultaneous:
+            settings['simultaneous'] = True
+        if self.ruleset != DEFAULT_RULESET:
+            settings['ruleset'] = self.ruleset.to_dict()
+        if self.time_control is not None:
+            settings['time_control'] = self.time_control.to_dict()
+        if self.terrain is not None:
+            # 描画用に壁の位置も残す
+            settings['map'] = self.terrain.name
+            settings['walls'] = self.terrain.wall_cells()
+        return [{'settings': settings}]
+
+    def _new_event_log(self):
+        if not (self.record_events or self.log_enabled):
+            return None
+        return EventLog(_SOAK_EVENTS if self.soak else 1024, self.sink if self.log_enabled else None)
+
+    def set_ruleset(self, ruleset=None):
+        """ルールセットを差し替える（次の ``reset`` から初期 HP / SP にも反映される）"""
+        if ruleset is None:
+            ruleset = DEFAULT_RULESET
+        elif isinstance(ruleset, dict):
+            ruleset = Ruleset.from_dict(ruleset)
+        elif not isinstance(ruleset, Ruleset):
+            ruleset = Ruleset.load(ruleset)
+        self.ruleset = ruleset
+        if getattr(self, "_forward_model", None) is not None:
+            self._forward_model.set_ruleset(ruleset)
+
+    def set_time_control(self, time_control=None):
+        """持ち時間の設定を差し替え、時計を初期化する"""
+        if isinstance(time_control, dict):
+            time_control = TimeControl.from_dict(time_control)
+        self.time_control = time_control
+        self.clock = ChessClock(time_control)
+
+    def reseed(self, seed=None):
+        """乱数ストリームをシードから作り直す（エンジン用とロボットごとの子ストリーム）"""
+        self.seed = new_seed() if seed is None else seed
+        self.rng.seed(child_seed(self.seed, "engine"))
+        self.bot_rngs[0].seed(child_seed(self.seed, "robot1"))
+        self.bot_rngs[1].seed(child_seed(self.seed, "robot2"))
+        self.rng_draws = 0
+        self._restored_rng = (None, 0)
 
     def set_robots(self, robot1, robot2):
         self.robot1 = robot1
         self.robot2 = robot2
-        self.memos1 = []
-        self.memos2 = []
+        self.robot_views = (RobotView(robot1), RobotView(robot2))
+        self.rebuild_board()
+        self.memos1.clear()
+        self.memos2.clear()
+        self.clock.reset()
+        self.events = self._new_event_log()
+        self.action_codes = bytearray()
+        if self.log_enabled:
+            self.sink.begin(self.game_state[0])
         self.save_game_state(None, None)
         self.turn += 1
 
     def log_action(self, turn, message):
-        print(message)
-        self.log_file.write(f"Turn {turn}: {message}\n")
+        self.sink.log(turn, message)
+
+    def debug(self, message):
+        """標準出力向けのデバッグメッセージ（シンクが無効なら呼び出し側で省略する）"""
+        self.sink.debug(message)
+
+    def rebuild_board(self):
+        """ロボットの座標と罠リストから盤面インデックスを作り直す"""
+        self.board.clear()
+        for robot in (self.robot1, self.robot2):
+            if robot is None:
+                continue
+            self.board.place(robot, robot.x, robot.y)
+            for x, y in robot.state.traps:
+                self.board.add_trap(robot, x, y)
 
     def is_position_occupied(self, x, y):
         """指定された位置にロボットがいるかを確認"""
-        return self.robot1.position == (x, y) or self.robot2.position == (x, y)
-    
+        return self.board.is_occupied(x, y)
+
     def is_trap_at_position(self, x, y):
         """指定された位置にトラップがあるかを確認（自分または相手のトラップ）"""
-        return (x, y) in self.robot1.trap.traps or (x, y) in self.robot2.trap.traps
+        return self.board.has_trap(x, y)
     
     @staticmethod
     def adjust_action_for_robot1(action):
@@ -68,64 +243,196 @@ class GameController:
         memos = self.memos1 if robot == self.robot1 else self.memos2
         adjust_action = self.adjust_action_for_robot1 if robot == self.robot1 else self.adjust_action_for_robot2
 
-        robot.trap.check_trap(enemy)  # 罠のチェック
+        _TRAP.check_trap(robot, enemy)  # 罠のチェック
 
         game_info = self.build_game_info(robot)
 
-        response = robot.robot_logic(robot, game_info, memos)
-        print(f"DEBUG: response from robot_logic: {response}, type: {type(response)}")
-
-        if isinstance(response, str):
-            action = response
-            memo = {}
-        elif isinstance(response, (list, tuple)) and len(response) == 2:
-            action, memo = response
-        else:
-            assert False, f"Unexpected response format from robot_logic: {response} (type: {type(response)})"
+        index = 0 if robot is self.robot1 else 1
+        response, elapsed = ChessClock.measure(
+            call_with_rng, robot.robot_logic, self.bot_rngs[index], self.robot_views[index], game_info,
+            view_for(memos, robot.robot_logic))
+        if self.clock.charge(index, elapsed):
+            response = self._time_penalty(robot, elapsed)
+        if self.log_enabled:
+            self.debug(f"DEBUG: response from robot_logic: {response}, type: {type(response)}")
 
+        action, memo = self.parse_response(response)
         action = adjust_action(action)
 
-        if robot == self.robot1:
-            self.memos1.append(memo)
-        else:
-            self.memos2.append(memo)
-
-        if robot.stun_counter > 0:
-            print(f"DEBUG: Stunned. Returning ('stun')")
+        memos.append(memo)
 
+        if self.resolve_action(robot, enemy, action) == "stun":
             return "stun", {}
 
+        if self.log_enabled:
+            self.debug(f"DEBUG: Returning action: {action} (type: {type(action)})")
+        return action, memo
+
+    def _time_penalty(self, robot, elapsed):
+        """時間切れの robot に罰則を適用し、robot_logic の応答の代わりを返す（行動しない場合は行動名が None）"""
+        control = self.time_control
+        if self.events is not None:
+            self.events.emit(self.turn, events.TIMEOUT, robot, arg=PENALTIES.index(control.penalty), amount=elapsed)
+        if control.penalty == "default":
+            return control.default_action, {}
+        if control.penalty == "forfeit":
+            robot.forfeit()
+        return None, {}
+
+    @staticmethod
+    def parse_response(response):
+        """robot_logic の戻り値を ``(行動名, メモ)`` にする"""
+        if isinstance(response, str):
+            return response, {}
+        if isinstance(response, (list, tuple)) and len(response) == 2:
+            return response[0], response[1]
+        assert False, f"Unexpected response format from robot_logic: {response} (type: {type(response)})"
+
+    def run_simultaneous(self):
+        """同時手番モードの 1 ターン。両ロボットの行動名（スタン中は "stun"）を返す"""
+        robots = (self.robot1, self.robot2)
+        enemies = (self.robot2, self.robot1)
+        for robot, enemy in zip(robots, enemies):
+            _TRAP.check_trap(robot, enemy)  # 罠のチェック
+        infos = [self.build_game_info(robot) for robot in robots]
+        memos = (self.memos1, self.memos2)
+
+        results = self._call_logics(robots, infos, memos)
+        intents = []
+        for index, (robot, enemy) in enumerate(zip(robots, enemies)):
+            response, rng, elapsed, expired = results[index]
+            if rng is not self.bot_rngs[index]:
+                self.bot_rngs[index].setstate(rng.getstate())  # 別プロセスで進んだ乱数を戻す
+            if self.clock.charge(index, elapsed, expired):
+                response = self._time_penalty(robot, elapsed)
+            action, memo = self.parse_response(response)
+            action = (self.adjust_action_for_robot1, self.adjust_action_for_robot2)[index](action)
+            memos[index].append(memo)
+            intents.append((robot, enemy, "stun" if robot.stun_counter > 0 else action))
+
+        simultaneous.resolve(self, intents)
+        return [action for _, _, action in intents]
+
+    def _call_logics(self, robots, infos, memos):
+        logics = [robot.robot_logic for robot in robots]
+        executor = self.executor
+        shared = getattr(logics[0], "__globals__", None) is getattr(logics[1], "__globals__", 0)
+        if executor is None or (shared and uses_random(logics[0])):
+            # 同じモジュールのロジック同士は random の差し替えが干渉するので順に呼ぶ
+            return [
+                (*simultaneous.call_logic(logic, rng, view, info, view_for(memo, logic)), False)
+                for logic, rng, view, info, memo in zip(logics, self.bot_rngs, self.robot_views, infos, memos)
+            ]
+        start = time.perf_counter()
+        futures = [
+            executor.submit(simultaneous.call_logic, logic, rng, view, info, view_for(memo, logic))
+            for logic, rng, view, info, memo in zip(logics, self.bot_rngs, self.robot_views, infos, memos)
+        ]
+        results = []
+        for index, future in enumerate(futures):
+            budget = self.clock.budget(index)
+            try:
+                timeout = None if budget is None else max(start + budget - time.perf_counter(), 0.0)
+                results.append((*future.result(timeout=timeout), False))
+            except FutureTimeout:
+                # 持ち時間を過ぎたら待たない（呼び出し自体は止められないので結果は捨てる）
+                results.append((None, self.bot_rngs[index], time.perf_counter() - start, True))
+        return results
+
+    def resolve_action(self, robot, enemy, action):
+        """スタン判定・ターン開始処理のあと行動を実行し、実際に行われた行動名を返す"""
+        if robot.stun_counter > 0:
+            if self.log_enabled:
+                self.debug(f"DEBUG: Stunned. Returning ('stun')")
+            return "stun"
+
         robot.start_turn()
-        if action == "rest":
-            robot.rest(self.turn)
-        elif action == "attack":
-            robot.attack(enemy, self.turn)
-        elif action == "defend":
-            robot.defend(self.turn)
-        elif action in ["up", "down", "left", "right"]:
-            robot.move(action, self.turn)
-        elif action == "ranged_attack":
-            robot.ranged_attack(enemy, self.turn)
-        elif action == "parry":
-            robot.parry(self.turn)
-        elif action in ["trap_up", "trap_down", "trap_left", "trap_right"]:
-            robot.trap(action, self.turn)
-        elif action == "steal":
-            robot.steal(enemy, self.turn)
-        elif action == "teleport":
-            robot.teleport(self.turn)
-        elif action == "camouflage":
-            robot.camouflage(self.turn)
-        elif action == "scan":
-            robot.scan(self.turn)
-        else:
-            print(f"Invalid action: {action}")
-            raise ValueError("Unexpected robot action detected!")
+        if action is None:
+            return None  # 時間切れで行動しない
+        if self.log_enabled and action not in ACTIONS:
+            self.debug(f"Invalid action: {action}")
+        ACTIONS.dispatch(robot, enemy, action, self.turn)  # 未登録の行動は ValueError
+        return action
 
-        print(f"DEBUG: Returning action: {action} (type: {type(action)})")
-        return action, memo
+    def step(self, robot, action):
+        """robot_logic を呼ばずに ``action``（robot_logic の戻り値と同じ表記）を適用してターンを進める。
+
+        game_state やメモには記録しない。フォワードモデル（``simulate``）から使う。
+        """
+        enemy = self.robot1 if robot is self.robot2 else self.robot2
+        adjust_action = self.adjust_action_for_robot1 if robot is self.robot1 else self.adjust_action_for_robot2
+        _TRAP.check_trap(robot, enemy)
+        action = self.resolve_action(robot, enemy, adjust_action(action))
+        self.turn += 1
+        return action
 
-    def save_game_state(self, robot_name, action):
+    # ------------------------------------------------------------------
+    # フォワードモデル
+    # ------------------------------------------------------------------
+    def snapshot(self):
+        """試合状態（ロボット・罠・クールダウン・スタン・各種タイマー・乱数）を不変の値で返す。
+
+        ログ・メモ・game_state は含まない。
+        """
+        return MatchSnapshot(self.turn, self.rng.getstate(), self.robot1.snapshot(), self.robot2.snapshot())
+
+    def restore(self, snapshot):
+        """``snapshot`` の状態に戻す"""
+        self.turn = snapshot.turn
+        if snapshot.rng_state is not self._restored_rng[0] or self.rng_draws != self._restored_rng[1]:
+            self.rng.setstate(snapshot.rng_state)
+            self._restored_rng = (snapshot.rng_state, self.rng_draws)
+        self.robot1.restore(snapshot.robot1)
+        self.robot2.restore(snapshot.robot2)
+        self.rebuild_board()
+
+    def simulate(self, actions, snapshot=None):
+        """``snapshot``（省略時は現在の状態）から ``actions`` を順に適用した結果の MatchSnapshot を返す。
+
+        ``actions`` の要素は行動名（手番は game_loop と同じく奇数ターンが robot1）か、
+        ``(ロボット番号 0/1, 行動名)`` のタプル。行動名は robot_logic の戻り値と同じ表記で、
+        robot2 の向きの補正も同様に行う。途中でどちらかが倒れるか max_turn に達したら止める。
+        実際の試合・ログ・乱数には一切触れない。
+        """
+        model = self._forward_model_controller()
+        snapshot = self.snapshot() if snapshot is None else snapshot
+        model.restore(snapshot)
+        draws = model.rng_draws
+        robots = (model.robot1, model.robot2)
+        for item in actions:
+            if not (model.robot1.is_alive() and model.robot2.is_alive() and model.turn < model.max_turn):
+                break
+            if isinstance(item, str):
+                robot = model.robot1 if model.turn % 2 != 0 else model.robot2
+                action = item
+            else:
+                index, action = item
+                robot = robots[index]
+            model.step(robot, action)
+        if model.rng_draws == draws:
+            # 乱数を使っていなければ getstate() を省略して元の状態を使い回す
+            return MatchSnapshot(model.turn, snapshot.rng_state, model.robot1.snapshot(), model.robot2.snapshot())
+        return model.snapshot()
+
+    def _forward_model_controller(self):
+        model = self._forward_model
+        if model is None:
+            model = GameController(
+                max_turn=self.max_turn, x_max=self.x_max, y_max=self.y_max, headless=True, terrain=self.terrain,
+                ruleset=self.ruleset)
+            model.set_robots(
+                Robot(self.robot1.name, self.robot1.x, self.robot1.y, None, model),
+                Robot(self.robot2.name, self.robot2.x, self.robot2.y, None, model),
+            )
+            self._forward_model = model
+        return model
+
+    def state_hash(self):
+        """現在の局面の 64 ビット Zobrist ハッシュ（両ロボットの位置・HP・SP・スタン・行動フラグ・クールダウン・罠と
+        手番の偶奇）。ロボットは一度求めたハッシュを差分で更新するので、2 回目以降は O(1) で求まる"""
+        return zobrist.combine(self.robot1.zobrist_hash, self.robot2.zobrist_hash, self.turn)
+
+    def save_game_state(self, robot_name, action, actions=None):
         # 現在のターンのゲーム状態を辞書形式で記録
         state = {
             "turn": self.turn,
@@ -135,14 +442,14 @@ class GameController:
                     "position": self.robot1.position,
                     "hp": self.robot1.hp,
                     "sp": self.robot1.sp,
-                    "defense_mode": self.robot1.defend.is_active,
+                    "defense_mode": self.robot1.state.defend_active,
                 },
                 {
                     "name": self.robot2.name,
                     "position": self.robot2.position,
                     "hp": self.robot2.hp,
                     "sp": self.robot2.sp,
-                    "defense_mode": self.robot2.defend.is_active,
+                    "defense_mode": self.robot2.state.defend_active,
                 }
             ],
             'action': {
@@ -150,61 +457,138 @@ class GameController:
                 'action': action
             }
         }
-        self.game_state.append(state)
+        if actions is not None:
+            # 同時手番モード: 両ロボットの行動
+            state['actions'] = [
+                {'robot_name': robot.name, 'action': robot_action}
+                for robot, robot_action in zip((self.robot1, self.robot2), actions)
+            ]
+        if self.hash_states:
+            state['hash'] = zobrist.to_hex(self.state_hash())
+        if self.soak:
+            # 設定と最新ターンだけを残す
+            del self.game_state[1:]
+            self.game_state.append(state)
+            if self.events is not None and len(self.events) >= _SOAK_EVENTS:
+                if self.record_events:
+                    self.events.fold()  # 集計だけ残してイベントは捨てる
+                else:
+                    self.events = self._new_event_log()  # ログへ流し終えたイベントは捨てる
+        else:
+            self.game_state.append(state)
+            if actions is None:
+                self.action_codes.append(ACTIONS.code(action))
+            else:
+                self.action_codes.extend(ACTIONS.code(robot_action) for robot_action in actions)
+        if self.log_enabled:
+            self.sink.state(state)
 
     def game_loop(self):
+        detector = None
+        if (self.cycle_detection and self.time_control is None and not self.record_events and not self.hash_states
+                and CycleDetector.applies_to(self)):
+            detector = CycleDetector(self)
         while self.robot1.is_alive() and self.robot2.is_alive() and self.turn < self.max_turn:
+            if self.simultaneous:
+                if self.log_enabled:
+                    self.log_action(self.turn, f"\n--- Turn {self.turn} : simultaneous ---")
+                actions = self.run_simultaneous()
+                self.save_game_state(self.robot1.name, actions[0], actions)
+                if self.log_enabled:
+                    self.log_action(self.turn, f" - {self.robot1.name} : HP: {self.robot1.hp}, SP: {self.robot1.sp}")
+                    self.log_action(self.turn, f" - {self.robot2.name} : HP: {self.robot2.hp}, SP: {self.robot2.sp}")
+                self.turn += 1
+                continue
+            if detector is not None:
+                start = detector.check()
+                if start is not None:
+                    detector.fast_forward(start)
+                    break
             current_robot = self.robot1 if self.turn % 2 != 0 else self.robot2 # Robot1 (A) が先攻になるように変更
-            self.log_action(self.turn, f"\n--- Turn {self.turn} : {current_robot.name} turn ---")
+            if self.log_enabled:
+                self.log_action(self.turn, f"\n--- Turn {self.turn} : {current_robot.name} turn ---")
             action, _ = self.run_logic(current_robot)
             self.save_game_state(current_robot.name, action)  # 各ターンごとの状態を保存
-            self.log_action(self.turn, f" - {self.robot1.name} : HP: {self.robot1.hp}, SP: {self.robot1.sp}")
-            self.log_action(self.turn, f" - {self.robot2.name} : HP: {self.robot2.hp}, SP: {self.robot2.sp}")
+            if self.log_enabled:
+                self.log_action(self.turn, f" - {self.robot1.name} : HP: {self.robot1.hp}, SP: {self.robot1.sp}")
+                self.log_action(self.turn, f" - {self.robot2.name} : HP: {self.robot2.hp}, SP: {self.robot2.sp}")
             self.turn += 1
 
         winner = self.robot1 if self.robot1.hp > self.robot2.hp else self.robot2
-        self.log_action(self.turn, f"\n{winner.name} wins!")
-        self.log_file.close()
-
-        json.dump(self.game_state, self.game_state_file, indent=4)
-        self.game_state_file.close()
+        if self.time_control is not None:
+            self.game_state[0]['clock'] = self.clock.summary((self.robot1.name, self.robot2.name))
+        if self.record_events:
+            self.game_state[0]['events'] = self.events.summary()
+        if self.log_enabled:
+            self.log_action(self.turn, f"\n{winner.name} wins!")
+        self.sink.finish(self.game_state)
         return winner, self.game_state
 
     def build_game_info(self, robot):
         """
-        指定した robot から見たゲーム状況を辞書で返す。
-        ・スキャン中なら敵 SP や罠の座標も渡す
+        指定した robot から見たゲーム状況（``observation.GameInfo``）を返す。
+        ロボットごとに同じオブジェクトを使い回し、呼ぶたびに中身を書き換える。
+        ・スキャン中なら敵 SP や罠の座標（読み取り専用のビュー）も渡す
         ・敵がカモフラージュ中で、自分がスキャンしていない場合は
-          敵の位置を None にして隠す
+          最後に知られている位置を渡す
         """
         enemy = self.robot1 if robot is self.robot2 else self.robot2
+        info, fields = self._infos[0 if robot is self.robot1 else 1]
+        scanning = robot.state.scan_active
 
-        info = {
-            "turn":            self.turn,
-            "enemy_hp":        enemy.hp,
-            "enemy_position":  enemy.position,   # 後で条件付きで None にする
-            "max_turn":        self.max_turn,
-            "board_size":      {"x_max": self.x_max, "y_max": self.y_max},
-        }
+        fields.turn = self.turn
+        fields.enemy_hp = enemy.hp
+        fields.max_turn = self.max_turn
+        fields.board_size = self._board_size
 
         # カモフラージュによる位置隠蔽
-        if not robot.scan.is_active and enemy.camouflage.is_active:
-            info["enemy_position"] = enemy.camouflage.last_known_position  # 最後に知られている位置を使用
+        if not scanning and enemy.state.camouflage_active:
+            fields.enemy_position = enemy.state.camouflage_last_position  # 最後に知られている位置を使用
+        else:
+            fields.enemy_position = enemy.position
 
         # スキャンしていれば追加情報を開示
-        if robot.scan.is_active:
-            info["enemy_sp"]    = enemy.sp
-            info["enemy_traps"] = enemy.trap.traps.copy()
+        if scanning:
+            fields.enemy_sp = enemy.sp
+            fields.enemy_traps = enemy.state.traps.keys()
+        else:
+            fields.enemy_sp = fields.enemy_traps = ABSENT
+
+        if self.terrain is not None:
+            self._add_terrain_info(robot, fields)
 
+        fields.forward_model = ForwardModel(self) if self.forward_model else ABSENT
         return info
 
-    def reset(self):
-        """試合を完全リセットして新しいゲームを開始できるようにする"""
+    def _add_terrain_info(self, robot, fields):
+        """距離場から敵までの歩数と、敵へ向かう次の 1 歩（見えている敵の罠は避ける）を加える"""
+        terrain = self.terrain
+        target = fields.enemy_position
+        avoid = () if fields.enemy_traps is ABSENT else fields.enemy_traps
+        fields.terrain = terrain
+        fields.enemy_distance = terrain.distance(robot.position, target)
+        steps = terrain.next_steps(robot.position, target, avoid)
+        if not steps and avoid:
+            steps = terrain.next_steps(robot.position, target)  # 罠を避けると届かない場合
+        # robot2 は行動名が補正されるので、補正後にその向きへ動く行動名を返す
+        adjust = self.adjust_action_for_robot1 if robot is self.robot1 else self.adjust_action_for_robot2
+        fields.next_step = next(
+            (name for name in DIRECTIONS if DIRECTIONS[adjust(name)] in steps), None)
+
+    def reset(self, seed=None):
+        """試合を完全リセットして新しいゲームを開始できるようにする
+
+        :param seed: 新しい試合の乱数シード（省略時は新しく生成する）
+        """
 
-        # 1) ターンとメモをクリア
+        # 1) ターンとメモをクリアし、乱数を再シード
+        self.reseed(seed)
         self.turn   = 0
-        self.memos1 = []
-        self.memos2 = []
+        self.memos1.clear()
+        self.memos2.clear()
+        self.clock.reset()
+        self.events = self._new_event_log()
+        self.action_codes = bytearray()
 
         # 2) ロボットを初期位置・初期ステータスに戻す
         for robot, init_pos in (
@@ -214,24 +598,20 @@ class GameController:
             if robot is not None:
                 # Robot クラス内の reset に委譲
                 robot.reset(init_pos["x"], init_pos["y"])
+        self.rebuild_board()
 
-        # 3) ゲームステートを初期化
-        self.game_state = [{
-            "settings": {
-                "max_turn": self.max_turn,
-                "x_max":    self.x_max,
-                "y_max":    self.y_max,
-            }
-        }]
-
-        # 4) ログファイル／ステートファイルをクリア（追記でなく新規）
-        if not self.log_file.closed:
-            self.log_file.close()
-        self.log_file = open("game_log.txt", "w")
+        # 3) シンクを初期化（ファイルは次の書き込み時に新規作成される）
+        self.sink.reset()
 
-        if not self.game_state_file.closed:
-            self.game_state_file.close()
-        self.game_state_file = open("game_state.json", "w")
+        # 4) ゲームステートを初期化し、set_robots と同じく初期状態を記録してターン 1 から始める
+        #    （以前の試合の game_state を呼び出し側が保持していても壊さないよう新しいリストを作る）
+        self.game_state = self._initial_game_state()
+        if self.robot1 is not None and self.robot2 is not None:
+            if self.log_enabled:
+                self.sink.begin(self.game_state[0])
+            self.save_game_state(None, None)
+            self.turn = 1
 
         # 5) 完了メッセージ（任意）
-        print("[GameController] Reset complete. Ready for a new match.")
\ No newline at end of file
+        if self.log_enabled:
+            self.debug("[GameController] Reset complete. Ready for a new match.")
@@ -0,0 +1,138 @@
+from actions import ACTIONS
+from ruleset import DEFAULT_RULESET
+
+
+def is_deterministic(logic):
+    """robot_logic が決定的（``robot_logic.deterministic = True``）と宣言されているか。
+
+    決定的とは、ターン番号以外の同じ局面と同じ直近メモ（``memo_window`` 件）に対して
+    常に同じ応答を返し、乱数を使わないことをいう。
+    """
+    return getattr(logic, "deterministic", False) is True
+
+
+def memo_window(logic):
+    """robot_logic が参照する直近メモの件数（``robot_logic.memo_window``、省略時 0）"""
+    return getattr(logic, "memo_window", 0)
+
+
+def sp_horizon(logic1, logic2, ruleset=DEFAULT_RULESET):
+    """SP をこの値で頭打ちにして局面を比較してよい値（分からなければ None）。
+
+    ロボットは ``robot_logic.sp_horizon`` で「自分と敵の SP がこの値以上なら区別しない」ことを宣言する。
+    """
+    horizons = (getattr(logic1, "sp_horizon", None), getattr(logic2, "sp_horizon", None))
+    if None in horizons:
+        return None
+    return max(horizons + tuple(spec.rule.sp_horizon(ruleset.params(spec.attr)) for spec in ACTIONS))
+
+
+def _memo_summary(memos, window):
+    if not window:
+        return ()
+    return tuple(tuple(sorted(memo.items())) for memo in memos[-window:])
+
+
+def _shift_sp(snapshot, delta, times):
+    if not delta:
+        return snapshot
+    return snapshot._replace(sp=snapshot.sp + delta * times)
+
+
+class CycleDetector:
+    """決定的なロボット同士の試合で局面の繰り返しを検出し、残りのターンを早送りする。
+
+    局面はロボットの状態（位置・HP・SP・スタン・各種タイマー・罠）、手番、
+    乱数の使用回数、直近メモの要約をキーにする。同じキーが再び現れたら以降は
+    その周期の繰り返しになるので、``max_turn`` までの game_state を周期から書き出す。
+
+    両ロボットが ``sp_horizon`` を宣言していれば SP はその値で頭打ちにして比較する。
+    休み続けるなどで SP だけが周期ごとに一定量増える場合も、周期中の SP が常に
+    頭打ち以上であれば同じ行動列が続くので、SP を 1 周期あたりの増分から求めて早送りする。
+    """
+    __slots__ = ("controller", "_seen", "_states", "_windows", "_horizon")
+
+    def __init__(self, controller):
+        self.controller = controller
+        self._seen = {}     # 局面キー → ターン
+        self._states = {}   # ターン → (robot1, robot2) のスナップショット
+        logic1 = controller.robot1.robot_logic
+        logic2 = controller.robot2.robot_logic
+        self._windows = (memo_window(logic1), memo_window(logic2))
+        self._horizon = sp_horizon(logic1, logic2, controller.ruleset)
+
+    @staticmethod
+    def applies_to(controller):
+        """早送りしてよい試合か（両ロボットが決定的で、ログ出力がない）"""
+        return (
+            not controller.log_enabled
+            and is_deterministic(controller.robot1.robot_logic)
+            and is_deterministic(controller.robot2.robot_logic)
+        )
+
+    def _robot_key(self, snapshot):
+        horizon = self._horizon
+        if horizon is None or snapshot.sp < horizon:
+            return snapshot
+        return snapshot[:3] + (horizon,) + snapshot[4:]  # _replace より速い
+
+    def check(self):
+        """現在の局面を記録し、早送りできる周期の開始ターンを返す（なければ None）"""
+        controller = self.controller
+        turn = controller.turn
+        robot1 = controller.robot1.snapshot()
+        robot2 = controller.robot2.snapshot()
+        self._states[turn] = (robot1, robot2)
+        key = (turn & 1, controller.rng_draws, self._robot_key(robot1), self._robot_key(robot2))
+        if self._windows != (0, 0):
+            key += (
+                _memo_summary(controller.memos1, self._windows[0]),
+                _memo_summary(controller.memos2, self._windows[1]),
+            )
+        start = self._seen.get(key)
+        self._seen[key] = turn
+        if start is None or not self._repeats(start, turn):
+            return None
+        return start
+
+    def _repeats(self, start, now):
+        """``start`` からの周期が SP の増分込みで繰り返し続けるか"""
+        states = self._states
+        for index in (0, 1):
+            delta = states[now][index].sp - states[start][index].sp
+            if delta < 0:
+                return False
+            if delta > 0 and min(states[turn][index].sp for turn in range(start, now)) < self._horizon:
+                return False
+        return True
+
+    def fast_forward(self, start):
+        """ターン ``start`` から現在までの周期を ``max_turn`` まで繰り返した状態にする"""
+        controller = self.controller
+        now = controller.turn
+        period = now - start
+        deltas = tuple(self._states[now][index].sp - self._states[start][index].sp for index in (0, 1))
+        game_state = controller.game_state
+        action_codes = controller.action_codes
+        for turn in range(now, controller.max_turn):
+            cycles, offset = divmod(turn - start, period)
+            source = start + offset
+            entry = game_state[source + 1]  # game_state[0] は設定
+            robots = [dict(robot) for robot in entry["robots"]]
+            for robot, delta in zip(robots, deltas):
+                if delta:
+                    robot["sp"] += delta * cycles
+            game_state.append({"turn": turn, "robots": robots, "action": dict(entry["action"])})
+            action_codes.append(action_codes[source])
+            # robot1 は奇数ターン、robot2 は偶数ターンにメモを 1 件ずつ追加している
+            if source & 1:
+                controller.memos1.repeat((source - 1) // 2)
+            else:
+                controller.memos2.repeat((source - 2) // 2)
+
+        cycles, offset = divmod(controller.max_turn - start, period)
+        robot1, robot2 = self._states[start + offset]
+        controller.robot1.restore(_shift_sp(robot1, deltas[0], cycles))
+        controller.robot2.restore(_shift_sp(robot2, deltas[1], cycles))
+        controller.rebuild_board()
+        controller.turn = controller.max_turn
@@ -6,6 +6,7 @@ from typing import Dict, List, Tuple
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.offsetbox import AnnotationBbox, OffsetImage
+from actions import ACTIONS
 from pcrb.constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
 
 ###############################################################################
@@ -66,6 +67,16 @@ def _direction_offset(direction: str) -> Tuple[int, int]:
     return mapping[direction]
 
 
+# 行動のハイライト形状ごとの対象マス（相対座標）
+_HIGHLIGHT_OFFSETS = {
+    "adjacent": [(-1, 0), (1, 0), (0, -1), (0, 1)],
+    "ranged": [
+        (-2, 0), (2, 0), (0, -2), (0, 2),
+        (1, 1), (-1, -1), (1, -1), (-1, 1),
+    ],
+}
+
+
 def _collect_robot_positions(turn_data: dict) -> Dict[str, Tuple[int, int]]:
     """ターン情報から各ロボットの座標を抽出して返す。"""
     return {r["name"]: tuple(r["position"]) for r in turn_data["robots"]}
@@ -81,65 +92,32 @@ def _collect_action_targets(
 
     targets: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
 
-    player = turn_data["action"]["robot_name"]
-    if player is None:
-        return targets
-
-    rx, ry = robot_positions[player]
-    action = turn_data["action"]["action"]
-
-    in_field = lambda x, y: 0 <= x < x_max and 0 <= y < y_max
-
-    if action == "attack":
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-            nx, ny = rx + dx, ry + dy
-            if in_field(nx, ny):
-                targets["attack"].append((ny, nx))
-
-    elif action == "rest":
-        targets["rest"].append((ry, rx))
+    # 同時手番モードでは両ロボットの行動が "actions" に入る
+    for record in turn_data.get("actions", [turn_data["action"]]):
+        player = record["robot_name"]
+        if player is None:
+            continue
 
-    elif action in {"right", "left", "down", "up"}:
-        dx, dy = _direction_offset(action)
-        nx, ny = rx + dx, ry + dy
-        if in_field(nx, ny):
-            targets["move"].append((ny, nx))
+        rx, ry = robot_positions[player]
+        action = record["action"]
 
-    elif action == "defend":
-        targets["defend"].append((ry, rx))
+        spec = ACTIONS.get(action)
+        if spec is None:  # "stun" など盤面に作用しない行動
+            continue
 
-    elif action == "parry":
-        targets["parry"].append((ry, rx))
+        if spec.highlight == "self":
+            targets[spec.marker].append((ry, rx))
+            continue
 
-    elif action == "ranged_attack":
-        for dx, dy in [
-            (-2, 0), (2, 0), (0, -2), (0, 2),
-            (1, 1), (-1, -1), (1, -1), (-1, 1),
-        ]:
-            nx, ny = rx + dx, ry + dy
-            if in_field(nx, ny):
-                targets["ranged_attack"].append((ny, nx))
-
-    elif action.startswith("trap_"):
-        dx, dy = _direction_offset(action)
-        nx, ny = rx + dx, ry + dy
-        if in_field(nx, ny):
-            targets["trap"].append((ny, nx))
+        if spec.highlight == "step":
+            offsets = [_direction_offset(action)]
+        else:
+            offsets = _HIGHLIGHT_OFFSETS[spec.highlight]
 
-    elif action == "steal":
-        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        for dx, dy in offsets:
             nx, ny = rx + dx, ry + dy
-            if in_field(nx, ny):
-                targets["steal"].append((ny, nx))
-
-    elif action == "teleport":
-        targets["teleport"].append((ry, rx))
-
-    elif action == "camouflage":
-        targets["camouflage"].append((ry, rx))
-
-    elif action == "scan":
-        targets["scan"].append((ry, rx))
+            if 0 <= nx < x_max and 0 <= ny < y_max:
+                targets[spec.marker].append((ny, nx))
 
     return targets
 
@@ -147,8 +125,8 @@ def _collect_action_targets(
 # 散布図ベースのボード (v1)
 ###############################################################################
 
-def draw_board(turn_data: dict, x_max: int, y_max: int, *, red_robot_name: str, blue_robot_name: str, title: str = "", is_show: bool = True):
-    """散布図を用いたシンプルな可視化関数。"""
+def draw_board(turn_data: dict, x_max: int, y_max: int, *, red_robot_name: str, blue_robot_name: str, title: str = "", is_show: bool = True, walls=()):
+    """散布図を用いたシンプルな可視化関数。``walls`` は壁のマス ``(x, y)`` の列（settings の ``walls``）。"""
 
     # 共通情報生成
     robot_positions = _collect_robot_positions(turn_data)
@@ -168,6 +146,9 @@ def draw_board(turn_data: dict, x_max: int, y_max: int, *, red_robot_name: str,
     plt.yticks(np.arange(0, y_max, 1))
     plt.grid(color="gray", linestyle="-", linewidth=0.5)
 
+    for x, y in walls:
+        plt.scatter(x, y, color="dimgray", s=300, marker="s")
+
     # アクション→色
     colour_map = {
         "attack": "red",
@@ -206,8 +187,9 @@ def draw_board_v2(
     blue_robot_name: str,
     title: str = "",
     is_show: bool = True,
+    walls=(),
 ):
-    """スプライトを用いたリッチな可視化関数。"""
+    """スプライトを用いたリッチな可視化関数。``walls`` は壁のマス ``(x, y)`` の列（settings の ``walls``）。"""
 
     # 共通情報生成
     robot_positions = _collect_robot_positions(turn_data)
@@ -248,10 +230,14 @@ def draw_board_v2(
     ax.grid(color="gray", linestyle="-", linewidth=0.5)
     ax.set_aspect("equal")
 
-    # 背景タイル
+    # 背景タイル（壁のマスは塗りつぶす）
+    wall_cells = {tuple(cell) for cell in walls}
     for x in range(x_max):
         for y in range(y_max):
-            add_image_to_plot(ax, sprites["tile"], x, y, zoom=1.0, fallback_color="#444")
+            if (x, y) in wall_cells:
+                ax.add_patch(plt.Rectangle((x - 0.5, y - 0.5), 1, 1, color="#222"))
+            else:
+                add_image_to_plot(ax, sprites["tile"], x, y, zoom=1.0, fallback_color="#444")
 
     # ----------------------------------------------------------------------
     # ロボット描画
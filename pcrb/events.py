@@ -0,0 +1,248 @@
+"""行動ごとのイベントを型付きの列（``array``）に記録するイベントログ。
+
+行動ルールはログ文字列を組み立てる代わりに ``controller.events.emit(turn, ATTACK_HIT, actor, target, ...)``
+でイベントを記録する。各イベントは固定の項目（``FIELDS``: ターン・種類・行動者・対象・引数・座標・量）を
+``struct`` で詰めた 1 行として先に確保したバッファ（``bytearray``）に書き込むので、記録のたびに Python の
+オブジェクトは作られない。人が読む文章（従来の game_log.txt の書式）は ``message`` で必要になったときにだけ組み立てる。
+
+集計は文字列を解析せずに行える。``column`` で項目ごとの ``array`` を取り出せるほか、
+``summary`` でロボットごとの合計を返す::
+
+    controller = GameController(headless=True, events=True)
+    ...
+    controller.events.summary()  # {"Robot A": {"damage_dealt": 40, "stunned": 1, "wasted_turns": 3, ...}, ...}
+"""
+import struct
+from array import array
+from collections import namedtuple
+
+# name    : イベント名
+# template: 文章の書式（actor / target / x / y / amount / extra / arg と、arg から引く action / direction / penalty）
+# wasted  : 行動が失敗した（手番を無駄にした）イベントか
+EventType = namedtuple("EventType", ["code", "name", "template", "wasted"])
+
+EVENT_TYPES = []
+
+
+def _event(name, template, wasted=False):
+    code = len(EVENT_TYPES)
+    EVENT_TYPES.append(EventType(code, name, template, wasted))
+    return code
+
+
+# arg で表す値（イベントの列には整数で入れる）
+ACTION_PHRASES = (
+    ("attack", "attack"), ("move", "move"), ("defend", "defend"), ("ranged_attack", "perform a ranged attack"),
+    ("parry", "parry"), ("rest", "rest"), ("trap", "set a trap"), ("steal", "steal"), ("teleport", "teleport"),
+    ("camouflage", "activate camouflage"), ("scan", "scan"),
+)
+ACTION_INDEX = {attr: index for index, (attr, _) in enumerate(ACTION_PHRASES)}
+DIRECTION_NAMES = ("up", "down", "left", "right")
+DIRECTION_INDEX = {name: index for index, name in enumerate(DIRECTION_NAMES)}
+PENALTY_NAMES = ("default", "skip", "forfeit")
+
+ATTACK_HIT = _event("attack_hit", "{actor} attacks {target} at ({x}, {y}) for {amount} damage.")
+ATTACK_OUT_OF_RANGE = _event("attack_out_of_range", "{actor} tried to attack a non-adjacent location.", True)
+PARRY_STUN = _event("parry_stun", "{actor}'s attack was parried by {target} and {actor} is stunned.", True)
+NO_SP = _event("no_sp", "{actor} does not have enough SP to {action}!", True)
+MOVE = _event("move", "{actor} moved {direction} to ({x}, {y}), HP: {amount}, SP: {extra}")
+MOVE_INVALID = _event("move_invalid", "{actor} tried to move in an invalid direction.", True)
+MOVE_WALL = _event("move_wall", "{actor} tried to move to ({x}, {y}), but there is a wall.", True)
+MOVE_BLOCKED = _event("move_blocked", "{actor} tried to move to ({x}, {y}), but the path is blocked.", True)
+MOVE_COLLISION = _event("move_collision", "{actor} tried to move to ({x}, {y}), but collided with {target}.", True)
+DEFEND = _event("defend", "{actor} is now in defense mode, reducing incoming damage.")
+RANGED_HIT = _event("ranged_hit", "{actor} performs a ranged attack on {target} for {amount} damage!")
+RANGED_OUT_OF_RANGE = _event(
+    "ranged_out_of_range",
+    "{actor} cannot perform a ranged attack on {target} due to incorrect distance (distance: {arg}).", True)
+PARRY = _event("parry", "{actor} started parrying!")
+PARRY_COOLDOWN = _event("parry_cooldown", "{actor}'s parry is on cooldown.", True)
+REST = _event("rest", "{actor} rests and recovers {amount} SP. Total SP: {extra}")
+TRAP_INVALID = _event("trap_invalid", "{actor} tried to set a trap in an invalid direction.", True)
+TRAP_WALL = _event("trap_wall", "{actor} tried to set a trap at ({x}, {y}), but there is a wall.", True)
+TRAP_OCCUPIED = _event(
+    "trap_occupied", "{actor} tried to set a trap at ({x}, {y}), but the position is occupied.", True)
+TRAP_EXISTS = _event("trap_exists", "{actor} tried to set a trap at ({x}, {y}), but a trap is already there.", True)
+TRAP_CONTESTED = _event("trap_contested", "{actor} and {target} tried to set a trap at the same position.", True)
+TRAP_PLACED = _event("trap_placed", "{actor} set a trap at ({x}, {y}).")
+TRAP_TRIGGERED = _event("trap_triggered", "{target} stepped on a trap and took {amount} damage!")
+STEAL = _event("steal", "{actor} steals {amount} SP from {target}.")
+STEAL_EMPTY = _event("steal_empty", "{target} has no SP to steal!", True)
+STEAL_OUT_OF_RANGE = _event("steal_out_of_range", "{actor} tried to steal from a non-adjacent target.", True)
+STEAL_MUTUAL = _event("steal_mutual", "{actor} and {target} tried to steal from each other and both failed.", True)
+TELEPORT = _event("teleport", "{actor} teleported to ({x}, {y}).")
+TELEPORT_BLOCKED = _event("teleport_blocked", "{actor} tried to teleport, but there is no free position.", True)
+CAMOUFLAGE_START = _event("camouflage_start", "{actor} activates camouflage and hides its position for {arg} turns!")
+CAMOUFLAGE_ACTIVE = _event("camouflage_active", "{actor} is already camouflaged!", True)
+CAMOUFLAGE_END = _event("camouflage_end", "{actor}'s camouflage has worn off.")
+SCAN_START = _event("scan_start", "{actor} scans the enemy for {arg} turns.")
+SCAN_END = _event("scan_end", "{actor}'s scan effect has worn off.")
+NO_TARGET = _event("no_target", "{actor} tried to {action}, but no enemy is in range.", True)
+DOWN = _event("down", "{actor} is down!")
+TIMEOUT = _event("timeout", "{actor} ran out of time ({amount:.3f} sec): {penalty}", True)
+
+# 与えたダメージとして数えるイベント（行動者が与え、対象が受ける）
+DAMAGE_EVENTS = frozenset((ATTACK_HIT, RANGED_HIT, TRAP_TRIGGERED))
+
+# イベント 1 件の項目（actor / target はロボット名、対象がなければ None）
+FIELDS = ("turn", "kind", "actor", "target", "arg", "x", "y", "amount", "extra")
+Event = namedtuple("Event", FIELDS)
+
+# バッファの 1 行: turn, kind, actor, target, floats, arg, x, y, amount, extra
+# （actor / target はロボットの番号、floats は amount / extra を float で受け取ったかのビット）
+_ROW = struct.Struct("<iBbbBiiidd")
+_NO_ROBOT = -1
+_AMOUNT_FLOAT = 1  # 文章を従来どおり "10.0" と書くため
+_EXTRA_FLOAT = 2
+
+# 列名 → (行の中の位置, array の型コード)。actors / targets は ``names`` の添字（対象なしは -1）
+COLUMNS = {
+    "turns": (0, "l"), "kinds": (1, "B"), "actors": (2, "b"), "targets": (3, "b"), "args": (5, "l"),
+    "xs": (6, "l"), "ys": (7, "l"), "amounts": (8, "d"), "extras": (9, "d"),
+}
+
+
+def _number(value, is_float=False):
+    return value if is_float or not value.is_integer() else int(value)
+
+
+class EventLog:
+    """イベントのバッファ。``capacity`` 件分を先に確保し、足りなくなったら倍に広げる。
+
+    :param sink: イベントを受け取るシンク（``sinks`` の ``event``）。``None`` なら記録だけ行う
+    """
+
+    def __init__(self, capacity=1024, sink=None):
+        self.sink = sink
+        self.capacity = capacity
+        self.size = 0
+        self.names = []  # ロボットの番号 → 名前
+        self._robots = {}  # ロボット → 番号
+        self._buffer = bytearray(_ROW.size * capacity)
+        self._folded = {}  # fold で捨てたイベントの集計（ロボット名 → summary の項目）
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.size = 0
+        self.names = []
+        self._robots = {}
+        self._folded = {}
+
+    def fold(self):
+        """記録済みのイベントを ``summary`` の集計に足してから捨て、バッファを空ける（ソークモード用）。
+
+        以降の ``column`` / ``counts`` / ``lines`` などは捨てた後のイベントだけを返す。
+        """
+        self._folded = self.summary()
+        self.size = 0
+
+    def _add_robot(self, robot):
+        number = self._robots[robot] = len(self.names)
+        self.names.append(robot.name)
+        return number
+
+    def emit(self, turn, kind, actor, target=None, arg=0, x=0, y=0, amount=0, extra=0):
+        """イベントを 1 件記録する"""
+        index = self.size
+        if index == self.capacity:
+            self._buffer.extend(bytes(len(self._buffer)))
+            self.capacity *= 2
+        robots = self._robots
+        actor_number = robots.get(actor)
+        if actor_number is None:
+            actor_number = self._add_robot(actor)
+        if target is None:
+            target_number = _NO_ROBOT
+        else:
+            target_number = robots.get(target)
+            if target_number is None:
+                target_number = self._add_robot(target)
+        floats = (_AMOUNT_FLOAT if type(amount) is float else 0) | (_EXTRA_FLOAT if type(extra) is float else 0)
+        _ROW.pack_into(
+            self._buffer, index * _ROW.size, turn, kind, actor_number, target_number, floats, arg, x, y, amount, extra)
+        self.size = index + 1
+        if self.sink is not None:
+            self.sink.event(self, index)
+
+    def __getitem__(self, index):
+        """``index`` 件目のイベント（``Event``）"""
+        if not 0 <= index < self.size:
+            raise IndexError("event index out of range")
+        turn, kind, actor, target, floats, arg, x, y, amount, extra = _ROW.unpack_from(self._buffer, index * _ROW.size)
+        return Event(
+            turn, kind, self.names[actor], None if target == _NO_ROBOT else self.names[target], arg, x, y,
+            _number(amount, floats & _AMOUNT_FLOAT), _number(extra, floats & _EXTRA_FLOAT))
+
+    def _rows(self):
+        return _ROW.iter_unpack(memoryview(self._buffer)[:self.size * _ROW.size])
+
+    def column(self, name):
+        """記録済みの範囲の項目 ``name``（``COLUMNS`` のキー）を ``array`` で返す"""
+        position, typecode = COLUMNS[name]
+        return array(typecode, [row[position] for row in self._rows()])
+
+    # ------------------------------------------------------------------
+    # 文章
+    # ------------------------------------------------------------------
+    def message(self, index):
+        """``index`` 件目のイベントを従来のログと同じ書式の文章にする"""
+        event = self[index]
+        arg = event.arg
+        return EVENT_TYPES[event.kind].template.format(
+            actor=event.actor, target=event.target, x=event.x, y=event.y,
+            amount=event.amount, extra=event.extra, arg=arg,
+            action=ACTION_PHRASES[arg][1] if 0 <= arg < len(ACTION_PHRASES) else arg,
+            direction=DIRECTION_NAMES[arg] if 0 <= arg < len(DIRECTION_NAMES) else arg,
+            penalty=PENALTY_NAMES[arg] if 0 <= arg < len(PENALTY_NAMES) else arg,
+        )
+
+    def lines(self):
+        """``(ターン, 文章)`` を順に返す"""
+        for index in range(self.size):
+            yield self[index].turn, self.message(index)
+
+    def text(self):
+        return "".join(f"Turn {turn}: {message}\n" for turn, message in self.lines())
+
+    # ------------------------------------------------------------------
+    # 集計
+    # ------------------------------------------------------------------
+    def counts(self):
+        """イベント名 → 件数"""
+        counts = [0] * len(EVENT_TYPES)
+        for kind in self.column("kinds"):
+            counts[kind] += 1
+        return {EVENT_TYPES[kind].name: count for kind, count in enumerate(counts) if count}
+
+    def summary(self):
+        """ロボット名 → 与えた・受けたダメージ、パリィでスタンした回数、奪った SP、無駄にした手番数、罠の発動回数
+
+        ``fold`` で捨てたイベントの分も含む。
+        """
+        folded = self._folded
+        totals = [
+            dict(folded[name]) if name in folded else {
+                "damage_dealt": 0, "damage_taken": 0, "stunned": 0, "sp_stolen": 0, "wasted_turns": 0,
+                "traps_triggered": 0,
+            }
+            for name in self.names
+        ]
+        for _, kind, actor, target, _, _, _, _, amount, _ in self._rows():
+            entry = totals[actor]
+            if kind in DAMAGE_EVENTS:
+                entry["damage_dealt"] += amount
+                totals[target]["damage_taken"] += amount
+                if kind == TRAP_TRIGGERED:
+                    entry["traps_triggered"] += 1
+            elif kind == STEAL:
+                entry["sp_stolen"] += amount
+            elif kind == PARRY_STUN:
+                entry["stunned"] += 1  # パリィされた側がスタンする
+            if EVENT_TYPES[kind].wasted:
+                entry["wasted_turns"] += 1
+        return {
+            name: {key: _number(value) if isinstance(value, float) else value for key, value in entry.items()}
+            for name, entry in zip(self.names, totals)
+        }
@@ -0,0 +1,172 @@
+"""ロボットのメモ（robot_logic が返す辞書）の保存領域。
+
+メモは 1 件ずつ辞書で持たず、キーごとの列（columnar）に値を並べて保存する。キーは ``sys.intern`` し、
+各行には「どのキーがどの順に入っていたか」（形）の番号だけを持つので、毎ターン同じ形のメモを返す
+ロボットでは 1 件あたりの記憶量は列の要素数ぶんだけになる。
+
+robot_logic には保存領域そのものではなく読み取り専用の ``MemoView`` を渡す。
+``memos[-1]["key"]`` や ``len(memos)``、スライスなど従来のリストと同じように読めるが、変更はできない。
+``robot_logic.memo_window = N`` を宣言したロボットには直近 N 件だけを見せる（別プロセスへもその分だけ送る）。
+"""
+import sys
+from collections.abc import Sequence
+from types import MappingProxyType
+
+from utils import validate_memo
+
+_MISSING = object()  # その行にないキー
+
+
+class MemoStore:
+    """メモの保存領域。
+
+    :param limit: 保持する件数（少なくとも直近この件数を残す）。``None`` で無制限。
+        件数が 2 倍に達したところで直近 ``limit`` 件に切り詰めるので、1 件あたりの追加コストは一定になる。
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.total = 0  # これまでに追加した件数
+        self._columns = {}  # キー → 値の列（行ごと、ない場合は _MISSING）
+        self._shapes = []  # 行 → 形の番号
+        self._shape_ids = {}  # キーの並び → 形の番号
+        self._shape_keys = []  # 形の番号 → キーの並び
+
+    def __len__(self):
+        return len(self._shapes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(row) for row in range(*index.indices(len(self._shapes)))]
+        size = len(self._shapes)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("memo index out of range")
+        return self._row(index)
+
+    def __iter__(self):
+        for row in range(len(self._shapes)):
+            yield self._row(row)
+
+    def __eq__(self, other):
+        if isinstance(other, (MemoStore, MemoView)):
+            other = list(other)
+        return isinstance(other, list) and list(self) == other
+
+    def __repr__(self):
+        return f"MemoStore({list(self)!r})"
+
+    def _row(self, row):
+        columns = self._columns
+        return MappingProxyType({key: columns[key][row] for key in self._shape_keys[self._shapes[row]]})
+
+    def append(self, memo):
+        """メモを検証して追加する（キーが文字列、値が数値・文字列・None の辞書でなければ ValueError）"""
+        self._append(validate_memo(memo))
+
+    def _append(self, memo):
+        keys = tuple(memo)
+        shape = self._shape_ids.get(keys)
+        if shape is None:
+            keys = tuple(sys.intern(key) for key in keys)
+            shape = self._shape_ids[keys] = len(self._shape_keys)
+            self._shape_keys.append(keys)
+        columns = self._columns
+        size = len(self._shapes)
+        for key, value in memo.items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[sys.intern(key)] = [_MISSING] * size
+            column.append(value)
+        if len(columns) != len(memo):
+            for key, column in columns.items():
+                if len(column) == size:
+                    column.append(_MISSING)
+        self._shapes.append(shape)
+        self.total += 1
+        limit = self.limit
+        if limit is not None and size + 1 >= 2 * limit:
+            self._trim(limit)
+
+    def _trim(self, keep):
+        del self._shapes[:-keep]
+        for key in list(self._columns):
+            column = self._columns[key]
+            del column[:-keep]
+            if all(value is _MISSING for value in column):
+                del self._columns[key]  # 残した範囲で使われていないキーは捨てる
+        # 使われなくなった形も捨てる
+        used = sorted(set(self._shapes))
+        if len(used) != len(self._shape_keys):
+            renumber = {old: new for new, old in enumerate(used)}
+            self._shape_keys = [self._shape_keys[old] for old in used]
+            self._shape_ids = {keys: new for new, keys in enumerate(self._shape_keys)}
+            self._shapes = [renumber[shape] for shape in self._shapes]
+
+    def repeat(self, index):
+        """``index`` 番目のメモをもう 1 度追加する（検証済みなので再検証しない）"""
+        self._append(self[index])
+
+    def clear(self):
+        self.__init__(self.limit)
+
+    def view(self, window=None):
+        """robot_logic に渡す読み取り専用のビュー（``window`` で直近の件数に絞る）"""
+        return MemoView(self, window)
+
+    @classmethod
+    def from_memos(cls, memos, limit=None):
+        store = cls(limit)
+        for memo in memos:
+            store.append(memo)
+        return store
+
+
+class MemoView(Sequence):
+    """``MemoStore`` の直近 ``window`` 件（``None`` で全件）を見る読み取り専用のシーケンス。
+
+    保存領域が更新されると見える内容も変わる。pickle するとその時点の見える範囲だけを持つ
+    ``MemoStore`` のビューになる（別プロセスのロボットへ渡すとき）。
+    """
+
+    __slots__ = ("_store", "_window")
+
+    def __init__(self, store, window=None):
+        self._store = store
+        self._window = window
+
+    def _start(self):
+        size = len(self._store)
+        window = self._window
+        return 0 if window is None or window >= size else size - window
+
+    def __len__(self):
+        return len(self._store) - self._start()
+
+    def __getitem__(self, index):
+        start = self._start()
+        size = len(self._store) - start
+        if isinstance(index, slice):
+            return [self._store[start + row] for row in range(*index.indices(size))]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("memo index out of range")
+        return self._store[start + index]
+
+    def __eq__(self, other):
+        if isinstance(other, (MemoStore, MemoView)):
+            other = list(other)
+        return isinstance(other, list) and list(self) == other
+
+    def __repr__(self):
+        return f"MemoView({list(self)!r})"
+
+    def __reduce__(self):
+        return MemoView, (MemoStore.from_memos([dict(memo) for memo in self]),)
+
+
+def view_for(store, logic):
+    """``logic`` に渡すビュー（``robot_logic.memo_window`` があれば直近その件数だけ）"""
+    return store.view(getattr(logic, "memo_window", None))
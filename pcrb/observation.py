@@ -0,0 +1,261 @@
+"""robot_logic に渡す読み取り専用の観測（``game_info`` と自分のロボット）。
+
+``GameInfo`` は従来の game_info 辞書と同じく ``game_info["enemy_hp"]`` / ``game_info.get("enemy_sp")`` /
+``"enemy_traps" in game_info`` で読める固定フィールドのレコードで、コントローラがロボットごとに 1 つ持ち、
+毎ターン中身だけを書き換える。ターンをまたいで値を残したい場合は ``dict(game_info)`` でコピーする。
+
+``RobotView`` は ``robot`` 引数として渡すロボットの読み取り専用ビューで、``robot.sp`` や
+``robot.parry.cooldown_counter``・``robot.attack.cost`` などは読めるが、行動の実行や状態の書き換えはできない。
+
+どちらも包んでいるエンジン側のオブジェクトはインスタンスごとに作るクラスの関数（クロージャ）が持ち、
+属性としては持たないので、robot_logic からロボットやコントローラにはたどれない。
+pickle すると、その時点の値だけを持つ小さなコピーになる（別プロセスのロボットへ渡すとき）。
+"""
+from collections.abc import Mapping
+from operator import attrgetter
+from types import MappingProxyType
+
+from actions import ACTIONS
+from robot import ACTION_ATTRS
+from robot import Robot
+from ruleset import DEFAULT_RULESET
+from ruleset import Ruleset
+
+ABSENT = object()  # そのターンに渡さないフィールド
+
+# 従来の game_info 辞書のキー（この順に列挙する）
+FIELDS = (
+    "turn", "enemy_hp", "enemy_position", "max_turn", "board_size",
+    "enemy_sp", "enemy_traps",
+    "terrain", "enemy_distance", "next_step",
+    "forward_model",
+)
+
+_GETTERS = {field: attrgetter(field) for field in FIELDS}
+
+
+class GameInfoFields:
+    """``GameInfo`` の中身。コントローラだけが持ち、``fields.turn = 3`` のように書き換える"""
+    __slots__ = FIELDS
+
+    def __init__(self, values=None):
+        values = values or {}
+        for field in FIELDS:
+            setattr(self, field, values.get(field, ABSENT))
+
+
+def _field_property(fields, field):
+    getter = _GETTERS[field]
+
+    def fget(info):
+        value = getter(fields)
+        if value is ABSENT:
+            raise AttributeError(field)
+        return value
+
+    return property(fget)
+
+
+class GameInfo(Mapping):
+    """ロボット 1 体から見たゲーム状況（``FIELDS``）。
+
+    フィールドは ``game_info["turn"]`` でも ``game_info.turn`` でも読める。
+    ``enemy_sp`` / ``enemy_traps`` はスキャン中、``terrain`` などは地形マップ使用時、
+    ``forward_model`` はフォワードモデル有効時だけ存在する。
+    中身（``GameInfoFields``）はコントローラだけが書き換える。
+    """
+    __slots__ = ()
+
+    def __new__(cls, **values):
+        return new_game_info(values)[0]
+
+    def __repr__(self):
+        return f"GameInfo({dict(self)!r})"
+
+    def __reduce__(self):
+        values = dict(self)
+        values.pop("forward_model", None)  # コントローラは別プロセスへ送らない
+        if "board_size" in values:
+            values["board_size"] = dict(values["board_size"])
+        if "enemy_traps" in values:
+            values["enemy_traps"] = list(values["enemy_traps"])
+        return _game_info, (values,)
+
+
+def new_game_info(values=None):
+    """``(GameInfo, GameInfoFields)`` の組を返す。``GameInfoFields`` を書き換えると ``GameInfo`` の中身が変わる"""
+    fields = GameInfoFields(values)
+
+    def __getitem__(info, key):
+        getter = _GETTERS.get(key)
+        if getter is None:
+            raise KeyError(key)
+        value = getter(fields)
+        if value is ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get(info, key, default=None):
+        getter = _GETTERS.get(key)
+        if getter is None:
+            return default
+        value = getter(fields)
+        return default if value is ABSENT else value
+
+    def __contains__(info, key):
+        getter = _GETTERS.get(key)
+        return getter is not None and getter(fields) is not ABSENT
+
+    def __iter__(info):
+        for field in FIELDS:
+            if _GETTERS[field](fields) is not ABSENT:
+                yield field
+
+    def __len__(info):
+        return sum(1 for _ in info)
+
+    namespace = {
+        "__slots__": (), "__getitem__": __getitem__, "get": get, "__contains__": __contains__,
+        "__iter__": __iter__, "__len__": __len__,
+    }
+    for field in FIELDS:
+        namespace[field] = _field_property(fields, field)
+    cls = type(GameInfo)(GameInfo.__name__, (GameInfo,), namespace)
+    return object.__new__(cls), fields
+
+
+def _game_info(values):
+    return GameInfo(**values)
+
+
+class _ActionView:
+    """``RobotView.parry`` などが返す行動の読み取り専用ビュー。
+
+    ``is_active`` などの状態フィールドと、ルールセットのパラメータ（``cost`` など）を読める。
+    """
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner):
+        self._owner = owner
+
+
+# 行動ビューから読める RobotState のフィールド
+_STATE_FIELDS = frozenset(
+    field for attr in ACTION_ATTRS for field in ACTIONS.rule(attr).state_fields.values())
+
+
+def _state_property(field):
+    def fget(action):
+        return action._owner._read_state(field)
+
+    return property(fget)
+
+
+def _action_view_class(rule):
+    """行動ごとのビューのクラス。ルールはクラスの関数が閉じ込める"""
+    def __getattr__(action, name):
+        if name in rule.parameters:
+            return getattr(action._owner.ruleset.params(rule.robot_attr), name)
+        value = getattr(rule, name)
+        if callable(value):
+            raise AttributeError(f"'{name}' is not available from robot_logic.")
+        return MappingProxyType(value) if isinstance(value, dict) else value
+
+    namespace = {"__slots__": (), "__getattr__": __getattr__}
+    for name, field in rule.state_fields.items():
+        namespace[name] = _state_property(field)
+    return type(f"{type(rule).__name__}View", (_ActionView,), namespace)
+
+
+class _ActionViewSlot:
+    """``RobotView.attack`` などのクラス属性。行動ビューはロボットのビューごとに 1 度だけ作る"""
+
+    def __init__(self, attr):
+        self.attr = attr
+        self.view_class = _action_view_class(ACTIONS.rule(attr))
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        actions = view._actions
+        action = actions.get(self.attr)
+        if action is None:
+            action = actions[self.attr] = self.view_class(view)
+        return action
+
+
+class RobotView:
+    """``robot_logic`` に渡す、ロボットの読み取り専用ビュー。常に現在の状態を返す。
+
+    :param robot: 対象のロボット
+    :param ruleset: パラメータを読むルールセット（省略時はロボットのコントローラのもの）
+    """
+    __slots__ = ("_actions",)
+
+    attack = _ActionViewSlot("attack")
+    move = _ActionViewSlot("move")
+    defend = _ActionViewSlot("defend")
+    ranged_attack = _ActionViewSlot("ranged_attack")
+    parry = _ActionViewSlot("parry")
+    rest = _ActionViewSlot("rest")
+    trap = _ActionViewSlot("trap")
+    steal = _ActionViewSlot("steal")
+    teleport = _ActionViewSlot("teleport")
+    camouflage = _ActionViewSlot("camouflage")
+    scan = _ActionViewSlot("scan")
+
+    def __new__(cls, robot, ruleset=None):
+        view = object.__new__(_robot_view_class(cls, robot, ruleset))
+        view._actions = {}
+        return view
+
+    def __repr__(self):
+        return f"RobotView({self.name!r}, hp={self.hp}, sp={self.sp}, position={self.position})"
+
+
+def _robot_view_class(cls, robot, ruleset):
+    """``robot`` を閉じ込めた ``cls`` のサブクラス（ビューごとに 1 つ）"""
+    def get_ruleset(view):
+        if ruleset is not None:
+            return ruleset
+        controller = robot.controller
+        return DEFAULT_RULESET if controller is None else controller.ruleset
+
+    def read_state(view, field):
+        if field not in _STATE_FIELDS:
+            raise AttributeError(field)
+        value = getattr(robot.state, field)
+        return MappingProxyType(value) if isinstance(value, dict) else value
+
+    def is_alive(view):
+        return robot._hp > 0
+
+    def status(view):
+        robot.status()
+
+    def __reduce__(view):
+        rules = view.ruleset
+        return _robot_view, (
+            robot._name, robot.snapshot(), None if rules == DEFAULT_RULESET else rules.to_dict())
+
+    return type(cls.__name__, (cls,), {
+        "__slots__": (),
+        "ruleset": property(get_ruleset),
+        "name": property(lambda view: robot._name),
+        "hp": property(lambda view: robot._hp),
+        "sp": property(lambda view: robot._sp),
+        "position": property(lambda view: (robot._x, robot._y)),
+        "x": property(lambda view: robot._x),
+        "y": property(lambda view: robot._y),
+        "stun_counter": property(lambda view: robot._stun_counter),
+        "_read_state": read_state,
+        "is_alive": is_alive,
+        "status": status,
+        "__reduce__": __reduce__,
+    })
+
+
+def _robot_view(name, snapshot, ruleset):
+    robot = Robot(name, snapshot.x, snapshot.y, None, None)
+    robot.restore(snapshot)
+    return RobotView(robot, None if ruleset is None else Ruleset.from_dict(ruleset))
@@ -1,10 +1,10 @@
-import json
 import streamlit as st
 
 import sys
 sys.path.append('./pcrb')
 
 from draw import draw_board_v2 as draw_board
+from replay import load_replay
 from pcrb.constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
 
 def st_draw_board(data):
@@ -64,7 +64,8 @@ def st_draw_board(data):
 
     robots_holder.write(_robots)
 
-    title = f"Turn {turn_data['turn']} - Action: {_action['robot_name']} -> {_action['action']}"
+    _actions = turn_data.get('actions', [_action])
+    title = f"Turn {turn_data['turn']} - Action: " + ", ".join(f"{a['robot_name']} -> {a['action']}" for a in _actions)
     title_holder.header(title)
 
     # 先攻・後攻ロボット名をログから取得
@@ -75,17 +76,18 @@ def st_draw_board(data):
         red_robot_name = PLAYER_ROBOT_NAME
         blue_robot_name = ENEMY_ROBOT_NAME
 
-    fig = draw_board(turn_data, x_max, y_max, red_robot_name=red_robot_name, blue_robot_name=blue_robot_name, title='', is_show=False)
+    fig = draw_board(turn_data, x_max, y_max, red_robot_name=red_robot_name, blue_robot_name=blue_robot_name, title='', is_show=False,
+                     walls=settings.get('walls', ()))
     board_holder.pyplot(fig)
 
 
 def main():
     st.title("Drawer Page") 
     st.caption("対戦ログをアップロードして、ボードを描画します。")
-    uploaded_file = st.file_uploader("Upload game_state.json", type="json")
+    uploaded_file = st.file_uploader("Upload game_state", type=["ndjson", "json", "gz", "pcrb"])
 
     if uploaded_file is not None:
-        data = json.load(uploaded_file)
+        data = load_replay(uploaded_file)
         st_draw_board(data)
 
 
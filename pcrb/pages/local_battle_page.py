@@ -3,7 +3,6 @@ import importlib.util
 import os
 import traceback
 import pandas as pd
-import json
 import base64
 import io
 import zipfile
@@ -11,7 +10,9 @@ import zipfile
 import sys
 sys.path.append('./pcrb')
 
-from app import is_safe_code, load_player_module, play_game, game_state_download_button
+from app import is_safe_code, load_player_module, play_game, game_state_download_button, replay_store
+from replay import dumps as replay_dumps
+from replayref import code_hash
 from pcrb.constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
 
 ROBOTS_DIR = "./pcrb/robots"
@@ -88,6 +89,8 @@ def main():
             # Initialize progress bar
             progress_bar = st.progress(0)
             status_text = st.empty()
+            bots = (code_hash(robot1_code), code_hash(robot2_code))
+            matches = []
 
             for i in range(battle_rounds):
                 status_text.text(f"Running Round {i+1}/{battle_rounds}...")
@@ -109,8 +112,12 @@ def main():
                     # "Result": result_str,  # ← 不要なので削除
                     "game_state": game_state
                 })
+                matches.append((game_state, bots))
                 progress_bar.progress((i + 1) / battle_rounds)
 
+            # 全ラウンドの replay をまとめてストアに保存する（同じ内容の試合は 1 度だけ）
+            replay_store().add_many(matches)
+
             status_text.text("All rounds complete!")
             st.write("--- Battle Summary ---")
             st.markdown(f"**{ROBOT1_NAME} Wins:** {st.session_state.robot1_wins}")
@@ -125,10 +132,10 @@ def main():
         # Prepare data for DataFrame, including download links
         display_data = []
         for res in st.session_state.local_battle_results:
-            game_state_json = json.dumps(res["game_state"], ensure_ascii=False, indent=4)
+            game_state_json = replay_dumps(res["game_state"])
             b64 = base64.b64encode(game_state_json.encode()).decode()
-            log_filename = f"local_battle_round_{res['Round']}_log.json"
-            download_link = f'<a href="data:application/json;base64,{b64}" download="{log_filename}">Download Log</a>'
+            log_filename = f"local_battle_round_{res['Round']}_log.ndjson"
+            download_link = f'<a href="data:application/x-ndjson;base64,{b64}" download="{log_filename}">Download Log</a>'
 
             display_data.append({
                 "Round": res["Round"],
@@ -146,8 +153,8 @@ def main():
         zip_buffer = io.BytesIO()
         with zipfile.ZipFile(zip_buffer, "a", zipfile.ZIP_DEFLATED, False) as zip_file:
             for res in st.session_state.local_battle_results:
-                log_filename = f"local_battle_round_{res['Round']}_log.json"
-                game_state_json_str = json.dumps(res["game_state"], ensure_ascii=False, indent=4)
+                log_filename = f"local_battle_round_{res['Round']}_log.ndjson"
+                game_state_json_str = replay_dumps(res["game_state"])
                 zip_file.writestr(log_filename, game_state_json_str)
 
         zip_buffer.seek(0)
@@ -34,7 +34,7 @@ def robot_logic(robot, game_info, memos):
 - **引数**:
   - `robot`: 自分のロボットを操作するオブジェクト。
   - `game_info`: 敵ロボットの位置やゲームの状態を表す辞書。
-  - `memos`: 前ターンの情報を保持する辞書。
+  - `memos`: これまでに返したメモ（辞書）の読み取り専用のリスト。メモはキーが文字列、値が数値・文字列・None の辞書にしてください。
 - **戻り値**:
   - ロボットの行動を指示するコマンド（例: `"attack"`, `"rest"`）。
 
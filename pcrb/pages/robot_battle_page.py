@@ -3,8 +3,6 @@ import importlib.util
 import os
 import traceback
 import pandas as pd
-import json
-import base64  
 
 import sys
 sys.path.append('./pcrb')
@@ -12,6 +10,8 @@ sys.path.append('./pcrb')
 from app import is_safe_code
 from app import load_player_module
 from app import play_game
+from replay import dumps as replay_dumps
+from replayref import CodeStore, ReplayRef, ReplayMismatchError
 from pcrb.constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
 
 ROBOTS_DIR = "./pcrb/robots"
@@ -51,8 +51,15 @@ def get_robot_files():
     return [f for f in os.listdir(ROBOTS_DIR) if f.endswith(".py") and f != "__init__.py"]
 
 
-def battle_with_saved_robots(player_robot_logic, battle_count=1):
-    """保存されているロボットと対戦する（battle_count回ずつ）"""
+def battle_with_saved_robots(player_robot_logic, battle_count=1, store=None, player_code=None):
+    """保存されているロボットと対戦する（battle_count回ずつ）。
+
+    各試合のログは game_state ではなく ``ReplayRef``（シードとコードの指紋）で返し、開いたときに作り直す。
+    ``store`` / ``player_code`` はアップロードしたコードを登録した ``CodeStore`` とその指紋。
+    時間切れがあって再現できない試合だけは game_state をそのまま返す。
+    """
+    if store is None:
+        store = CodeStore()
     python_files = sorted(get_robot_files())
     results = []
 
@@ -62,23 +69,20 @@ def battle_with_saved_robots(player_robot_logic, battle_count=1):
             module = importlib.import_module(f"robots.{module_name}")
             if hasattr(module, "robot_logic"):
                 enemy_robot_logic = getattr(module, "robot_logic")
+                enemy_code = store.add_module(module)
 
                 for i in range(battle_count):
                     # 先攻: プレイヤーロボット vs 敵ロボット
                     winner, game_state = play_game(player_robot_logic, enemy_robot_logic, PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME)
                     result, color = determine_result(winner, player_robot_name=PLAYER_ROBOT_NAME, enemy_robot_name=ENEMY_ROBOT_NAME)
-                    game_state_json = json.dumps(game_state, indent=4)
-                    b64 = base64.b64encode(game_state_json.encode()).decode()
-                    download_link = f'<a href="data:application/json;base64,{b64}" download="{module_name}_log_first_{i+1}.json">Download</a>'
-                    results.append((f"{module_name} (プレイヤー:先攻, {i+1}戦目)", f'<span style="color:{color}; font-weight:bold;">{result}</span>', download_link))
+                    replay = ReplayRef.from_game_state(game_state, (player_code, enemy_code)) if player_code else None
+                    results.append((f"{module_name} (プレイヤー:先攻, {i+1}戦目)", f'<span style="color:{color}; font-weight:bold;">{result}</span>', replay or game_state))
 
                     # 後攻: 敵ロボット vs プレイヤーロボット
                     winner, game_state = play_game(enemy_robot_logic, player_robot_logic, ENEMY_ROBOT_NAME, PLAYER_ROBOT_NAME)
                     result, color = determine_result(winner, player_robot_name=PLAYER_ROBOT_NAME, enemy_robot_name=ENEMY_ROBOT_NAME)
-                    game_state_json = json.dumps(game_state, indent=4)
-                    b64 = base64.b64encode(game_state_json.encode()).decode()
-                    download_link = f'<a href="data:application/json;base64,{b64}" download="{module_name}_log_second_{i+1}.json">Download</a>'
-                    results.append((f"{module_name} (プレイヤー:後攻, {i+1}戦目)", f'<span style="color:{color}; font-weight:bold;">{result}</span>', download_link))
+                    replay = ReplayRef.from_game_state(game_state, (enemy_code, player_code)) if player_code else None
+                    results.append((f"{module_name} (プレイヤー:後攻, {i+1}戦目)", f'<span style="color:{color}; font-weight:bold;">{result}</span>', replay or game_state))
 
         except Exception as e:
             st.warning(f"Error loading robot module {module_name}: {traceback.format_exc()}")
@@ -87,6 +91,17 @@ def battle_with_saved_robots(player_robot_logic, battle_count=1):
     return results
 
 
+def open_replay(replay, store):
+    """ReplayRef なら試合をやり直して game_state を返す（作り直せない場合は None）"""
+    if not isinstance(replay, ReplayRef):
+        return replay
+    try:
+        return replay.regenerate(store)
+    except (KeyError, ReplayMismatchError) as e:
+        st.error(f"ログを再生成できませんでした: {e}")
+        return None
+
+
 def determine_result(winner, player_robot_name=PLAYER_ROBOT_NAME, enemy_robot_name=ENEMY_ROBOT_NAME):
     """勝敗結果を判定する"""
     if winner.name == player_robot_name:
@@ -97,8 +112,8 @@ def determine_result(winner, player_robot_name=PLAYER_ROBOT_NAME, enemy_robot_na
         return "引き分け ⚖️", "gray"
 
 
-def display_results(results):
-    """対戦結果を表示する"""
+def display_results(results, store):
+    """対戦結果を表示する（ログは選んだ試合だけ作り直してダウンロードできる）"""
     st.subheader("🤖 対戦結果")
     if results:
         # 勝利数と総試合数を計算
@@ -114,10 +129,21 @@ def display_results(results):
         """, unsafe_allow_html=True)
 
         # DataFrameを作成
-        df = pd.DataFrame(results, columns=["対戦相手", "結果", "ログ"])
+        df = pd.DataFrame([result[:2] for result in results], columns=["対戦相手", "結果"])
         df["結果"] = df["結果"].apply(lambda x: f'<p style="text-align:center;">{x}</p>')  # 結果を中央寄せ
-        df["ログ"] = df["ログ"].apply(lambda x: f'<p style="text-align:center;">{x}</p>')  # ログリンクを中央寄せ
         st.markdown(df.to_html(escape=False, index=False), unsafe_allow_html=True)
+
+        # ログは開いたときにだけシードから作り直す
+        index = st.selectbox("ログを開く試合", options=range(total_matches), format_func=lambda i: results[i][0])
+        if st.button("ログを生成"):
+            game_state = open_replay(results[index][2], store)
+            if game_state is not None:
+                st.download_button(
+                    label="game_state.ndjson をダウンロード",
+                    data=replay_dumps(game_state).encode("utf-8"),
+                    file_name=f"{results[index][0]}.ndjson",
+                    mime="application/x-ndjson",
+                )
     else:
         st.info("対戦相手が見つかりませんでした。")
 
@@ -134,7 +160,7 @@ def main():
 
         対戦結果は、先攻と後攻の両方で表示されます。各対戦の結果は、勝利、敗北、引き分けのいずれかになります。
         対戦結果は、勝利数と総試合数を含む表形式で表示されます。
-        対戦結果のログは、JSON形式でダウンロード可能です。
+        対戦結果のログは、選んだ試合をシードから再生成して NDJSON 形式でダウンロードできます。
         """
     )
 
@@ -146,12 +172,16 @@ def main():
     if file_content and validate_code(file_content):
         player_robot_logic = load_robot_logic(file_content)
         if player_robot_logic:
+            store = st.session_state.setdefault("robot_battle_code_store", CodeStore())
+            player_code = store.add(file_content, player_robot_logic)
             st.subheader("対戦設定")
             battle_count = st.selectbox("対戦回数を選択してください", options=list(range(1, 11)), index=0, format_func=lambda x: f"{x}回対戦")
             start_battle = st.button("対戦開始")
             if start_battle:
-                results = battle_with_saved_robots(player_robot_logic, battle_count)
-                display_results(results)
+                st.session_state.robot_battle_results = battle_with_saved_robots(
+                    player_robot_logic, battle_count, store, player_code)
+            if "robot_battle_results" in st.session_state:
+                display_results(st.session_state.robot_battle_results, store)
         else:
             st.error("No function named `robot_logic` found in the uploaded file.")
     else:
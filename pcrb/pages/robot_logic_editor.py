@@ -85,7 +85,8 @@ def main():
         current_turn_data = controller.game_state[-1]
         if "robots" in current_turn_data:
             fig_placeholder = st.empty()  # プレースホルダーを作成
-            fig = draw_board(current_turn_data, x_max, y_max, red_robot_name=PLAYER_ROBOT_NAME, blue_robot_name=ENEMY_ROBOT_NAME, title="Current Game State", is_show=False)
+            fig = draw_board(current_turn_data, x_max, y_max, red_robot_name=PLAYER_ROBOT_NAME, blue_robot_name=ENEMY_ROBOT_NAME, title="Current Game State", is_show=False,
+                             walls=settings.get('walls', ()))
             fig_placeholder.pyplot(fig, use_container_width=True)
 
     left_col, right_col = st.columns(2)
@@ -212,7 +213,8 @@ def main():
             if controller.game_state:
                 current_turn_data = controller.game_state[-1]
                 if "robots" in current_turn_data:
-                    fig = draw_board(current_turn_data, x_max, y_max, red_robot_name=PLAYER_ROBOT_NAME, blue_robot_name=ENEMY_ROBOT_NAME, title="Current Game State", is_show=False)
+                    fig = draw_board(current_turn_data, x_max, y_max, red_robot_name=PLAYER_ROBOT_NAME, blue_robot_name=ENEMY_ROBOT_NAME, title="Current Game State", is_show=False,
+                                     walls=controller.game_state[0]['settings'].get('walls', ()))
                     fig_placeholder.pyplot(fig, use_container_width=True)  # 上部の画像を更新
 
         # ----------------- 直前の敵アクション -----------------
@@ -91,7 +91,7 @@ Homeページの「Upload a Python file with robot_logic function」蘭の「Dra
 ## 4. 対戦ログの確認
 
 「3. ロジックファイルをアップロード」後に、
-Homeページの「Download game_state.json」を選択し、対戦ログを確認します。
+Homeページの「game_state.ndjson をダウンロード」を選択し、対戦ログを確認します。
 
 ## 5. ロジックを改良して、再度アップロード
 
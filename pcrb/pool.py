@@ -0,0 +1,104 @@
+import threading
+from contextlib import contextmanager
+
+from constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
+from controller import GameController
+from robot import Robot
+
+
+def settings_key(max_turn=100, x_max=9, y_max=7, robot1_initial_position=None, robot2_initial_position=None):
+    """盤面設定をプールのキー（ハッシュ可能なタプル）に変換する"""
+    pos1 = None if robot1_initial_position is None else (robot1_initial_position['x'], robot1_initial_position['y'])
+    pos2 = None if robot2_initial_position is None else (robot2_initial_position['x'], robot2_initial_position['y'])
+    return max_turn, x_max, y_max, pos1, pos2
+
+
+class MatchContext:
+    """1 試合分の GameController と 2 体の Robot の組。
+
+    ``play`` を呼ぶたびに ``GameController.reset`` でファイル I/O なしに初期化し、
+    コントローラ・ロボットを作り直さずに次の試合を行う。
+    """
+
+    def __init__(self, max_turn=100, x_max=9, y_max=7, robot1_initial_position=None, robot2_initial_position=None):
+        self.key = settings_key(max_turn, x_max, y_max, robot1_initial_position, robot2_initial_position)
+        self.controller = GameController(
+            max_turn=max_turn, x_max=x_max, y_max=y_max,
+            robot1_initial_position=robot1_initial_position,
+            robot2_initial_position=robot2_initial_position,
+            headless=True,
+        )
+        pos1 = self.controller.robot1_initial_position
+        pos2 = self.controller.robot2_initial_position
+        self.robot1 = Robot(PLAYER_ROBOT_NAME, pos1['x'], pos1['y'], None, self.controller)
+        self.robot2 = Robot(ENEMY_ROBOT_NAME, pos2['x'], pos2['y'], None, self.controller)
+        self.controller.set_robots(self.robot1, self.robot2)
+        self.matches_played = 0
+
+    def play(self, robot1_logic, robot2_logic, robot1_name=PLAYER_ROBOT_NAME, robot2_name=ENEMY_ROBOT_NAME, seed=None,
+             ruleset=None, time_control=None, events=False):
+        """試合を 1 回行い ``(winner, game_state)`` を返す。
+
+        ``winner`` は再利用される Robot なので、名前などは次の ``play`` 前に読み取ること。
+        ``game_state`` は試合ごとに新しいリストになる。
+        ``seed`` を指定すると試合を再現できる（省略時は新しいシード）。
+        ``ruleset`` で試合ごとにルールセットを切り替えられる（省略時は既定のルールセット）。
+        ``time_control`` で持ち時間（``clock.TimeControl``）を指定できる（省略時は計測のみ）。
+        ``events=True`` で行動イベントの集計を ``game_state[0]["events"]`` に記録する。
+        """
+        self.controller.set_ruleset(ruleset)
+        self.controller.set_time_control(time_control)
+        self.controller.record_events = events  # 次の reset でイベントログを作り直す
+        self.robot1.rebind(robot1_name, robot1_logic)
+        self.robot2.rebind(robot2_name, robot2_logic)
+        self.controller.reset(seed)  # 初期状態（ターン 0）を新しい名前で記録し直す
+        self.matches_played += 1
+        return self.controller.game_loop()
+
+
+class MatchPool:
+    """盤面設定ごとに MatchContext を貯めておき使い回すプール"""
+
+    def __init__(self, max_idle_per_key=4):
+        self.max_idle_per_key = max_idle_per_key
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, **settings):
+        key = settings_key(**settings)
+        with self._lock:
+            contexts = self._idle.get(key)
+            if contexts:
+                return contexts.pop()
+        return MatchContext(**settings)
+
+    def release(self, context):
+        with self._lock:
+            contexts = self._idle.setdefault(context.key, [])
+            if len(contexts) < self.max_idle_per_key:
+                contexts.append(context)
+
+    @contextmanager
+    def context(self, **settings):
+        context = self.acquire(**settings)
+        try:
+            yield context
+        finally:
+            self.release(context)
+
+    def play(self, robot1_logic, robot2_logic, robot1_name=PLAYER_ROBOT_NAME, robot2_name=ENEMY_ROBOT_NAME,
+             seed=None, ruleset=None, time_control=None, events=False, **settings):
+        with self.context(**settings) as context:
+            return context.play(
+                robot1_logic, robot2_logic, robot1_name, robot2_name, seed, ruleset, time_control, events)
+
+
+_local = threading.local()
+
+
+def worker_pool():
+    """スレッド（ワーカー）ごとのプールを返す。各ワーカーは設定ごとに 1 つのコンテキストを使い回す"""
+    pool = getattr(_local, "pool", None)
+    if pool is None:
+        pool = _local.pool = MatchPool(max_idle_per_key=1)
+    return pool
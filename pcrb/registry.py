@@ -0,0 +1,111 @@
+from collections import namedtuple
+
+
+# code      : 1 バイトに収まる整数コード
+# name      : robot_logic が返す行動名（"up", "trap_left" など）
+# attr      : Robot 上のアクション属性名（"move", "trap" など）
+# call_style: "target"（敵を対象に取る）/ "name"（行動名を引数に取る）/ "self"（ターンのみ）
+# highlight : 描画時のハイライト形状 "adjacent" / "ranged" / "step" / "self"
+# marker    : 描画時のスプライト・色のキー
+# rule      : 全ロボットで共有する行動ルール（Action サブクラスのインスタンス）
+# handler   : handler(robot, enemy, action, turn) で行動を実行する関数
+ActionSpec = namedtuple(
+    "ActionSpec", ["code", "name", "attr", "call_style", "highlight", "marker", "rule", "handler"])
+
+NONE_CODE = 0  # 初期状態（行動なし）
+STUN_CODE = 1  # スタン中で行動できなかったターン
+
+
+def _make_handler(rule, call_style):
+    if call_style == "target":
+        def handler(robot, enemy, action, turn):
+            rule(robot, enemy, turn)
+    elif call_style == "name":
+        def handler(robot, enemy, action, turn):
+            rule(robot, action, turn)
+    elif call_style == "self":
+        def handler(robot, enemy, action, turn):
+            rule(robot, turn)
+    else:
+        raise ValueError(f"Unknown call_style: {call_style}")
+    return handler
+
+
+class ActionRegistry:
+    """行動名 → 整数コード・ハンドラの対応表。
+
+    ``actions.Action`` のサブクラスが ``action_names`` を宣言すると、
+    クラス定義時に自動で登録され、共有ルールとして 1 つだけインスタンス化される。コードは登録順に割り当てるため、
+    新しい行動は末尾に追加すること（既存リプレイのコードが変わらないように）。
+    """
+
+    def __init__(self):
+        self._specs = {}
+        self._names = [None, "stun"]
+        self._codes = {None: NONE_CODE, "stun": STUN_CODE}
+        self._rules = {}
+
+    def register(self, action_cls):
+        attr = action_cls.robot_attr
+        call_style = action_cls.call_style
+        rule = action_cls()
+        handler = _make_handler(rule, call_style)
+        self._rules[attr] = rule
+        for name in action_cls.action_names:
+            if name in self._specs and self._specs[name].attr == attr:
+                # 同じモジュールが別名で再インポートされた場合はコードを維持する
+                code = self._codes[name]
+            elif name in self._codes:
+                raise ValueError(f"Action name already registered: {name}")
+            else:
+                code = len(self._names)
+                if code > 0xFF:
+                    raise ValueError("Too many actions to encode in one byte.")
+                self._names.append(name)
+                self._codes[name] = code
+            self._specs[name] = ActionSpec(
+                code, name, attr, call_style, action_cls.highlight, action_cls.marker or attr, rule, handler)
+        return action_cls
+
+    def get(self, name):
+        """行動名に対応する ActionSpec を返す（未登録なら None）"""
+        return self._specs.get(name)
+
+    def rule(self, attr):
+        """Robot 上の属性名に対応する共有ルールを返す"""
+        return self._rules[attr]
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    def __iter__(self):
+        return iter(self._specs.values())
+
+    def names(self):
+        return list(self._specs)
+
+    def code(self, name):
+        return self._codes[name]
+
+    def name(self, code):
+        return self._names[code]
+
+    def encode(self, actions):
+        """行動名の列を 1 行動 1 バイトの bytes に変換する"""
+        codes = self._codes
+        return bytes(codes[action] for action in actions)
+
+    def decode(self, data):
+        names = self._names
+        return [names[code] for code in data]
+
+    def dispatch(self, robot, enemy, action, turn):
+        """行動名のハンドラで行動を実行し、その ActionSpec を返す（``GameController.resolve_action`` が使う）"""
+        spec = self._specs.get(action)
+        if spec is None:
+            raise ValueError("Unexpected robot action detected!")
+        spec.handler(robot, enemy, action, turn)
+        return spec
+
+
+ACTIONS = ActionRegistry()
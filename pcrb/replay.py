@@ -0,0 +1,166 @@
+"""replay（game_state）を 1 行 1 エントリの JSON（NDJSON）で書き出し・読み込む。
+
+1 行目が設定（``game_state[0]``）、以降が各ターンの状態で、ターンが終わるたびに詰めた JSON を 1 行追記する。
+試合の終わりに設定へ加わった項目（``clock`` / ``events`` など）は最後の ``{"final": {...}}`` 行に書く。
+パスが ``.gz`` で終わる場合は gzip で圧縮する。
+
+読み込みの ``iter_replay`` は NDJSON（gzip 圧縮も可）と従来の JSON 配列（``json.dump(game_state)``）、
+列指向バイナリ形式（``binreplay``）、行動の記録（``actiontrace``）のどれも読めるジェネレータで、
+途中で落ちた試合の replay も最後の完全な行までを返す::
+
+    game_state = load_replay("game_state.ndjson")
+"""
+import gzip
+import io
+import json
+import os
+from contextlib import ExitStack
+
+FINAL = "final"  # 試合の終わりに設定へ加わった項目を書く行のキー
+TRACE = "trace"  # 行動の記録だけの replay（``actiontrace``）のキー
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_BINARY_PREFIX = b"PCRB"  # binreplay.MAGIC の先頭
+
+
+def _dumps(entry):
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(game_state):
+    """game_state 全体を NDJSON の文字列にする（ダウンロード用）"""
+    return "".join(_dumps(entry) + "\n" for entry in game_state)
+
+
+class ReplayWriter:
+    """replay をターンごとに追記するファイル。
+
+    :param path: 書き出し先（``.gz`` で終わる場合は gzip で圧縮する）
+    :param compress: 圧縮するか（省略時はパスから決める）
+    :param flush: ``True`` で 1 行ごとに OS へ書き出す（プロセスが強制終了しても書いた行が残る）
+    """
+
+    def __init__(self, path, compress=None, flush=False):
+        self.path = path
+        self.compress = str(path).endswith(".gz") if compress is None else compress
+        self.flush = flush
+        self._file = None
+        self._header_keys = None  # 1 行目に書いた設定のキー
+
+    def _write(self, entry):
+        if self._file is None:
+            if self.compress:
+                self._file = gzip.open(self.path, "wt", encoding="utf-8")
+            else:
+                self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(_dumps(entry) + "\n")
+        if self.flush:
+            self._file.flush()
+
+    def header(self, header):
+        """新しい replay を始め、設定（``game_state[0]``）を 1 行目に書く"""
+        self.close()
+        self._header_keys = set(header)
+        self._write(header)
+
+    def turn(self, state):
+        """ターンの状態を 1 行追記する"""
+        self._write(state)
+
+    def close(self, header=None):
+        """ファイルを閉じる。``header`` を渡すと 1 行目を書いた後に加わった項目を ``final`` 行に書く"""
+        if self._file is None:
+            return
+        if header is not None and self._header_keys is not None:
+            final = {key: value for key, value in header.items() if key not in self._header_keys}
+            if final:
+                self._write({FINAL: final})
+        self._file.close()
+        self._file = None
+        self._header_keys = None
+
+
+def _open_text(source, stack):
+    """パス・バイト列・ファイルオブジェクトを、gzip を展開したテキストのストリームにする（バイナリ形式なら None）"""
+    if isinstance(source, (str, os.PathLike)):
+        stream = stack.enter_context(open(source, "rb"))
+    elif isinstance(source, (bytes, bytearray)):
+        stream = io.BytesIO(source)
+    else:
+        stream = source
+        if isinstance(stream.read(0), str):
+            return stream
+    size = len(_BINARY_PREFIX)
+    head = stream.peek(size)[:size] if hasattr(stream, "peek") else stream.read(size)
+    if not hasattr(stream, "peek"):
+        stream.seek(-len(head), io.SEEK_CUR)
+    if head == _BINARY_PREFIX:
+        return None
+    if head[:2] == _GZIP_MAGIC:
+        stream = stack.enter_context(gzip.GzipFile(fileobj=stream))
+    text = io.TextIOWrapper(stream, encoding="utf-8")
+    stack.callback(text.detach)  # 呼び出し側のファイルオブジェクトは閉じない
+    return text
+
+
+def _lines(stream):
+    """空でない行を返す（gzip が途中で切れている場合はそこまで）"""
+    try:
+        for line in stream:
+            if line.strip():
+                yield line
+    except EOFError:
+        return
+
+
+def iter_replay(source):
+    """replay のエントリ（設定、各ターンの状態）を順に返すジェネレータ。
+
+    :param source: ファイルのパス、バイト列、またはファイルオブジェクト（Streamlit のアップロードなど）
+    ``final`` 行の項目は先頭のエントリ（設定）に加える。最後の行が途中で切れている場合はその行を捨てる。
+    """
+    with ExitStack() as stack:
+        stream = _open_text(source, stack)
+        if stream is None:
+            from binreplay import BinaryReplay
+            if not isinstance(source, (str, os.PathLike, bytes, bytearray)):
+                source = source.read()
+            yield from BinaryReplay(source).game_state()
+            return
+        lines = _lines(stream)
+        first = next(lines, None)
+        if first is None:
+            return
+        if first.lstrip().startswith("["):
+            # 従来の JSON 配列
+            yield from json.loads(first + "".join(lines))
+            return
+        pending = first
+        header = None
+        for line in lines:
+            entry = json.loads(pending)
+            pending = line
+            if header is None:
+                header = entry
+            elif FINAL in entry:
+                header.update(entry[FINAL])
+                continue
+            yield entry
+        try:
+            entry = json.loads(pending)
+        except json.JSONDecodeError:
+            return  # 書き込み途中で終わった行
+        if header is None and TRACE in entry:
+            # 行動の記録だけの replay（1 行）は再実行して各ターンの状態を作る
+            from actiontrace import ActionTrace
+            yield from ActionTrace.from_dict(entry).replay()
+            return
+        if header is not None and FINAL in entry:
+            header.update(entry[FINAL])
+            return
+        yield entry
+
+
+def load_replay(source):
+    """replay 全体を game_state（リスト）として読み込む"""
+    return list(iter_replay(source))
@@ -0,0 +1,175 @@
+"""シードと指紋で replay を参照し、必要になったときに試合をやり直して game_state を作る。
+
+シード付きの試合は（両ロボットのコード、設定とシード、エンジン）が同じなら同じ game_state になるので、
+``ReplayRef`` はそれらの指紋と、結果の game_state の指紋（``digest``）だけを持つ（``dumps`` で 150 バイト程度）::
+
+    store = CodeStore()
+    codes = store.add(player_source, player_logic), store.add_module(enemy_module)
+    ref = ReplayRef.from_game_state(game_state, codes)  # 時間切れがあった試合は再現できないので None
+    game_state = ref.regenerate(store)  # digest が一致しなければ ReplayMismatchError
+
+持ち時間の罰則は実行時間で変わるので、やり直すときは持ち時間なしで行う（時間切れのなかった試合なら結果は同じ）。
+やり直した game_state には持ち時間の設定と思考時間の集計（``clock``）は入らない。
+"""
+import hashlib
+import inspect
+import json
+import os
+import types
+from collections import namedtuple
+
+from constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
+from controller import GameController
+from replay import dumps
+from robot import Robot
+from terrain import load_map
+
+# 指紋に含めるエンジンのモジュール（試合の結果を左右するもの）
+ENGINE_MODULES = (
+    "actions", "board", "clock", "controller", "cycle", "memo", "observation", "registry", "rng", "robot",
+    "ruleset", "simultaneous", "snapshot", "terrain", "utils",
+)
+
+DEFAULT_NAMES = (PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME)
+DEFAULT_SETTINGS = {"max_turn": 100, "x_max": 9, "y_max": 7}  # dumps で省略する設定
+
+_engine_version = None
+
+
+class ReplayMismatchError(ValueError):
+    """やり直した試合の game_state が参照の digest と一致しない"""
+
+
+def _hash(data, size=8):
+    return hashlib.blake2b(data, digest_size=size).hexdigest()
+
+
+def code_hash(source):
+    """ロボットのコードの指紋"""
+    return _hash(source.encode("utf-8"))
+
+
+def engine_version():
+    """エンジンのソースの指紋（行動ルールなどを変えると変わる）"""
+    global _engine_version
+    if _engine_version is None:
+        directory = os.path.dirname(os.path.abspath(__file__))
+        digest = hashlib.blake2b(digest_size=4)
+        for name in ENGINE_MODULES:
+            with open(os.path.join(directory, f"{name}.py"), "rb") as f:
+                digest.update(f.read())
+        _engine_version = digest.hexdigest()
+    return _engine_version
+
+
+def _replay_settings(settings):
+    """試合の結果を決める設定（持ち時間は含めない）"""
+    return {key: value for key, value in settings.items() if key != "time_control"}
+
+
+def state_digest(game_state):
+    """game_state の指紋（設定と各ターンの状態。思考時間など実行ごとに変わる集計は含めない）"""
+    return _hash(dumps([_replay_settings(game_state[0]["settings"])] + game_state[1:]).encode("utf-8"))
+
+
+class CodeStore:
+    """コードの指紋 → robot_logic の対応表"""
+
+    def __init__(self):
+        self._sources = {}
+        self._logic = {}
+
+    def add(self, source, logic=None):
+        """コードを登録して指紋を返す。``logic`` を省略するとやり直すときにコードから読み込む"""
+        code = code_hash(source)
+        self._sources[code] = source
+        if logic is not None:
+            self._logic[code] = logic
+        return code
+
+    def add_module(self, module):
+        """``robot_logic`` を持つモジュール（``robots`` のロボットなど）を登録して指紋を返す"""
+        return self.add(inspect.getsource(module), module.robot_logic)
+
+    def __contains__(self, code):
+        return code in self._sources
+
+    def logic(self, code):
+        logic = self._logic.get(code)
+        if logic is None:
+            if code not in self._sources:
+                raise KeyError(f"Unknown robot code: {code}")
+            module = types.ModuleType(f"robot_{code}")
+            exec(compile(self._sources[code], f"<robot {code}>", "exec"), module.__dict__)
+            logic = self._logic[code] = module.robot_logic
+        return logic
+
+
+_ReplayRef = namedtuple("ReplayRef", ["engine", "codes", "names", "settings", "digest"])
+
+
+class ReplayRef(_ReplayRef):
+    """replay の参照。
+
+    :param engine: ``engine_version()``
+    :param codes: robot1 / robot2 のコードの指紋（``code_hash``）
+    :param names: robot1 / robot2 の名前
+    :param settings: ``game_state[0]["settings"]``（シードを含む。持ち時間の設定は除く）
+    :param digest: ``state_digest(game_state)``
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_game_state(cls, game_state, codes):
+        """試合の game_state から参照を作る（時間切れがあって再現できない試合は None）"""
+        clock = game_state[0].get("clock", {})
+        if any(entry["timeouts"] for entry in clock.values()):
+            return None
+        names = tuple(robot["name"] for robot in game_state[1]["robots"])
+        settings = _replay_settings(game_state[0]["settings"])
+        return cls(engine_version(), tuple(codes), names, settings, state_digest(game_state))
+
+    def to_dict(self):
+        """既定の名前と設定を省いた辞書"""
+        settings = {key: value for key, value in self.settings.items() if DEFAULT_SETTINGS.get(key) != value}
+        data = {"engine": self.engine, "codes": list(self.codes), "settings": settings, "digest": self.digest}
+        if self.names != DEFAULT_NAMES:
+            data["names"] = list(self.names)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["engine"], tuple(data["codes"]), tuple(data.get("names", DEFAULT_NAMES)),
+            {**DEFAULT_SETTINGS, **data["settings"]}, data["digest"])
+
+    def dumps(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def regenerate(self, store):
+        """試合をやり直して game_state を返す。
+
+        :param store: ロボットのコードを引く ``CodeStore``
+        :raises ReplayMismatchError: 結果が ``digest`` と一致しない（エンジンやコードが変わった、ロボットが乱数以外の状態に依存するなど）
+        """
+        settings = self.settings
+        terrain = None if "map" not in settings else load_map(f"{settings['map']}.txt")
+        controller = GameController(
+            max_turn=settings["max_turn"], x_max=settings["x_max"], y_max=settings["y_max"], headless=True,
+            seed=settings["seed"], simultaneous=settings.get("simultaneous", False), terrain=terrain,
+            ruleset=settings.get("ruleset"))
+        robots = []
+        for code, name, position in zip(
+                self.codes, self.names, (controller.robot1_initial_position, controller.robot2_initial_position)):
+            robots.append(Robot(name, position['x'], position['y'], store.logic(code), controller))
+        controller.set_robots(*robots)
+        _, game_state = controller.game_loop()
+        digest = state_digest(game_state)
+        if digest != self.digest:
+            reason = "engine changed" if self.engine != engine_version() else "robot code is not deterministic"
+            raise ReplayMismatchError(f"Regenerated replay does not match ({reason}): {digest} != {self.digest}")
+        return game_state
@@ -0,0 +1,247 @@
+"""replay を内容のハッシュで保存するローカルのストア（SQLite の索引 + 圧縮した replay のファイル）。
+
+replay の本体（各ターンの状態）は内容のハッシュをファイル名にして gzip で ``blobs/`` に 1 度だけ保存し、
+試合ごとの索引（両ロボットのコードの指紋・シード・勝者・ターン数と ``game_state[0]``）を SQLite に残す。
+決定的なロボット同士ではシードが違っても同じ試合になるので、本体は共有される::
+
+    store = ReplayStore("replays")
+    store.add(game_state, (code_hash(source1), code_hash(source2)))
+    for record in store.find(bot=code, winner=code):  # code が勝った試合
+        game_state = store.get(record.id)
+
+ファイルの書き出し（``prepare``）は SQLite に触れないので複数のプロセスから並行に行え、
+索引は ``insert`` で 1 つのトランザクションにまとめて追加する（WAL モードなので他のプロセスの読み書きとも並行できる）。
+"""
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+
+from replay import dumps
+from replayref import code_hash
+
+# 本体に含めない設定（試合ごとに変わり、索引の側に残すもの）
+_PER_MATCH_SETTINGS = ("seed", "time_control")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    stored INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    id INTEGER PRIMARY KEY,
+    hash TEXT NOT NULL REFERENCES blobs (hash),
+    bot1 TEXT,
+    bot2 TEXT,
+    seed INTEGER,
+    winner TEXT,
+    turns INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    UNIQUE (hash, bot1, bot2, seed)
+);
+CREATE INDEX IF NOT EXISTS matches_bots ON matches (bot1, bot2);
+CREATE INDEX IF NOT EXISTS matches_bot2 ON matches (bot2);
+CREATE INDEX IF NOT EXISTS matches_seed ON matches (seed);
+CREATE INDEX IF NOT EXISTS matches_winner ON matches (winner);
+CREATE INDEX IF NOT EXISTS matches_hash ON matches (hash);
+"""
+
+# 索引の 1 行（``prepare`` の戻り値）
+MatchRow = namedtuple("MatchRow", ["hash", "size", "stored", "bot1", "bot2", "seed", "winner", "turns", "header"])
+# ``find`` の戻り値
+MatchRecord = namedtuple("MatchRecord", ["id", "hash", "bot1", "bot2", "seed", "winner", "turns"])
+
+_logic_hashes = weakref.WeakKeyDictionary()
+
+
+def logic_hash(logic):
+    """robot_logic のコード（定義したモジュール全体）の指紋"""
+    value = _logic_hashes.get(logic)
+    if value is None:
+        try:
+            source = inspect.getsource(inspect.getmodule(logic) or logic)
+        except (OSError, TypeError):
+            source = f"{logic.__module__}.{logic.__qualname__}"  # ソースがない場合は名前で区別する
+        value = _logic_hashes[logic] = code_hash(source)
+    return value
+
+
+def _body(game_state):
+    """内容のハッシュをとる本体（試合ごとの設定を除いた設定と各ターンの状態）の NDJSON"""
+    settings = {key: value for key, value in game_state[0]["settings"].items() if key not in _PER_MATCH_SETTINGS}
+    return dumps([{"settings": settings}] + game_state[1:]).encode("utf-8")
+
+
+def _winner(game_state, bots):
+    """勝ったロボットのコードの指紋（GameController と同じく HP が多い方、同じなら robot2）"""
+    robots = game_state[-1]["robots"]
+    return bots[0] if robots[0]["hp"] > robots[1]["hp"] else bots[1]
+
+
+class ReplayStore:
+    """内容のハッシュで replay を保存するストア。
+
+    :param root: 保存先のディレクトリ（``index.sqlite3`` と ``blobs/``）
+    :param cache_size: 読み込んだ replay の本体をメモリに残す件数（LRU）
+    """
+
+    def __init__(self, root="replays", cache_size=64):
+        self.root = root
+        self.blob_dir = os.path.join(root, "blobs")
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # ハッシュ → 各ターンの状態（タプル）
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def __len__(self):
+        """保存した試合の数"""
+        return self._query("SELECT COUNT(*) FROM matches")[0][0]
+
+    def blob_count(self):
+        """保存した本体（重複を除いた試合）の数"""
+        return self._query("SELECT COUNT(*) FROM blobs")[0][0]
+
+    def blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.ndjson.gz")
+
+    # ------------------------------------------------------------------
+    # 書き込み
+    # ------------------------------------------------------------------
+    def prepare(self, game_state, bots):
+        """本体をファイルに書き出し（同じ内容がすでにあれば何もしない）、索引の行を返す。
+
+        SQLite には触れないので、ワーカープロセスで呼んで行だけを ``insert`` に渡せる。
+
+        :param bots: robot1 / robot2 のコードの指紋（``replayref.code_hash`` / ``logic_hash``）
+        """
+        body = _body(game_state)
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            data = gzip.compress(body, mtime=0)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp, path)  # 同じ内容を並行に書いても、読み手には完全なファイルだけが見える
+        stored = os.path.getsize(path)
+        return MatchRow(
+            digest, len(body), stored, bots[0], bots[1], game_state[0]["settings"].get("seed"),
+            _winner(game_state, bots), game_state[-1]["turn"],
+            json.dumps(game_state[0], ensure_ascii=False, separators=(",", ":")))
+
+    def insert(self, rows):
+        """``prepare`` した行を 1 つのトランザクションで索引に加える（同じ試合は 1 度だけ）"""
+        rows = list(rows)
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR IGNORE INTO blobs (hash, size, stored) VALUES (?, ?, ?)",
+                [(row.hash, row.size, row.stored) for row in rows])
+            self._db.executemany(
+                "INSERT OR IGNORE INTO matches (hash, bot1, bot2, seed, winner, turns, header)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(row.hash, row.bot1, row.bot2, row.seed, row.winner, row.turns, row.header) for row in rows])
+        return [row.hash for row in rows]
+
+    def add(self, game_state, bots):
+        """試合を 1 つ保存して本体のハッシュを返す"""
+        return self.insert([self.prepare(game_state, bots)])[0]
+
+    def add_many(self, matches):
+        """``(game_state, bots)`` の列をまとめて保存する"""
+        return self.insert([self.prepare(game_state, bots) for game_state, bots in matches])
+
+    # ------------------------------------------------------------------
+    # 読み込み
+    # ------------------------------------------------------------------
+    def turns(self, digest):
+        """本体（各ターンの状態のタプル）。キャッシュから返す場合は同じ dict なので書き換えないこと"""
+        with self._lock:
+            entries = self._cache.get(digest)
+            if entries is not None:
+                self._cache.move_to_end(digest)
+                return entries
+        with gzip.open(self.blob_path(digest), "rt", encoding="utf-8") as f:
+            entries = tuple(json.loads(line) for line in f)[1:]
+        if self.cache_size:
+            with self._lock:
+                self._cache[digest] = entries
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return entries
+
+    def get(self, match_id):
+        """保存した試合の game_state（各ターンの状態は ``turns`` と同じくキャッシュと共有する）"""
+        rows = self._query("SELECT hash, header FROM matches WHERE id = ?", (match_id,))
+        if not rows:
+            raise KeyError(match_id)
+        digest, header = rows[0]
+        return [json.loads(header)] + list(self.turns(digest))
+
+    def find(self, bot=None, opponent=None, seed=None, winner=None, digest=None, limit=None):
+        """条件に合う試合の索引（``MatchRecord``）を id 順に返す。
+
+        ``bot`` / ``opponent`` は先攻・後攻どちらでもよい（両方指定すると ``bot`` 対 ``opponent`` の試合）。
+        """
+        clauses, params = [], []
+        if bot is not None and opponent is not None:
+            clauses.append("((bot1 = ? AND bot2 = ?) OR (bot1 = ? AND bot2 = ?))")
+            params += [bot, opponent, opponent, bot]
+        elif bot is not None or opponent is not None:
+            code = bot if bot is not None else opponent
+            clauses.append("(bot1 = ? OR bot2 = ?)")
+            params += [code, code]
+        if seed is not None:
+            clauses.append("seed = ?")
+            params.append(seed)
+        if winner is not None:
+            clauses.append("winner = ?")
+            params.append(winner)
+        if digest is not None:
+            clauses.append("hash = ?")
+            params.append(digest)
+        query = "SELECT id, hash, bot1, bot2, seed, winner, turns FROM matches"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [MatchRecord(*row) for row in self._query(query, params)]
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(root="replays"):
+    """プロセスごとに ``root`` のストアを 1 つだけ開いて使い回す（ワーカーから ``prepare`` する場合など）"""
+    key = (os.getpid(), os.path.abspath(root))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = ReplayStore(root)
+        return store
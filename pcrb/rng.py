@@ -0,0 +1,95 @@
+import hashlib
+import random
+import secrets
+import threading
+import weakref
+
+
+def new_seed():
+    """新しい試合用のシード（63 bit の非負整数）を返す"""
+    return secrets.randbits(63)
+
+
+def child_seed(seed, *keys):
+    """``seed`` と ``keys`` から独立した子ストリーム用のシードを導出する。
+
+    同じ入力からは常に同じ値になるので、並列ワーカーや試合ごとの乱数を
+    親シード 1 つから再現できる。
+    """
+    data = repr((seed,) + keys).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big") >> 1
+
+
+class RandomModuleProxy:
+    """ロボットのコード中の ``random`` モジュールの代わりに置く名前空間。
+
+    ``random.choice`` などはロボットごとの ``random.Random`` に、
+    インスタンスにない属性（``random.Random`` など）は本物のモジュールに委譲する。
+    """
+    __slots__ = ("_rng",)
+
+    def __init__(self, rng):
+        self._rng = rng
+
+    def __getattr__(self, name):
+        try:
+            return getattr(self._rng, name)
+        except AttributeError:
+            return getattr(random, name)
+
+
+# robot_logic 関数 → 差し替えるグローバル名のタプル
+_swap_names = weakref.WeakKeyDictionary()
+
+# 差し替えを直列化するロックを置く名前空間のキー（モジュールと同じ寿命になる）
+_LOCK_NAME = "__pcrb_rng_lock__"
+
+
+def _random_names(func, namespace):
+    names = _swap_names.get(func)
+    if names is None:
+        global_instance = getattr(random, "_inst", None)
+        names = tuple(
+            name for name, value in namespace.items()
+            if value is random or (global_instance is not None and getattr(value, "__self__", None) is global_instance)
+        )
+        try:
+            _swap_names[func] = names
+        except TypeError:
+            pass
+    return names
+
+
+def uses_random(func):
+    """``func`` のグローバルに ``random`` モジュール（またはその関数）があるか"""
+    namespace = getattr(func, "__globals__", None)
+    return namespace is not None and bool(_random_names(func, namespace))
+
+
+def call_with_rng(func, rng, *args):
+    """``func`` のグローバルな ``random`` を ``rng`` に差し替えて呼び出す。
+
+    ``import random`` と ``from random import choice`` の両方に対応する。
+    呼び出し後は元に戻すので、同じモジュールを別の乱数で呼んでも干渉しない。
+    差し替えはモジュールごとのロックで直列化するので、同じモジュールを複数スレッドの試合で同時に使ってもよい
+    （そのモジュールの呼び出しは 1 つずつになる）。
+    """
+    namespace = getattr(func, "__globals__", None)
+    if namespace is None:
+        return func(*args)
+    names = _random_names(func, namespace)
+    if not names:
+        return func(*args)
+
+    lock = namespace.get(_LOCK_NAME)
+    if lock is None:
+        lock = namespace.setdefault(_LOCK_NAME, threading.RLock())  # setdefault は不可分なので 1 つだけ作られる
+    with lock:
+        saved = [(name, namespace[name]) for name in names]
+        for name, value in saved:
+            namespace[name] = RandomModuleProxy(rng) if value is random else getattr(rng, value.__name__)
+        try:
+            return func(*args)
+        finally:
+            for name, value in saved:
+                namespace[name] = value
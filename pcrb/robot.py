@@ -1,39 +1,177 @@
-from actions import Attack
-from actions import Move
-from actions import Defend
-from actions import RangedAttack
-from actions import Parry
-from actions import Rest
-from actions import Trap
-from actions import Steal
-from actions import Teleport
-from actions import Camouflage
-from actions import Scan
-
-
-class Robot:
+from functools import partial
+from operator import attrgetter
+
+from actions import ACTIONS
+from ruleset import DEFAULT_RULESET
+from snapshot import RobotSnapshot
+from zobrist import FIELDS
+from zobrist import KEYS
+from zobrist import trap_hash
+
+
+class RobotState:
+    """ロボットごとの可変状態（行動フラグ・クールダウン・罠）をまとめた小さなレコード。
+
+    ``zobrist_hash`` は初めて読まれたときに計算し、その後は行動ルールが ``set`` / ``add_trap`` / ``remove_trap`` で
+    書き換えるたびに O(1) で更新する。
+
+    不変条件: ``reset`` / ``restore`` 以外でのフィールドの書き換えは必ず ``set`` / ``add_trap`` / ``remove_trap``
+    を通すこと（ロボットの位置は ``Robot.set_position``、HP・SP・スタンも ``Robot`` のメソッドを通す）。
+    属性へ直接代入したり ``traps`` を直接書き換えたりするとハッシュが局面とずれ、サイクル検出や
+    ``hash_states`` が誤った結果を返す。``tests/test_zobrist.py`` は全ロボットの総当たりで毎ターン
+    ハッシュを一から計算し直してこれを確かめている。
+    """
+    __slots__ = (
+        "defend_active",
+        "parry_active", "parry_cooldown",
+        "camouflage_active", "camouflage_remaining", "camouflage_last_position",
+        "scan_active", "scan_remaining",
+        "traps",
+        "_zobrist_hash",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    @property
+    def zobrist_hash(self):
+        value = self._zobrist_hash
+        if value is None:
+            value = trap_hash(self.traps)
+            for field, keys in _STATE_KEYS:
+                value ^= keys[getattr(self, field)]
+            self._zobrist_hash = value
+        return value
+
+    def set(self, name, value):
+        """状態を書き換える（ハッシュを計算済みなら差分で更新する）"""
+        value_hash = self._zobrist_hash
+        if value_hash is not None:
+            keys = KEYS[name]
+            self._zobrist_hash = value_hash ^ keys[getattr(self, name)] ^ keys[value]
+        setattr(self, name, value)
+
+    def add_trap(self, position):
+        self.traps[position] = None
+        if self._zobrist_hash is not None:
+            self._zobrist_hash ^= _TRAP_KEYS[position]
+
+    def remove_trap(self, position):
+        del self.traps[position]
+        if self._zobrist_hash is not None:
+            self._zobrist_hash ^= _TRAP_KEYS[position]
+
+    def reset(self):
+        self.defend_active = False
+        self.parry_active = False  # パリィ中かどうか
+        self.parry_cooldown = 0  # パリィのクールタイム
+        self.camouflage_active = False
+        self.camouflage_remaining = 0
+        self.camouflage_last_position = None
+        self.scan_active = False
+        self.scan_remaining = 0
+        self.traps = {}  # 設置された罠の座標（挿入順を保つ dict をリスト代わりに使う）
+        self._zobrist_hash = None  # 次に読まれたときに計算する
+
+
+class BoundAction:
+    """共有の行動ルールをロボットに結び付けたビュー。
+
+    ``robot.parry(turn)`` で行動を実行し、``robot.parry.is_active`` や
+    ``robot.attack.cost`` で状態・ルール値を参照できる（従来のアクションオブジェクト互換）。
+    ルールの ``state_fields`` とルール値はサブクラスのプロパティ・クラス属性として生成される（``_bound_class`` 参照）。
+    """
+    __slots__ = ("rule", "actor", "state")
+
+    def __init__(self, rule, actor):
+        self.rule = rule
+        self.actor = actor
+        self.state = actor.state  # RobotState は reset / restore でも同じオブジェクトのまま書き換わる
+
+    def __call__(self, *args):
+        return self.rule(self.actor, *args)
+
+    def __getattr__(self, name):
+        value = getattr(self.rule, name)
+        if callable(value):
+            return partial(value, self.actor)
+        return value
+
+
+def _state_property(field):
+    def fset(view, value):
+        view.state.set(field, value)
+
+    return property(attrgetter(f"state.{field}"), fset)
+
+
+def _bound_class(rule):
+    namespace = {"__slots__": ()}
+    for name in dir(type(rule)):
+        value = getattr(rule, name)
+        if not name.startswith("_") and name not in BoundAction.__slots__ and not callable(value):
+            namespace[name] = value  # ``robot.attack.cost`` などのルール値は __getattr__ を通さずに読む
+    for name, field in rule.state_fields.items():
+        namespace[name] = _state_property(field)
+    return type(f"Bound{type(rule).__name__}", (BoundAction,), namespace)
+
+
+# Robot 上の行動の属性名
+ACTION_ATTRS = (
+    "attack", "move", "defend", "ranged_attack", "parry", "rest", "trap", "steal", "teleport", "camouflage", "scan",
+)
+_BOUND_CLASSES = {attr: _bound_class(ACTIONS.rule(attr)) for attr in ACTION_ATTRS}
+
+
+class _RobotType(type):
+    """``Robot.attack`` などのクラス属性で共有の行動ルールを返すメタクラス
+    （インスタンスの ``robot.attack`` は slot に置いた BoundAction を読む）"""
+
+
+for _attr in ACTION_ATTRS:
+    setattr(_RobotType, _attr, property(lambda cls, rule=ACTIONS.rule(_attr): rule))
+
+
+_TRAP_KEYS = KEYS["trap"]
+_STATE_KEYS = tuple((field, KEYS[field]) for field in FIELDS if field in RobotState.__slots__)
+_X_KEYS = KEYS["x"]
+_Y_KEYS = KEYS["y"]
+_HP_KEYS = KEYS["hp"]
+_SP_KEYS = KEYS["sp"]
+_STUN_KEYS = KEYS["stun_counter"]
+
+_CAMOUFLAGE = ACTIONS.rule("camouflage")
+_SCAN = ACTIONS.rule("scan")
+
+
+class Robot(metaclass=_RobotType):
+    __slots__ = (
+        "_name", "_x", "_y", "_hp", "_sp", "_stun_counter", "state", "robot_logic", "controller", "_zobrist_hash",
+    ) + ACTION_ATTRS
+
     def __init__(self, name, x, y, robot_logic_function, controller):
         self._name = name
         self._x = x
         self._y = y
-        self._hp = 100
-        self._sp = 50
+        ruleset = DEFAULT_RULESET if controller is None else controller.ruleset
+        self._hp = ruleset.initial_hp
+        self._sp = ruleset.initial_sp
         self._stun_counter = 0  # ロボットがスタンしている時間
-
-        self.attack = Attack(self, controller)
-        self.move = Move(self, controller)
-        self.defend = Defend(self, controller)
-        self.ranged_attack = RangedAttack(self, controller)
-        self.parry = Parry(self, controller)
-        self.rest = Rest(self, controller)
-        self.trap = Trap(self, controller)
-        self.steal = Steal(self, controller)
-        self.teleport = Teleport(self, controller)
-        self.camouflage = Camouflage(self, controller)
-        self.scan = Scan(self, controller)
+        self.state = RobotState()
 
         self.robot_logic = robot_logic_function
         self.controller = controller
+        self._zobrist_hash = None  # 次に読まれたときに計算する
+
+    def __getattr__(self, name):
+        """行動の BoundAction（``robot.parry`` など）は初めて読まれたときに作って slot に置く
+        （以降は通常の slot の読み出しになる）"""
+        bound_class = _BOUND_CLASSES.get(name)
+        if bound_class is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        action = bound_class(ACTIONS.rule(name), self)
+        setattr(self, name, action)
+        return action
 
     @property
     def name(self):
@@ -67,73 +205,153 @@ class Robot:
     def stun_counter(self):
         return self._stun_counter
 
+    @property
+    def zobrist_hash(self):
+        """位置・HP・SP・スタンと ``state`` の Zobrist ハッシュ（``zobrist`` 参照）。
+
+        初めて読まれたときに計算し、その後は位置などを書き換えるメソッドが書き換えのたびに O(1) で更新する
+        （生成・``reset``・``restore`` ではハッシュを求めないので、ハッシュを使わない試合には費用がかからない）。
+        """
+        value = self._zobrist_hash
+        if value is None:
+            value = self._zobrist_hash = (
+                _X_KEYS[self._x] ^ _Y_KEYS[self._y] ^ _HP_KEYS[self._hp] ^ _SP_KEYS[self._sp]
+                ^ _STUN_KEYS[self._stun_counter])
+        return value ^ self.state.zobrist_hash
+
     def receive_attack(self, damage):
         """攻撃を受ける
         :param damage: 攻撃のダメージ量
         """
         # if self._defense_mode:
         #     damage *= self._defense_reduction
-        if self.defend.is_active:
-            damage *= self.defend.reduction
-        self._hp -= max(damage, 0)
-        if self._hp <= 0:
-            print(f"{self._name} has been destroyed!")
+        if self.state.defend_active:
+            damage *= self.controller.ruleset.defend.reduction
+        hp = self._hp - max(damage, 0)
+        if self._zobrist_hash is not None:
+            self._zobrist_hash ^= _HP_KEYS[self._hp] ^ _HP_KEYS[hp]
+        self._hp = hp
+        if self._hp <= 0 and self.controller.log_enabled:
+            self.controller.debug(f"{self._name} has been destroyed!")
         return damage
 
     def use_sp(self, amount):
         """SPを消費するメソッド。"""
         if self._sp >= amount:
-            self._sp -= amount
+            sp = self._sp - amount
+            if self._zobrist_hash is not None:
+                self._zobrist_hash ^= _SP_KEYS[self._sp] ^ _SP_KEYS[sp]
+            self._sp = sp
         else:
             assert False
 
     def recovery_sp(self, amount):
         """SPを回復するメソッド。"""
-        self._sp += amount
+        sp = self._sp + amount
+        if self._zobrist_hash is not None:
+            self._zobrist_hash ^= _SP_KEYS[self._sp] ^ _SP_KEYS[sp]
+        self._sp = sp
 
     def is_parrying(self):
-        return self.parry.is_active
+        return self.state.parry_active
 
     def set_position(self, new_x, new_y):
+        if self.controller is not None:  # コントローラなしで作ったロボットは盤面インデックスを持たない
+            self.controller.board.move(self, (self._x, self._y), (new_x, new_y))
+        if self._zobrist_hash is not None:
+            self._zobrist_hash ^= _X_KEYS[self._x] ^ _X_KEYS[new_x] ^ _Y_KEYS[self._y] ^ _Y_KEYS[new_y]
         self._x, self._y = new_x, new_y
 
     def start_turn(self):
         """ターン開始時にロボットの状態を更新"""
         self.stun_update()
 
-        if self.defend.is_active:
-            print(f"{self._name} ends defense mode.")
-            self.defend.update()
+        state = self.state
+        if state.defend_active:
+            if self.controller.log_enabled:
+                self.controller.debug(f"{self._name} ends defense mode.")
+            state.set("defend_active", False)
 
-        if self.parry.is_active:
-            print(f"{self._name} ends parry mode.")
-            self.parry.update(is_active=True)
+        if state.parry_active:
+            if self.controller.log_enabled:
+                self.controller.debug(f"{self._name} ends parry mode.")
+            state.set("parry_active", False)
 
-        if self.parry.cooldown_counter > 0:
-            self.parry.update(is_cooldown=True)
+        if state.parry_cooldown > 0:
+            state.set("parry_cooldown", state.parry_cooldown - 1)
 
-        if self.camouflage.is_active:
-            self.camouflage.update()
+        if state.camouflage_active:
+            _CAMOUFLAGE.update(self)
 
-        if self.scan.is_active:
-            self.scan.update()
+        if state.scan_active:
+            _SCAN.update(self)
 
     def stun(self, duration):
         """ロボットをスタン状態にする
         :param duration: スタンの持続時間
         """
+        if self._zobrist_hash is not None:
+            self._zobrist_hash ^= _STUN_KEYS[self._stun_counter] ^ _STUN_KEYS[duration]
         self._stun_counter = duration
-        print(f"{self._name} was stunned.")
+        if self.controller.log_enabled:
+            self.controller.debug(f"{self._name} was stunned.")
     
     def stun_update(self):
         """スタン状態の更新"""
         if self._stun_counter > 0:
+            if self._zobrist_hash is not None:
+                self._zobrist_hash ^= _STUN_KEYS[self._stun_counter] ^ _STUN_KEYS[self._stun_counter - 1]
             self._stun_counter -= 1
-            print(f"{self._name} is stunned. (duration={self._stun_counter})")
-            if self._stun_counter == 0:
-                print(f"{self._name} is no longer stunned.")
-        else:
-            print(f"{self._name} is not stunned.")
+            if self.controller.log_enabled:
+                self.controller.debug(f"{self._name} is stunned. (duration={self._stun_counter})")
+                if self._stun_counter == 0:
+                    self.controller.debug(f"{self._name} is no longer stunned.")
+        elif self.controller.log_enabled:
+            self.controller.debug(f"{self._name} is not stunned.")
+
+    def snapshot(self):
+        """ロボットの状態を不変の RobotSnapshot で返す"""
+        state = self.state
+        return RobotSnapshot(
+            self._x, self._y, self._hp, self._sp, self._stun_counter,
+            state.defend_active,
+            state.parry_active, state.parry_cooldown,
+            state.camouflage_active, state.camouflage_remaining, state.camouflage_last_position,
+            state.scan_active, state.scan_remaining,
+            tuple(state.traps),
+        )
+
+    def restore(self, snapshot):
+        """``snapshot`` の状態に戻す（盤面インデックスの再構築は呼び出し側で行う）"""
+        (self._x, self._y, self._hp, self._sp, self._stun_counter,
+         defend_active,
+         parry_active, parry_cooldown,
+         camouflage_active, camouflage_remaining, camouflage_last_position,
+         scan_active, scan_remaining,
+         traps) = snapshot
+        state = self.state
+        state.defend_active = defend_active
+        state.parry_active = parry_active
+        state.parry_cooldown = parry_cooldown
+        state.camouflage_active = camouflage_active
+        state.camouflage_remaining = camouflage_remaining
+        state.camouflage_last_position = camouflage_last_position
+        state.scan_active = scan_active
+        state.scan_remaining = scan_remaining
+        state.traps = dict.fromkeys(traps)
+        state._zobrist_hash = None
+        self._zobrist_hash = None
+
+    def rebind(self, name, robot_logic_function):
+        """名前とロジックを差し替える（試合コンテキストの再利用向け）"""
+        self._name = name
+        self.robot_logic = robot_logic_function
+
+    def forfeit(self):
+        """負けにする（時間切れの罰則など）"""
+        if self._zobrist_hash is not None:
+            self._zobrist_hash ^= _HP_KEYS[self._hp] ^ _HP_KEYS[0]
+        self._hp = 0
 
     def is_alive(self):
         return self._hp > 0
@@ -145,33 +363,20 @@ class Robot:
         """
         * 位置を (x, y) に戻す  
         * HP / SP / スタンなどの数値を初期値へ  
-        * 各アクションオブジェクトのフラグやクールダウンを初期化
+        * 行動フラグ・クールダウン・罠（RobotState）を初期化
         """
         # 位置
         self._x, self._y = x, y
 
         # 基本ステータス
-        self._hp = 100
-        self._sp = 50
+        ruleset = self.controller.ruleset
+        self._hp = ruleset.initial_hp
+        self._sp = ruleset.initial_sp
         self._stun_counter = 0
+        self._zobrist_hash = None
+
+        # アクション系フラグ・クールダウン・罠をリセット
+        self.state.reset()
 
-        # アクション系フラグをリセット
-        self.defend.is_active      = False
-        self.parry.is_active       = False
-        self.parry.cooldown_counter = 0
-        self.camouflage.is_active  = False
-        self.scan.is_active        = False
-
-        # 罠を全消去
-        self.trap.traps.clear()
-
-        # 各アクションに reset() があれば呼ぶ（クールダウンなどを内包）
-        for ability in [
-            self.attack, self.move, self.defend, self.ranged_attack,
-            self.parry, self.rest, self.trap, self.steal, self.teleport,
-            self.camouflage, self.scan,
-        ]:
-            if hasattr(ability, "reset") and callable(ability.reset):
-                ability.reset()
-
-        print(f"[RESET] {self._name} is back to ({x}, {y})  HP=100  SP=50")
\ No newline at end of file
+        if self.controller.log_enabled:
+            self.controller.debug(f"[RESET] {self._name} is back to ({x}, {y})  HP={self._hp}  SP={self._sp}")
@@ -1,3 +1,7 @@
 def robot_logic(robot, game_info, memos):
     # 「休む」を繰り返す
     return "rest"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 0
@@ -1,3 +1,7 @@
 def robot_logic(robot, game_info, memos):
     # 同じ方向への移動を繰り返す
     return "right"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 0
@@ -4,3 +4,7 @@ def robot_logic(robot, game_info, memos):
         return "rest"
     else:
         return "defend"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 10
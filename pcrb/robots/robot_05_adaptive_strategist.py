@@ -31,4 +31,8 @@ def robot_logic(robot, game_info, memos):
     elif robot.position[1] < enemy_position[1]:
         return "down"
     else:
-        return "up"
\ No newline at end of file
+        return "up"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 20
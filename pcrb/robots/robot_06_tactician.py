@@ -53,4 +53,8 @@ def robot_logic(robot, game_info, memos):
             return "up"
 
     # デフォルトの動作
-    return "rest"
\ No newline at end of file
+    return "rest"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 30
@@ -25,3 +25,7 @@ def robot_logic(robot, game_info, memos):
         return "down"
     else:
         return "up"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 15
@@ -31,3 +31,7 @@ def robot_logic(robot, game_info, memos):
     # スタミナが十分で敵が近い場合、攻撃を試みる
     if robot.sp >= 30:
         return "attack"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 30
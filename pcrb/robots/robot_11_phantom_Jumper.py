@@ -26,4 +26,8 @@ def robot_logic(robot, game_info, memos):
         return "teleport"
 
     # デフォルトの動作
-    return "rest"
\ No newline at end of file
+    return "rest"
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 20
@@ -32,4 +32,8 @@ def robot_logic(robot, game_info, memos):
     elif robot.position[1] < enemy_position[1]:
         return "down", memo
     else:
-        return "up", memo
\ No newline at end of file
+        return "up", memo
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 20
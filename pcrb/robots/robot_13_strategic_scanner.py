@@ -46,4 +46,8 @@ def robot_logic(robot, game_info, memos):
             return "up", memo
 
     # それ以外の場合は休む
-    return "rest", memo
\ No newline at end of file
+    return "rest", memo
+
+
+robot_logic.deterministic = True
+robot_logic.sp_horizon = 20
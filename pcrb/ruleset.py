@@ -0,0 +1,122 @@
+"""行動のコスト・威力・持続ターンなどと、ロボットの初期 HP / SP をまとめたルールセット。
+
+``GameController(ruleset=...)`` に渡すと、行動ルールはクラス属性ではなくコントローラの
+ルールセットから値を読む。ルールセットは不変なので、1 つのプロセスで複数のルールセットの試合を
+並行して行える（モジュールの再読み込みは不要）::
+
+    ruleset = Ruleset.load("balance.json")
+    cheap = DEFAULT_RULESET.variant(name="cheap_attack", attack={"cost": 5})
+
+JSON の形式は ``to_dict`` の戻り値と同じで、省略した値は既定値（各行動クラスの属性）になる::
+
+    {"name": "cheap_attack", "initial_hp": 100, "initial_sp": 50,
+     "actions": {"attack": {"cost": 5}}}
+"""
+import json
+
+from actions import ACTIONS
+
+
+def _rules():
+    """Robot 上の属性名 → 共有ルール（登録順）"""
+    rules = {}
+    for spec in ACTIONS:
+        rules.setdefault(spec.attr, spec.rule)
+    return rules
+
+
+class Ruleset:
+    """ルールセット。各行動のパラメータは ``ruleset.<属性名>``（例: ``ruleset.attack.cost``）で引ける。
+
+    :param initial_hp: ロボットの初期 HP
+    :param initial_sp: ロボットの初期 SP
+    :param actions: ``{属性名: {パラメータ名: 値}}`` の上書き
+    :param name: 識別用の名前
+    """
+
+    def __init__(self, initial_hp=100, initial_sp=50, actions=None, name="default"):
+        self.name = name
+        self.initial_hp = initial_hp
+        self.initial_sp = initial_sp
+        overrides = dict(actions or {})
+        rules = _rules()
+        unknown = set(overrides) - set(rules)
+        if unknown:
+            raise ValueError(f"Unknown actions in ruleset: {sorted(unknown)}")
+        self._params = {}
+        for attr, rule in rules.items():
+            values = {name: getattr(rule, name) for name in rule.parameters}
+            given = overrides.get(attr, {})
+            unknown = set(given) - set(values)
+            if unknown:
+                raise ValueError(f"Unknown parameters for {attr}: {sorted(unknown)}")
+            values.update(given)
+            params = type(rule).Params(**values)
+            self._params[attr] = params
+            setattr(self, attr, params)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_params", None) is not None and name in self.__dict__:
+            raise AttributeError("Ruleset is immutable; use variant() to derive a new one.")
+        super().__setattr__(name, value)
+
+    def params(self, attr):
+        return self._params[attr]
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "initial_hp": self.initial_hp,
+            "initial_sp": self.initial_sp,
+            "actions": {attr: params._asdict() for attr, params in self._params.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        unknown = set(data) - {"name", "initial_hp", "initial_sp", "actions"}
+        if unknown:
+            raise ValueError(f"Unknown ruleset keys: {sorted(unknown)}")
+        return cls(
+            initial_hp=data.get("initial_hp", 100),
+            initial_sp=data.get("initial_sp", 50),
+            actions=data.get("actions"),
+            name=data.get("name", "custom"),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+
+    def variant(self, name=None, initial_hp=None, initial_sp=None, **actions):
+        """一部の値だけを変えた新しいルールセットを返す（例: ``variant(attack={"cost": 5})``）"""
+        merged = {attr: params._asdict() for attr, params in self._params.items()}
+        for attr, values in actions.items():
+            if attr not in merged:
+                raise ValueError(f"Unknown action in ruleset: {attr}")
+            merged[attr].update(values)
+        return Ruleset(
+            initial_hp=self.initial_hp if initial_hp is None else initial_hp,
+            initial_sp=self.initial_sp if initial_sp is None else initial_sp,
+            actions=merged,
+            name=self.name if name is None else name,
+        )
+
+    def _key(self):
+        return self.initial_hp, self.initial_sp, tuple(self._params.items())
+
+    def __eq__(self, other):
+        return isinstance(other, Ruleset) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"Ruleset(name={self.name!r})"
+
+
+DEFAULT_RULESET = Ruleset()
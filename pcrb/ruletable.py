@@ -0,0 +1,298 @@
+"""宣言的なルール表ボット。
+
+``(条件, 行動)`` の組を優先順に並べた表を、通常の ``robot_logic`` 関数と、
+``batch.BatchEngine`` 用のベクトル化ポリシー（``robot_logic.batch_policy``）の 2 通りにコンパイルする::
+
+    robot_logic = compile_rules([
+        ("sp < 20", "rest"),
+        ("distance == 1", "attack"),
+        ("True", "approach"),
+    ])
+
+条件は Python の式の小さな部分集合で、使える名前は ``FEATURES``、関数は ``abs`` / ``min`` / ``max``、
+演算子は比較・``and`` / ``or`` / ``not``・``+`` / ``-`` / ``*`` のみ。
+行動は robot_logic が返す行動名か ``MACROS`` のマクロ名。
+"""
+import ast
+
+import numpy as np
+
+from actions import ACTIONS
+
+
+# 条件式で使える名前 → robot_logic 内での求め方
+FEATURES = {
+    "x": "robot.x",
+    "y": "robot.y",
+    "hp": "robot.hp",
+    "sp": "robot.sp",
+    "enemy_x": "game_info['enemy_position'][0]",
+    "enemy_y": "game_info['enemy_position'][1]",
+    "enemy_hp": "game_info['enemy_hp']",
+    "enemy_sp": "game_info.get('enemy_sp', -1)",  # スキャン中のみ。見えなければ -1
+    "dx": "enemy_x - x",  # 敵の x - 自分の x
+    "dy": "enemy_y - y",
+    "distance": "abs(dx) + abs(dy)",
+    "scanning": "robot.scan.is_active",
+    "camouflaged": "robot.camouflage.is_active",
+    "parry_cooldown": "robot.parry.cooldown_counter",
+    "turn": "game_info['turn']",
+    "max_turn": "game_info['max_turn']",
+    "x_max": "game_info['board_size']['x_max']",
+    "y_max": "game_info['board_size']['y_max']",
+}
+
+# 派生する名前が依存する名前（robot_logic で先に求める必要があるもの）
+_DEPENDS = {
+    "dx": ("enemy_x", "x"),
+    "dy": ("enemy_y", "y"),
+    "distance": ("dx", "dy"),
+}
+
+_BOOLEAN_FEATURES = {"scanning", "camouflaged"}
+
+# 行動マクロ: 展開すると (条件, 行動) の列になる。どれにも当てはまらなければ次のルールへ進む
+MACROS = {
+    # 敵に近づく（x 方向優先）
+    "approach": [("dx > 0", "right"), ("dx < 0", "left"), ("dy > 0", "down"), ("True", "up")],
+    # 敵から離れる（x 方向優先）
+    "retreat": [("dx > 0", "left"), ("dx < 0", "right"), ("dy > 0", "up"), ("True", "down")],
+    # 敵の方向に罠を置く（y 方向優先）。敵と同じマスなら置かない
+    "trap_toward": [("dy > 0", "trap_down"), ("dy < 0", "trap_up"), ("dx > 0", "trap_right"), ("dx < 0", "trap_left")],
+}
+
+_COMPARE_OPS = (ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE)
+_ARITH_OPS = (ast.Add, ast.Sub, ast.Mult)
+_FUNCTIONS = {"abs": "np.abs", "min": "np.minimum", "max": "np.maximum"}
+
+
+class RuleError(ValueError):
+    """ルール表の書式エラー"""
+
+
+def _check(node, source):
+    """条件式の AST が許可された部分集合かを確認する"""
+    if isinstance(node, ast.Expression):
+        return _check(node.body, source)
+    if isinstance(node, ast.BoolOp):
+        for value in node.values:
+            _check_boolean(value, source)
+        return
+    if isinstance(node, ast.UnaryOp):
+        if isinstance(node.op, ast.Not):
+            return _check_boolean(node.operand, source)
+        if isinstance(node.op, ast.USub):
+            return _check(node.operand, source)
+    elif isinstance(node, ast.Compare):
+        if all(isinstance(op, _COMPARE_OPS) for op in node.ops):
+            for value in [node.left] + node.comparators:
+                _check(value, source)
+            return
+    elif isinstance(node, ast.BinOp):
+        if isinstance(node.op, _ARITH_OPS):
+            _check(node.left, source)
+            return _check(node.right, source)
+    elif isinstance(node, ast.Call):
+        if isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS and not node.keywords:
+            for arg in node.args:
+                _check(arg, source)
+            return
+    elif isinstance(node, ast.Name):
+        if node.id in FEATURES:
+            return
+        raise RuleError(f"Unknown name {node.id!r} in condition: {source}")
+    elif isinstance(node, ast.Constant):
+        if isinstance(node.value, (bool, int, float)):
+            return
+    raise RuleError(f"Unsupported expression in condition: {source}")
+
+
+def _check_boolean(node, source):
+    """``and`` / ``or`` / ``not`` の対象は真偽値の式に限る（NumPy 側で & | ~ にするため）"""
+    _check(node, source)
+    if isinstance(node, (ast.Compare, ast.BoolOp)):
+        return
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return
+    if isinstance(node, ast.Name) and node.id in _BOOLEAN_FEATURES:
+        return
+    if isinstance(node, ast.Constant) and isinstance(node.value, bool):
+        return
+    raise RuleError(f"and / or / not need boolean operands: {source}")
+
+
+class _ToNumpy(ast.NodeTransformer):
+    """条件式を配列に対して評価できる式に書き換える"""
+
+    def visit_BoolOp(self, node):
+        self.generic_visit(node)
+        op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+        result = node.values[0]
+        for value in node.values[1:]:
+            result = ast.BinOp(result, op, value)
+        return result
+
+    def visit_UnaryOp(self, node):
+        self.generic_visit(node)
+        if isinstance(node.op, ast.Not):
+            return ast.UnaryOp(ast.Invert(), node.operand)
+        return node
+
+    def visit_Compare(self, node):
+        self.generic_visit(node)
+        operands = [node.left] + node.comparators
+        parts = [ast.Compare(left, [op], [right]) for left, op, right in zip(operands, node.ops, operands[1:])]
+        result = parts[0]
+        for part in parts[1:]:
+            result = ast.BinOp(result, ast.BitAnd(), part)
+        return result
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        name = _FUNCTIONS[node.func.id]
+        return ast.Call(ast.parse(name, mode="eval").body, node.args, [])
+
+
+def _names(tree):
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and node.id in FEATURES}
+
+
+def _with_dependencies(names):
+    ordered = []
+
+    def add(name):
+        if name in ordered:
+            return
+        for dependency in _DEPENDS.get(name, ()):
+            add(dependency)
+        ordered.append(name)
+
+    for name in sorted(names):
+        add(name)
+    return ordered
+
+
+def _is_sp(node):
+    return isinstance(node, ast.Name) and node.id in ("sp", "enemy_sp")
+
+
+def _sp_horizon(trees):
+    """``sp`` / ``enemy_sp`` を定数とだけ比較していれば、区別しなくてよい SP の下限を返す（それ以外は None）"""
+    horizon = 0
+    for tree in trees:
+        compared = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Compare) and len(node.ops) == 1:
+                left, right = node.left, node.comparators[0]
+                for name, other in ((left, right), (right, left)):
+                    if _is_sp(name) and isinstance(other, ast.Constant):
+                        compared.add(id(name))
+                        horizon = max(horizon, other.value + 1)
+        if any(_is_sp(node) and id(node) not in compared for node in ast.walk(tree)):
+            return None
+    return horizon
+
+
+class RuleTable:
+    """``(条件, 行動)`` の優先順リスト。上から順に最初に成り立った行動を返す。
+
+    :param rules: ``(条件式の文字列, 行動名またはマクロ名)`` のリスト
+    :param default: どのルールにも当てはまらなかった場合の行動
+    """
+
+    def __init__(self, rules, default="rest"):
+        self.rules = list(rules)
+        self.default = default
+        self._expanded = []  # (条件の AST, 行動名)
+        for condition, action in self.rules:
+            for sub_condition, sub_action in MACROS.get(action, [("True", action)]):
+                source = condition if sub_condition == "True" else f"({condition}) and ({sub_condition})"
+                self._expanded.append((self._parse(source), sub_action))
+        for action in [action for _, action in self._expanded] + [default]:
+            if ACTIONS.get(action) is None:
+                raise RuleError(f"Unknown action: {action}")
+
+    @staticmethod
+    def _parse(source):
+        try:
+            tree = ast.parse(source, mode="eval")
+        except SyntaxError as e:
+            raise RuleError(f"Invalid condition: {source}") from e
+        _check_boolean(tree.body, source)
+        return tree
+
+    def features(self):
+        """条件式が参照する名前（依存する名前を含む）"""
+        names = set()
+        for tree, _ in self._expanded:
+            names |= _names(tree)
+        return _with_dependencies(names)
+
+    def compile_logic(self):
+        """通常の ``robot_logic(robot, game_info, memos)`` 関数を生成する"""
+        lines = ["def robot_logic(robot, game_info, memos):"]
+        lines += [f"    {name} = {FEATURES[name]}" for name in self.features()]
+        for tree, action in self._expanded:
+            lines.append(f"    if {ast.unparse(tree.body)}:")
+            lines.append(f"        return {action!r}")
+        lines.append(f"    return {self.default!r}")
+        namespace = {}
+        exec(compile("\n".join(lines), "<rule table>", "exec"), namespace)
+        return namespace["robot_logic"]
+
+    def compile_policy(self):
+        """``BatchObservation`` から行動コードの配列を返すベクトル化ポリシーを生成する"""
+        conditions = [
+            (compile(ast.fix_missing_locations(_ToNumpy().visit(ast.parse(ast.unparse(tree), mode="eval"))),
+                     "<rule table>", "eval"), ACTIONS.code(action))
+            for tree, action in self._expanded
+        ]
+        default = ACTIONS.code(self.default)
+        names = self.features()
+
+        def batch_policy(obs):
+            env = {"np": np}
+            for name in names:
+                env[name] = _observe(obs, name, env)
+            codes = np.full(len(obs.x), default, dtype=np.uint8)
+            # 優先度の低いルールから上書きする
+            for condition, code in reversed(conditions):
+                codes = np.where(eval(condition, env), code, codes).astype(np.uint8)
+            return codes
+
+        return batch_policy
+
+
+def _observe(obs, name, env):
+    if name == "enemy_sp":
+        return np.where(obs.scan_active, obs.enemy_sp, -1)
+    if name == "dx":
+        return env["enemy_x"] - env["x"]
+    if name == "dy":
+        return env["enemy_y"] - env["y"]
+    if name == "distance":
+        return np.abs(env["dx"]) + np.abs(env["dy"])
+    if name == "scanning":
+        return obs.scan_active
+    if name == "camouflaged":
+        return obs.camouflage_active
+    return getattr(obs, name)
+
+
+def compile_rules(rules, default="rest"):
+    """ルール表から robot_logic 関数を作る。
+
+    返す関数には ``batch_policy``（ベクトル化ポリシー）と、
+    サイクル検出用の ``deterministic`` / ``sp_horizon`` が付く。
+    """
+    table = RuleTable(rules, default)
+    logic = table.compile_logic()
+    logic.batch_policy = table.compile_policy()
+    logic.rule_table = table
+    trees = [tree for tree, _ in table._expanded]
+    if "turn" not in table.features():
+        logic.deterministic = True
+        horizon = _sp_horizon(trees)
+        if horizon is not None:
+            logic.sp_horizon = horizon
+    return logic
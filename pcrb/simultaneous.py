@@ -0,0 +1,104 @@
+"""同時手番モード（``GameController(simultaneous=True)``）の行動解決。
+
+毎ターン両ロボットが同じ局面の game_info を受け取り、選んだ行動を同時に解決する。
+行動はルールの ``simultaneous_phase`` の小さい順に解決し、同じ段階の衝突は次の規則で扱う。
+
+- 0 構え（防御・パリィ・休憩・カモフラージュ・スキャン）: 先に効果が出るので、同じターンの攻撃にも効く
+- 1 移動: 同じマスへの移動と、互いの位置の入れ替わりは両方とも失敗。
+  相手のいるマスへの移動は、相手がそのターンに移動して空いた場合のみ成功
+- 2 テレポート: 移動後の空きマスへ（両方なら robot1 から）
+- 3 罠: 移動後の位置で判定。両方が同じマスに置こうとした場合は両方とも失敗
+- 4 攻撃・遠距離攻撃・スティール: 移動後の位置で判定し、ダメージは同時に入る（相討ちあり）。
+  互いにスティールした場合は両方とも失敗
+"""
+import events
+from actions import ACTIONS
+from clock import ChessClock
+from rng import call_with_rng
+
+
+def call_logic(logic, rng, robot, game_info, memos):
+    """robot_logic を呼び、応答と（進んだ）乱数と経過秒を返す。
+
+    別プロセスで実行した場合も乱数の状態を呼び出し元に戻せるようにモジュールレベルに置く。
+    """
+    response, elapsed = ChessClock.measure(call_with_rng, logic, rng, robot, game_info, memos)
+    return response, rng, elapsed
+
+
+def _emit(controller, kind, robot, enemy, **fields):
+    if controller.events is not None:
+        controller.events.emit(controller.turn, kind, robot, enemy, **fields)
+
+
+def _resolve_moves(controller, intents):
+    rule = ACTIONS.rule("move")
+    cost = rule.params(controller).cost
+    targets = {
+        robot: rule.target(robot, action) if robot.sp >= cost else None
+        for robot, enemy, action in intents
+    }
+    blocked = set()
+    if len(intents) == 2:
+        (first, _, _), (second, _, _) = intents
+        target1, target2 = targets[first], targets[second]
+        if target1 is not None and target2 is not None and (
+                target1 == target2 or (target1 == second.position and target2 == first.position)):
+            blocked = {first, second}
+
+    # 相手が空けるマスへ移動するロボットは後に動かす
+    for robot, enemy, action in sorted(intents, key=lambda intent: targets[intent[0]] == intent[1].position):
+        if robot in blocked:
+            x, y = targets[robot]
+            _emit(controller, events.MOVE_COLLISION, robot, enemy, x=x, y=y)
+            continue
+        ACTIONS.get(action).handler(robot, enemy, action, controller.turn)
+
+
+def _resolve_traps(controller, intents):
+    rule = ACTIONS.rule("trap")
+    targets = [rule.target(robot, action) for robot, enemy, action in intents]
+    contested = len(intents) == 2 and targets[0] is not None and targets[0] == targets[1]
+    for robot, enemy, action in intents:
+        if contested:
+            x, y = targets[0]
+            _emit(controller, events.TRAP_CONTESTED, robot, enemy, x=x, y=y)
+            continue
+        ACTIONS.get(action).handler(robot, enemy, action, controller.turn)
+
+
+def _resolve_default(controller, intents):
+    mutual_steal = len(intents) == 2 and all(action == "steal" for _, _, action in intents)
+    for robot, enemy, action in intents:
+        if mutual_steal:
+            _emit(controller, events.STEAL_MUTUAL, robot, enemy)
+            continue
+        ACTIONS.get(action).handler(robot, enemy, action, controller.turn)
+
+
+_RESOLVERS = {"move": _resolve_moves, "trap": _resolve_traps}
+
+
+def resolve(controller, intents):
+    """``[(robot, enemy, 行動名・"stun"・None), ...]`` を同時に解決する（None は時間切れで何もしない）"""
+    acting = []
+    for robot, enemy, action in intents:
+        if action == "stun":
+            continue
+        if action is None:
+            robot.start_turn()
+            continue
+        if ACTIONS.get(action) is None:
+            raise ValueError("Unexpected robot action detected!")
+        acting.append((robot, enemy, action))
+
+    for robot, enemy, action in acting:
+        robot.start_turn()
+
+    phases = {}
+    for intent in acting:
+        spec = ACTIONS.get(intent[2])
+        phases.setdefault(spec.rule.simultaneous_phase, {}).setdefault(spec.attr, []).append(intent)
+    for phase in sorted(phases):
+        for attr, group in phases[phase].items():
+            _RESOLVERS.get(attr, _resolve_default)(controller, group)
@@ -0,0 +1,238 @@
+import json
+import os
+
+from events import EventLog
+from replay import ReplayWriter
+
+
+class NullSink:
+    """何も出力しないシンク。ヘッドレス実行（大量対戦）向け。
+
+    ``enabled`` が ``False`` のシンクを渡すと、コントローラやアクションは
+    ログ文字列の組み立て自体を省略する。
+    """
+    enabled = False
+
+    def log(self, turn, message):
+        pass
+
+    def event(self, events, index):
+        """行動イベント（``events.EventLog`` の ``index`` 件目）。既定では文章にして ``log`` へ渡す"""
+        self.log(events[index].turn, events.message(index))
+
+    def debug(self, message):
+        pass
+
+    def begin(self, header):
+        """試合の開始（``header`` は設定を持つ ``game_state[0]``）"""
+
+    def state(self, state):
+        pass
+
+    def finish(self, game_state):
+        pass
+
+    def reset(self):
+        pass
+
+
+class BufferSink(NullSink):
+    """ログとゲーム状態をメモリ上に保持するシンク。
+
+    行動イベントは文章にせずイベントログと件数だけを持ち、``lines`` / ``text`` を読んだときに組み立てる。
+    """
+    enabled = True
+
+    def __init__(self, keep_debug=False):
+        self.keep_debug = keep_debug
+        self._entries = []  # (turn, message) または (イベントログ, 件数)
+        self.debug_lines = []
+        self.states = []
+
+    def log(self, turn, message):
+        self._entries.append((turn, message))
+
+    def event(self, events, index):
+        self._entries.append((events, index))
+
+    @property
+    def lines(self):
+        """``(ターン, 文章)`` のリスト"""
+        return [
+            (first[second].turn, first.message(second)) if isinstance(first, EventLog) else (first, second)
+            for first, second in self._entries
+        ]
+
+    def debug(self, message):
+        if self.keep_debug:
+            self.debug_lines.append(message)
+
+    def state(self, state):
+        self.states.append(state)
+
+    def reset(self):
+        self._entries = []
+        self.debug_lines = []
+        self.states = []
+
+    def text(self):
+        """``game_log.txt`` と同じ書式の文字列を返す。"""
+        return "".join(f"Turn {turn}: {message}\n" for turn, message in self.lines)
+
+
+class FileSink(NullSink):
+    """ログをファイルへ、ゲーム状態を replay（``replay`` モジュールの NDJSON）へ書き出すシンク。
+
+    replay は試合の開始時に設定を、各ターンの終わりにその状態を 1 行ずつ追記する（``.gz`` なら gzip で圧縮する）。
+    ログのファイルは従来のコントローラと同じくコンストラクタと ``reset`` で空にし（前回の実行のログを残さない）、
+    ハンドルは最初の書き込み時に開く。
+    ``echo=True`` のときは従来どおり標準出力にも表示する。
+    """
+    enabled = True
+
+    def __init__(self, log_path="game_log.txt", state_path="game_state.json", echo=False):
+        self.log_path = log_path
+        self.state_path = state_path
+        self.echo = echo
+        self._log_file = None
+        self._replay = None if state_path is None else ReplayWriter(state_path)
+        self._truncate_log()
+
+    def _truncate_log(self):
+        if self.log_path is not None:
+            open(self.log_path, "w").close()
+
+    def log(self, turn, message):
+        if self.echo:
+            print(message)
+        if self._log_file is None:
+            self._log_file = open(self.log_path, "w")
+        self._log_file.write(f"Turn {turn}: {message}\n")
+
+    def debug(self, message):
+        if self.echo:
+            print(message)
+
+    def begin(self, header):
+        if self._replay is not None:
+            self._replay.header(header)
+
+    def state(self, state):
+        if self._replay is not None:
+            self._replay.turn(state)
+
+    def finish(self, game_state):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        if self._replay is not None:
+            self._replay.close(game_state[0])
+
+    def reset(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+        self._truncate_log()
+        if self._replay is not None:
+            self._replay.close()
+
+
+class _RotatingFile:
+    """``max_bytes`` を超えたら ``path.1`` … ``path.<backup_count>`` へずらして書き直すファイル"""
+
+    def __init__(self, path, max_bytes, backup_count):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._size = 0
+
+    def write(self, text):
+        if self._file is None:
+            self._file = open(self.path, "w")
+            self._size = 0
+        elif self._size + len(text) > self.max_bytes:
+            self.rotate()
+        self._file.write(text)
+        self._size += len(text)
+
+    def rotate(self):
+        self.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "w")
+        self._size = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class RotatingFileSink(NullSink):
+    """ログと各ターンの状態をサイズ上限つきでファイルへ流すシンク（ソークモード向け）。
+
+    ログは ``game_log.txt`` と同じ書式、状態は 1 行 1 ターンの JSON（NDJSON）で書き、
+    ファイルが ``max_bytes`` を超えるたびに ``.1`` 〜 ``.<backup_count>`` へローテートする。
+    試合終了時に game_state 全体は書き出さないので、ディスク使用量も一定に保たれる。
+    """
+    enabled = True
+
+    def __init__(self, log_path="game_log.txt", state_path="game_state.ndjson",
+                 max_bytes=10 * 1024 * 1024, backup_count=3):
+        self._log = _RotatingFile(log_path, max_bytes, backup_count)
+        self._states = None if state_path is None else _RotatingFile(state_path, max_bytes, backup_count)
+
+    def log(self, turn, message):
+        self._log.write(f"Turn {turn}: {message}\n")
+
+    def state(self, state):
+        if self._states is not None:
+            self._states.write(json.dumps(state) + "\n")
+
+    def finish(self, game_state):
+        self.reset()
+
+    def reset(self):
+        self._log.close()
+        if self._states is not None:
+            self._states.close()
+
+
+class CallbackSink(NullSink):
+    """ログ・状態イベントごとに任意の関数を呼び出すシンク。"""
+    enabled = True
+
+    def __init__(self, on_log=None, on_state=None, on_debug=None, on_finish=None):
+        self.on_log = on_log
+        self.on_state = on_state
+        self.on_debug = on_debug
+        self.on_finish = on_finish
+
+    def log(self, turn, message):
+        if self.on_log is not None:
+            self.on_log(turn, message)
+
+    def debug(self, message):
+        if self.on_debug is not None:
+            self.on_debug(message)
+
+    def state(self, state):
+        if self.on_state is not None:
+            self.on_state(state)
+
+    def finish(self, game_state):
+        if self.on_finish is not None:
+            self.on_finish(game_state)
+
+
+def legacy_sink():
+    """従来の挙動（標準出力 + game_log.txt + game_state.json）を再現するシンク。
+
+    ファイル名は従来のままで、中身は replay の NDJSON（``replay.load_replay`` で読む）。
+    """
+    return FileSink("game_log.txt", "game_state.json", echo=True)
@@ -0,0 +1,33 @@
+from collections import namedtuple
+
+
+# ロボット 1 体分の状態。traps は設置順の座標タプル
+RobotSnapshot = namedtuple("RobotSnapshot", [
+    "x", "y", "hp", "sp", "stun_counter",
+    "defend_active",
+    "parry_active", "parry_cooldown",
+    "camouflage_active", "camouflage_remaining", "camouflage_last_position",
+    "scan_active", "scan_remaining",
+    "traps",
+])
+
+# 試合全体の状態。rng_state は random.Random.getstate() の値
+MatchSnapshot = namedtuple("MatchSnapshot", ["turn", "rng_state", "robot1", "robot2"])
+
+
+class ForwardModel:
+    """robot_logic に渡すフォワードモデル（``game_info["forward_model"]``）。
+
+    手番開始時点の状態 ``snapshot`` から ``simulate`` で行動列の結果を先読みできる。
+    実際の試合には影響しない。コントローラは ``simulate`` のクロージャだけが持ち、robot_logic からはたどれない。
+    """
+    __slots__ = ("snapshot", "simulate")
+
+    def __init__(self, controller):
+        start = self.snapshot = controller.snapshot()
+
+        def simulate(actions, snapshot=None):
+            """``GameController.simulate`` と同じ。``snapshot`` 省略時は手番開始時点から"""
+            return controller.simulate(actions, start if snapshot is None else snapshot)
+
+        self.simulate = simulate
@@ -0,0 +1,15 @@
+"""``robots/robot_05_adaptive_strategist.py`` と同じ動きをルール表（``ruletable.compile_rules``）で書いたボット（``batch_policy`` を持つ）"""
+from ruletable import compile_rules
+
+
+# 改良されたロジック:
+# - 敵が隣接している場合、攻撃を優先。
+# - スタミナが少ない場合は休む。
+# - 敵が遠距離にいる場合、遠距離攻撃を試みる。
+# - 敵に近づくために最適な方向に移動。
+robot_logic = compile_rules([
+    ("sp < 20", "rest"),  # スタミナが少ない場合は休む
+    ("distance == 1", "attack"),  # 敵が隣接している場合、攻撃を優先
+    ("distance == 2 and sp >= 15", "ranged_attack"),  # 敵が遠距離にいる場合、遠距離攻撃を試みる
+    ("True", "approach"),  # 敵に近づくために最適な方向に移動
+])
@@ -0,0 +1,16 @@
+"""``robots/robot_06_tactician.py`` と同じ動きをルール表（``ruletable.compile_rules``）で書いたボット（``batch_policy`` を持つ）"""
+from ruletable import compile_rules
+
+
+# 対抗ロジック:
+# - 敵が隣接している場合、スタミナが十分なら攻撃、そうでなければ回避。
+# - 敵が遠距離攻撃を試みる距離にいる場合、スタミナを温存しつつ回避。
+# - 敵に近づきすぎないように距離を保ちながら戦う。
+# - スタミナが少ない場合は休む。
+robot_logic = compile_rules([
+    ("sp < 20", "rest"),  # スタミナが少ない場合は休む
+    ("distance == 1 and sp >= 30", "attack"),  # 敵が隣接していてスタミナが十分なら攻撃
+    ("distance == 1", "retreat"),  # スタミナが少ない場合は回避
+    ("distance == 2", "retreat"),  # 敵の遠距離攻撃を回避するために移動
+    ("distance > 2", "approach"),  # 敵に近づきすぎないように距離を保つ
+], default="rest")
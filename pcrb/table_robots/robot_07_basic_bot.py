@@ -0,0 +1,13 @@
+"""``robots/robot_07_basic_bot.py`` と同じ動きをルール表（``ruletable.compile_rules``）で書いたボット（``batch_policy`` を持つ）"""
+from ruletable import compile_rules
+
+
+# 基本的なロジック:
+# - 敵が隣接している場合のみ攻撃。
+# - スタミナが少ない場合は休む。
+# - 敵に近づくために単純な移動を行う。
+robot_logic = compile_rules([
+    ("sp < 15", "rest"),  # スタミナが少ない場合は休む
+    ("distance == 1", "attack"),  # 敵が隣接している場合のみ攻撃
+    ("True", "approach"),  # 敵に近づくために単純な移動を行う
+])
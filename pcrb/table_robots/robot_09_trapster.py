@@ -0,0 +1,14 @@
+"""``robots/robot_09_trapster.py`` と同じ動きをルール表（``ruletable.compile_rules``）で書いたボット（``batch_policy`` を持つ）"""
+from ruletable import compile_rules
+
+
+# 罠を活用するロジック。
+# - スタミナが少ない場合は休む。
+# - 敵の近くに罠を設置。
+# - 敵が罠にかかる位置に移動して攻撃を仕掛ける。
+robot_logic = compile_rules([
+    ("sp < 20", "rest"),  # スタミナが少ない場合は休む
+    ("distance == 1", "attack"),  # 敵が隣接している場合は攻撃
+    ("sp >= 15", "trap_toward"),  # 敵の近くに罠を設置
+    ("True", "approach"),  # 敵に近づく
+])
@@ -0,0 +1,173 @@
+"""壁のある盤面（地形）と、BFS による距離場。
+
+マップファイルは 1 文字 1 マスのテキストで、``#`` が壁、``.`` が床、
+``A`` / ``B`` が robot1 / robot2 の初期位置（床）を表す。空行は無視する::
+
+    #########
+    #A..#..B#
+    #...#...#
+    #.......#
+    #########
+
+距離場は「あるマスから各マスへの最短歩数」を目標マスからの BFS で求めたもので、
+目標マスごとに 1 度だけ計算してキャッシュする。``load_map`` は同じパスの地形を使い回すので、
+同じマップで何試合行っても距離場の計算は共有される。
+"""
+import os
+from array import array
+from collections import OrderedDict
+from collections import deque
+from functools import lru_cache
+
+# 方向名 → (dx, dy)（盤面座標。y は下向きが正）
+DIRECTIONS = {"up": (0, -1), "down": (0, 1), "left": (-1, 0), "right": (1, 0)}
+
+UNREACHABLE = -1
+
+MAPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "maps")
+
+
+class Terrain:
+    """盤面の大きさ・壁・初期位置と、距離場のキャッシュ。
+
+    :param walls: 壁のマス ``(x, y)`` の列
+    :param starts: ``{"A": (x, y), "B": (x, y)}`` のような初期位置
+    :param max_fields: キャッシュする距離場の数の上限（``None`` で無制限）
+    """
+
+    def __init__(self, x_max, y_max, walls=(), starts=None, name=None, max_fields=1024):
+        self.x_max = x_max
+        self.y_max = y_max
+        self.size = x_max * y_max
+        self.name = name
+        self.starts = dict(starts or {})
+        self.walls = bytearray(self.size)
+        for x, y in walls:
+            self.walls[y * x_max + x] = 1
+        self.max_fields = max_fields
+        self._fields = OrderedDict()  # (目標マス, 避けるマス) → 距離場
+
+    @classmethod
+    def from_text(cls, text, name=None, **kwargs):
+        rows = [line.rstrip("\r") for line in text.splitlines() if line.strip()]
+        if not rows:
+            raise ValueError("Empty map.")
+        x_max = max(len(row) for row in rows)
+        walls = []
+        starts = {}
+        for y, row in enumerate(rows):
+            for x, char in enumerate(row.ljust(x_max, "#")):
+                if char == "#":
+                    walls.append((x, y))
+                elif char in "AB":
+                    starts[char] = (x, y)
+                elif char != ".":
+                    raise ValueError(f"Unknown map character {char!r} at ({x}, {y})")
+        return cls(x_max, len(rows), walls, starts, name=name, **kwargs)
+
+    def __getstate__(self):
+        # 別プロセスへ渡すときは距離場のキャッシュを送らない
+        state = self.__dict__.copy()
+        state["_fields"] = OrderedDict()
+        return state
+
+    def index(self, x, y):
+        return y * self.x_max + x
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.x_max and 0 <= y < self.y_max
+
+    def is_wall(self, x, y):
+        return self.walls[y * self.x_max + x] == 1
+
+    def wall_cells(self):
+        x_max = self.x_max
+        return [(index % x_max, index // x_max) for index, wall in enumerate(self.walls) if wall]
+
+    # ------------------------------------------------------------------
+    # 距離場
+    # ------------------------------------------------------------------
+    def distance_field(self, target, avoid=()):
+        """各マスから ``target`` までの最短歩数（1 次元配列、到達できなければ ``UNREACHABLE``）。
+
+        ``avoid`` のマス（罠など）は通らない。結果はキャッシュされる。
+        """
+        key = (target, frozenset(avoid)) if avoid else (target, None)
+        fields = self._fields
+        field = fields.get(key)
+        if field is not None:
+            fields.move_to_end(key)
+            return field
+        field = self._bfs(target, avoid)
+        fields[key] = field
+        if self.max_fields is not None and len(fields) > self.max_fields:
+            fields.popitem(last=False)
+        return field
+
+    def _bfs(self, target, avoid):
+        x_max, y_max = self.x_max, self.y_max
+        blocked = bytearray(self.walls)
+        for x, y in avoid:
+            # 盤面の外のマスは別の行に回り込まないよう無視する
+            if 0 <= x < x_max and 0 <= y < y_max:
+                blocked[y * x_max + x] = 1
+        field = array("i", [UNREACHABLE]) * self.size
+        if not (0 <= target[0] < x_max and 0 <= target[1] < y_max):
+            return field
+        start = target[1] * x_max + target[0]
+        if self.walls[start]:
+            return field
+        field[start] = 0
+        queue = deque([start])
+        while queue:
+            index = queue.popleft()
+            distance = field[index] + 1
+            x = index % x_max
+            for neighbor, ok in (
+                    (index - x_max, index >= x_max), (index + x_max, index < self.size - x_max),
+                    (index - 1, x > 0), (index + 1, x < x_max - 1)):
+                if ok and field[neighbor] == UNREACHABLE and not blocked[neighbor]:
+                    field[neighbor] = distance
+                    queue.append(neighbor)
+        return field
+
+    def precompute(self):
+        """全ての床マスを目標とする距離場（全点対）を計算してキャッシュする。小さなマップ向け"""
+        self.max_fields = None
+        for index, wall in enumerate(self.walls):
+            if not wall:
+                self.distance_field((index % self.x_max, index // self.x_max))
+
+    def distance(self, source, target, avoid=()):
+        """``source`` から ``target`` までの最短歩数（到達できなければ ``UNREACHABLE``）"""
+        return self.distance_field(target, avoid)[source[1] * self.x_max + source[0]]
+
+    def next_steps(self, source, target, avoid=()):
+        """``target`` への最短経路の最初の 1 歩になる ``(dx, dy)`` のリスト（上・下・左・右の順）。
+
+        既に隣接している・同じマスにいる・到達できない場合は空リスト。
+        """
+        field = self.distance_field(target, avoid)
+        x, y = source
+        distance = field[y * self.x_max + x]
+        if distance <= 1:
+            return []
+        steps = []
+        for dx, dy in DIRECTIONS.values():
+            nx, ny = x + dx, y + dy
+            if self.in_bounds(nx, ny) and field[ny * self.x_max + nx] == distance - 1:
+                steps.append((dx, dy))
+        return steps
+
+
+@lru_cache(maxsize=None)
+def load_map(path):
+    """マップファイルを読み込む。相対パスで見つからなければ ``pcrb/maps`` から探す。
+
+    同じパスには同じ Terrain を返すので、距離場のキャッシュは試合をまたいで共有される。
+    """
+    if not os.path.exists(path):
+        path = os.path.join(MAPS_DIR, path)
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    return Terrain.from_text(text, name=os.path.splitext(os.path.basename(path))[0])
@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import permutations
+
+from batch import play_batch
+from constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
+from pool import worker_pool
+from replaystore import ReplayStore, logic_hash, open_store
+from rng import child_seed
+
+
+def play_pairing(pairing):
+    """``(name1, logic1, name2, logic2, seed, settings)`` の 1 試合を実行し結果の辞書を返す。
+
+    ワーカー（スレッド／プロセス）ごとのプールを使うので、
+    同じワーカーで続けて呼ぶとコントローラとロボットが再利用される。
+    ``settings["store"]`` に replay のストアのディレクトリを渡すと、replay の本体をそこへ書き出し、
+    索引に加える行（``replaystore.MatchRow``）を結果の ``"replay"`` に入れる。
+    """
+    name1, logic1, name2, logic2, seed, settings = pairing
+    store = settings.get("store")
+    if store is not None:
+        settings = {key: value for key, value in settings.items() if key != "store"}
+    winner, game_state = worker_pool().play(logic1, logic2, PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME, seed, **settings)
+    last = game_state[-1]
+    result = {
+        "robot1": name1,
+        "robot2": name2,
+        "seed": game_state[0]["settings"]["seed"],
+        "winner": name1 if winner.name == PLAYER_ROBOT_NAME else name2,
+        "turns": last.get("turn", 0),
+        "hp": tuple(robot["hp"] for robot in last.get("robots", ())),
+    }
+    clock = game_state[0].get("clock")
+    if clock is not None:
+        # 持ち時間を指定した場合は思考時間の合計（秒）も返す
+        result["time"] = tuple(entry["total"] for entry in clock.values())
+    events = game_state[0].get("events")
+    if events is not None:
+        # events=True の場合はロボットごとのイベント集計（与えたダメージ・無駄にした手番など）も返す
+        result["events"] = tuple(events.get(name, {}) for name in (PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME))
+    if store is not None:
+        result["replay"] = open_store(store).prepare(game_state, (logic_hash(logic1), logic_hash(logic2)))
+    return result
+
+
+def _save_replays(results, store):
+    """ワーカーが書き出した replay を 1 つのトランザクションで索引に加え、``"replay"`` を本体のハッシュにする"""
+    if store is None:
+        return results
+    if not isinstance(store, ReplayStore):
+        store = open_store(store)
+    rows = [result["replay"] for result in results]
+    store.insert(rows)
+    for result, row in zip(results, rows):
+        result["replay"] = row.hash
+    return results
+
+
+def _pairings(bots, rounds, seed, settings):
+    pairings = [
+        (name1, bots[name1], name2, bots[name2])
+        for name1, name2 in permutations(bots, 2)
+        for _ in range(rounds)
+    ]
+    return [
+        (name1, logic1, name2, logic2, None if seed is None else child_seed(seed, index), settings)
+        for index, (name1, logic1, name2, logic2) in enumerate(pairings)
+    ]
+
+
+def round_robin(bots, rounds=1, executor=None, seed=None, store=None, **settings):
+    """全ての組み合わせを先攻・後攻入れ替えて ``rounds`` 回ずつ対戦させる。
+
+    :param bots: ロボット名 → robot_logic 関数の辞書
+    :param executor: ``concurrent.futures`` の Executor（省略時は逐次実行）。
+        ProcessPoolExecutor を使う場合、robot_logic はモジュールレベルの関数である必要がある。
+    :param seed: 親シード。指定すると各試合のシードを ``rng.child_seed(seed, 試合番号)`` で導出し、
+        ワーカー数や実行順によらず同じ結果になる。
+    :param settings: ``max_turn`` / ``x_max`` / ``y_max`` などの盤面設定と ``ruleset``（``ruleset.Ruleset``）。
+        ``events=True`` で各結果に ``"events"``（ロボットごとのイベント集計）を加える
+    :param store: replay を保存する ``replaystore.ReplayStore`` かそのディレクトリ。
+        各結果の ``"replay"`` に保存した本体のハッシュが入る
+    """
+    if store is not None:
+        settings = dict(settings, store=store.root if isinstance(store, ReplayStore) else store)
+    pairings = _pairings(bots, rounds, seed, settings)
+    if executor is None:
+        results = [play_pairing(pairing) for pairing in pairings]
+    else:
+        results = list(executor.map(play_pairing, pairings))
+    return _save_replays(results, store)
+
+
+def parallel_round_robin(bots, rounds=1, workers=4, seed=None, **settings):
+    """スレッドプールで ``round_robin`` を実行する。
+
+    ``random`` を使う同じロボットの呼び出しは ``rng.call_with_rng`` がモジュールごとに直列化するので、
+    シードを指定すれば ``round_robin`` と同じ結果になる。
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return round_robin(bots, rounds=rounds, executor=executor, seed=seed, **settings)
+
+
+def ruleset_round_robin(bots, rulesets, rounds=1, executor=None, seed=None, store=None, **settings):
+    """複数のルールセットそれぞれで ``round_robin`` を行い、ルールセット名 → 結果のリストを返す。
+
+    全ルールセットの試合を 1 つの Executor にまとめて投げるので、バランス調整の比較を 1 プロセスで並行に行える。
+    ``seed`` を指定すると、どのルールセットでも同じ試合には同じシードを使う。
+    ``store`` は ``round_robin`` と同じ。
+    """
+    if store is not None:
+        settings = dict(settings, store=store.root if isinstance(store, ReplayStore) else store)
+    pairings = []
+    for ruleset in rulesets:
+        pairings += [
+            (name1, logic1, name2, logic2, pairing_seed, dict(pairing_settings, ruleset=ruleset))
+            for name1, logic1, name2, logic2, pairing_seed, pairing_settings
+            in _pairings(bots, rounds, seed, settings)
+        ]
+    results = [play_pairing(pairing) for pairing in pairings] if executor is None else list(
+        executor.map(play_pairing, pairings))
+    _save_replays(results, store)
+    per_ruleset = len(results) // len(rulesets) if rulesets else 0
+    return {
+        ruleset.name: results[index * per_ruleset:(index + 1) * per_ruleset]
+        for index, ruleset in enumerate(rulesets)
+    }
+
+
+def batch_round_robin(bots, matches=100, seed=None, **settings):
+    """先攻・後攻入れ替えた全組み合わせを ``batch.BatchEngine`` で ``matches`` 試合ずつ行う。
+
+    ``batch_policy`` を持つボット（ルール表ボットなど）同士なら配列演算だけで進む。
+    戻り値は組み合わせごとの ``{"robot1", "robot2", "matches", "wins"}``（wins は robot1 の勝数）。
+    """
+    results = []
+    for index, (name1, name2) in enumerate(permutations(bots, 2)):
+        engine = play_batch(
+            bots[name1], bots[name2], matches, None if seed is None else child_seed(seed, index), **settings)
+        results.append({
+            "robot1": name1,
+            "robot2": name2,
+            "matches": matches,
+            "wins": int((engine.winner == 0).sum()),
+        })
+    return results
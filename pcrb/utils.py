@@ -1,20 +1,42 @@
+from collections.abc import Mapping
+
+
 def is_adjacent(actor, target):
     return abs(actor.x - target.x) + abs(actor.y - target.y) == 1
 
 
-def is_valid_memo(memo):
-    if not isinstance(memo, dict):
-        print("Memo is not a dictionary.")
-        return False
+def memo_error(memo):
+    """メモが規約（キーが文字列、値が int / float / str / None の辞書）に反していれば理由、そうでなければ None。
+
+    渡されたメモの行（読み取り専用の ``MappingProxyType``）をそのまま返すロボットもいるので、``Mapping`` なら受け付ける。
+    """
+    if not isinstance(memo, Mapping):
+        return "Memo is not a dictionary."
 
     for key, value in memo.items():
         # キーが文字列かを確認
         if not isinstance(key, str):
-            print(f"Key '{key}' is not a string.")
-            return False
+            return f"Key '{key}' is not a string."
         # バリューが数値（int, float）、None、または文字列かを確認
         if not (isinstance(value, (int, float, str)) or value is None):
-            print(f"Value '{value}' is not a valid type (int, float, str, or None).")
-            return False
+            return f"Value '{value}' is not a valid type (int, float, str, or None)."
+
+    return None
 
-    return True
\ No newline at end of file
+
+def validate_memo(memo):
+    """メモを検証し、辞書にコピーして返す（規約に反していれば ValueError）"""
+    if isinstance(memo, Mapping):
+        memo = dict(memo)
+    error = memo_error(memo)
+    if error is not None:
+        raise ValueError(f"Invalid memo from robot_logic: {error}")
+    return memo
+
+
+def is_valid_memo(memo):
+    error = memo_error(memo)
+    if error is not None:
+        print(error)
+        return False
+    return True
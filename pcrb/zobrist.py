@@ -0,0 +1,110 @@
+"""局面の Zobrist ハッシュ（64 ビット）。
+
+局面の各要素（ロボットの位置・HP・SP・スタン、行動フラグ・クールダウン、罠の座標）の値ごとに
+64 ビットの乱数（``key``）を割り当て、その XOR を局面のハッシュとする。値が変わったときは古い値と新しい値の
+乱数を XOR するだけでよいので、``Robot`` と ``RobotState`` は一度ハッシュを求めた後は書き換えのたびに O(1) で更新する。
+
+乱数は要素の番号と値から splitmix64 で計算するので（表に覚えないのでメモリは増えない）、
+プロセスや実行順によらず同じ局面は同じハッシュになる::
+
+    controller.state_hash()  # 両ロボットと手番の偶奇を合わせたハッシュ
+    GameController(hash_states=True)  # game_state の各ターンに "hash"（16 進文字列）を記録する
+"""
+import struct
+
+MASK = (1 << 64) - 1
+
+# ハッシュに含める要素（snapshot.RobotSnapshot のフィールド名。traps は座標ごとに "trap"）
+FIELDS = (
+    "x", "y", "hp", "sp", "stun_counter",
+    "defend_active", "parry_active", "parry_cooldown",
+    "camouflage_active", "camouflage_remaining", "camouflage_last_position",
+    "scan_active", "scan_remaining",
+)
+
+
+_GAMMA = 0x9E3779B97F4A7C15
+_NONE = 0x5A5A5A5A5A5A5A5A  # None（カモフラージュの記録位置がない）の値
+_FLOAT = 0xF10A7F10A7F10A7F  # 整数でない float の値に混ぜる
+
+
+def _mix(value):
+    """splitmix64 の攪拌（64 ビットの全単射）"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK
+    return value ^ (value >> 31)
+
+
+def _bits(value):
+    """値を 64 ビットの整数にする（bool・int・float・None・それらのタプル）"""
+    if value is None:
+        return _NONE
+    if type(value) is tuple:
+        bits = len(value)
+        for item in value:
+            bits = _mix((bits * _GAMMA + _bits(item)) & MASK)
+        return bits
+    if type(value) is float:
+        if not value.is_integer():
+            return struct.unpack("<Q", struct.pack("<d", value))[0] ^ _FLOAT
+        value = int(value)  # 防御で 90.0 になった HP も 90 と同じ値にする
+    return value & MASK
+
+
+class _Keys:
+    """要素 1 つの値 → 乱数（``keys[value]``）"""
+    __slots__ = ("salt",)
+
+    def __init__(self, index):
+        self.salt = _mix((index + 1) * _GAMMA & MASK)
+
+    def __getitem__(self, value):
+        return _mix(self.salt ^ (_bits(value) * _GAMMA & MASK))
+
+
+KEYS = {field: _Keys(index) for index, field in enumerate(FIELDS + ("trap",))}
+_TRAP_KEYS = KEYS["trap"]
+
+_PARITY = _mix(len(KEYS) * _GAMMA & MASK)
+
+
+def key(field, value):
+    """要素 ``field`` が ``value`` であることを表す乱数"""
+    return KEYS[field][value]
+
+
+def trap_hash(traps):
+    """罠の座標の集まりのハッシュ"""
+    value = 0
+    for position in traps:
+        value ^= _TRAP_KEYS[position]
+    return value
+
+
+def snapshot_hash(snapshot):
+    """ロボット 1 体の状態（``snapshot.RobotSnapshot``）のハッシュを最初から計算する"""
+    value = trap_hash(snapshot.traps)
+    for field in FIELDS:
+        value ^= KEYS[field][getattr(snapshot, field)]
+    return value
+
+
+def combine(hash1, hash2, turn):
+    """robot1 / robot2 のハッシュと手番の偶奇から局面のハッシュを作る（robot2 側は 32 ビット回転して区別する）"""
+    value = hash1 ^ ((hash2 << 32 | hash2 >> 32) & MASK)
+    return value ^ _PARITY if turn & 1 else value
+
+
+def to_hex(value):
+    """replay に記録する形（JSON の数値では 64 ビットを表せないので 16 進文字列）"""
+    return f"{value:016x}"
+
+
+def first_divergence(game_state1, game_state2):
+    """``"hash"`` を記録した 2 つの game_state で局面が最初に食い違うターン（同じなら None）"""
+    for entry1, entry2 in zip(game_state1[1:], game_state2[1:]):
+        if entry1.get("hash") != entry2.get("hash"):
+            return entry1["turn"]
+    if len(game_state1) != len(game_state2):
+        return min(len(game_state1), len(game_state2)) - 1
+    return None
@@ -0,0 +1,72 @@
+import json
+import sys
+import time
+
+import pytest
+
+sys.path.append('./pcrb')
+
+from actiontrace import ActionTrace, TraceReplayer
+from clock import TimeControl
+from controller import GameController
+from replay import dumps, load_replay
+from robot import Robot
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from robots.robot_09_trapster import robot_logic as trapster_logic
+from robots.robot_11_phantom_Jumper import robot_logic as jumper_logic
+
+
+def counting_logic(robot, game_info, memos):
+    count = memos[-1]["count"] + 1 if len(memos) else 0
+    return ("attack" if game_info["turn"] % 3 == 0 else "left"), {"count": count, "note": "left" if count % 2 else None}
+
+
+def play(logic1, logic2, **settings):
+    controller = GameController(headless=True, seed=4, max_turn=80, **settings)
+    controller.set_robots(Robot("Robot A", 1, 3, logic1, controller), Robot("Robot B", 6, 3, logic2, controller))
+    controller.game_loop()
+    return controller
+
+
+@pytest.mark.parametrize("simultaneous", [False, True])
+@pytest.mark.parametrize("logic1, logic2", [
+    (jumper_logic, trapster_logic),
+    (adaptive_logic, counting_logic),
+])
+def test_trace_replays_the_match_without_the_bots(logic1, logic2, simultaneous):
+    controller = play(logic1, logic2, simultaneous=simultaneous)
+    trace = ActionTrace.from_dict(json.loads(json.dumps(ActionTrace.from_controller(controller).to_dict())))
+
+    replayer = TraceReplayer(trace)
+    game_state = replayer.run()
+    assert dumps(game_state[1:]) == dumps(controller.game_state[1:])
+    assert replayer.controller.memos2 == controller.memos2
+    assert len(json.dumps(trace.to_dict())) * 5 < len(dumps(controller.game_state))
+
+
+def test_seek_rebuilds_any_turn():
+    controller = play(jumper_logic, trapster_logic)
+    replayer = TraceReplayer(ActionTrace.from_controller(controller))
+    turn = len(controller.game_state) - 5
+    assert replayer.seek(turn).game_state[-1] == controller.game_state[turn + 1]
+    snapshot = replayer.controller.snapshot()
+    assert replayer.seek(3).game_state[-1] == controller.game_state[4]
+    assert replayer.seek(turn).snapshot() == snapshot
+
+
+def test_trace_file_is_read_as_a_replay(tmp_path):
+    controller = play(adaptive_logic, trapster_logic)
+    path = tmp_path / "match.trace.json"
+    path.write_text(json.dumps(ActionTrace.from_controller(controller).to_dict()))
+    assert dumps(load_replay(path)[1:]) == dumps(controller.game_state[1:])
+
+
+def test_forfeit_by_time_out_is_replayed():
+    def slow_logic(robot, game_info, memos):
+        time.sleep(0.01)
+        return "rest"
+
+    controller = play(adaptive_logic, slow_logic, time_control=TimeControl(move_limit=0.005, penalty="forfeit"))
+    assert controller.game_state[-1]["robots"][1]["hp"] == 0
+    game_state = ActionTrace.from_controller(controller).replay()
+    assert dumps(game_state[1:]) == dumps(controller.game_state[1:])
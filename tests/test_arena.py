@@ -0,0 +1,119 @@
+import sys
+import time
+
+sys.path.append('./pcrb')
+
+from arena import Arena
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_06_tactician import robot_logic as tactician_logic
+from robots.robot_07_basic_bot import robot_logic as basic_logic
+
+
+def returns(action):
+    def robot_logic(robot, game_info, memos):
+        return action
+    return robot_logic
+
+
+def test_attack_targets_enemy_not_ally():
+    arena = Arena(headless=True, seed=1)
+    attacker = arena.add_robot("A1", 4, 3, returns("attack"), team="A")
+    ally = arena.add_robot("A2", 3, 3, returns("rest"), team="A")
+    enemy = arena.add_robot("B1", 5, 3, returns("rest"), team="B")
+    arena.turn = 1
+    arena.resolve_action(attacker, "attack")
+    assert ally.hp == 100
+    assert enemy.hp == 80
+
+
+def test_lowest_hp_enemy_in_range_is_targeted():
+    arena = Arena(headless=True, seed=1)
+    shooter = arena.add_robot("A", 4, 3, returns("ranged_attack"))
+    healthy = arena.add_robot("B", 4, 1, returns("rest"))
+    wounded = arena.add_robot("C", 6, 3, returns("rest"))
+    adjacent = arena.add_robot("D", 4, 4, returns("rest"))
+    wounded._hp = 50
+    arena.resolve_action(shooter, "ranged_attack")
+    assert (healthy.hp, wounded.hp, adjacent.hp) == (100, 35, 100)
+
+
+def test_no_enemy_in_range_costs_nothing():
+    arena = Arena(headless=True, seed=1)
+    robot = arena.add_robot("A", 0, 0, returns("attack"))
+    arena.add_robot("B", 8, 6, returns("rest"))
+    arena.resolve_action(robot, "attack")
+    assert robot.sp == 50
+
+
+def test_game_info_lists_each_enemy_and_ally():
+    arena = Arena(headless=True, seed=1)
+    robot = arena.add_robot("A1", 1, 1, returns("rest"), team="A")
+    arena.add_robot("A2", 1, 2, returns("rest"), team="A")
+    arena.add_robot("B1", 7, 5, returns("rest"), team="B")
+    arena.add_robot("B2", 3, 1, returns("rest"), team="B")
+    info = arena.build_game_info(robot)
+    assert [enemy["name"] for enemy in info["enemies"]] == ["B1", "B2"]
+    assert [ally["name"] for ally in info["allies"]] == ["A2"]
+    assert "sp" not in info["enemies"][0]
+    # 2 体用のロボット向けに最も近い敵の情報も入る
+    assert info["enemy_position"] == (3, 1)
+
+
+def test_trap_hurts_enemies_only():
+    arena = Arena(headless=True, seed=1)
+    owner = arena.add_robot("A1", 4, 3, returns("rest"), team="A")
+    ally = arena.add_robot("A2", 0, 0, returns("rest"), team="A")
+    enemy = arena.add_robot("B1", 8, 6, returns("rest"), team="B")
+    owner.trap("trap_right", 1)
+    ally.set_position(5, 3)
+    arena.check_trap(ally)
+    assert ally.hp == 100
+    ally.set_position(0, 0)
+    enemy.set_position(5, 3)
+    arena.check_trap(enemy)
+    assert enemy.hp == 75
+    assert not arena.board.has_trap(5, 3)
+
+
+def test_free_for_all_runs_until_one_team_is_left():
+    def play(seed):
+        arena = Arena(max_turn=2000, headless=True, seed=seed)
+        arena.add_robot("Walker", 0, 0, random_walker_logic)
+        arena.add_robot("Tactician", 8, 0, tactician_logic)
+        arena.add_robot("Basic 1", 0, 6, basic_logic)
+        arena.add_robot("Basic 2", 8, 6, basic_logic)
+        winner, game_state = arena.game_loop()
+        return winner, game_state, bytes(arena.action_codes)
+
+    result = play(3)
+    assert result == play(3)
+    winner, game_state, _ = result
+    survivors = [robot["name"] for robot in game_state[-1]["robots"] if robot["hp"] > 0]
+    assert winner in survivors
+    assert len(survivors) == 1 or game_state[-1]["turn"] == 1998
+
+
+def test_fallen_robot_leaves_the_board_and_turn_order():
+    arena = Arena(max_turn=20, headless=True, seed=1)
+    attacker = arena.add_robot("A1", 4, 3, returns("attack"), team="A")
+    victim = arena.add_robot("B1", 5, 3, returns("rest"), team="B")
+    arena.add_robot("B2", 8, 6, returns("rest"), team="B")
+    victim._hp = 20
+    winner, game_state = arena.game_loop()
+    assert not victim.is_alive() and attacker.hp == 100
+    assert not arena.board.is_occupied(5, 3)
+    assert [entry["action"]["robot_name"] for entry in game_state[2:5]] == ["A1", "B2", "A1"]
+    assert winner == "A"  # HP 合計 100 同士なら登録順で先の A
+
+
+def test_turn_cost_grows_at_most_linearly():
+    def turns_per_second(count):
+        arena = Arena(max_turn=401, x_max=60, y_max=60, headless=True, seed=1)
+        for index in range(count):
+            arena.add_robot(f"R{index}", (index * 7) % 60, (index * 13) % 60, returns("attack"))
+        start = time.perf_counter()
+        arena.game_loop()
+        return 400 / (time.perf_counter() - start)
+
+    # game_info の敵リストと記録は O(N)、対象選択と罠判定は N によらない（総当たりなら 100 倍）
+    assert turns_per_second(40) > turns_per_second(4) / 40
@@ -0,0 +1,99 @@
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append('./pcrb')
+
+from actions import ACTIONS
+from batch import BatchEngine, play_batch
+from constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
+from controller import GameController
+from robot import Robot
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_04_defensive import robot_logic as defensive_logic
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from robots.robot_07_basic_bot import robot_logic as basic_logic
+from robots.robot_09_trapster import robot_logic as trapster_logic
+from robots.robot_10_energy_thief import robot_logic as thief_logic
+from robots.robot_11_phantom_Jumper import robot_logic as phantom_logic
+from robots.robot_12_shadow_strategist import robot_logic as shadow_logic
+from robots.robot_13_strategic_scanner import robot_logic as scanner_logic
+from robots.robot_14_invictus import robot_logic as invictus_logic
+
+
+SEEDS = [0, 1, 2, 3, 4]
+
+PAIRINGS = [
+    (trapster_logic, adaptive_logic),
+    (adaptive_logic, trapster_logic),
+    (phantom_logic, basic_logic),
+    (shadow_logic, scanner_logic),
+    (scanner_logic, trapster_logic),
+    (thief_logic, defensive_logic),
+    (random_walker_logic, invictus_logic),
+    (invictus_logic, shadow_logic),
+]
+
+
+def reference(logic1, logic2, seed):
+    controller = GameController(headless=True, seed=seed)
+    controller.set_robots(
+        Robot(PLAYER_ROBOT_NAME, 1, 3, logic1, controller),
+        Robot(ENEMY_ROBOT_NAME, 7, 3, logic2, controller),
+    )
+    winner, game_state = controller.game_loop()
+    return winner.name, controller.snapshot(), bytes(controller.action_codes), game_state
+
+
+def assert_matches_controller(engine, logic1, logic2):
+    for row, seed in enumerate(engine.seeds):
+        winner, snapshot, codes, game_state = reference(logic1, logic2, seed)
+        assert engine.names[engine.winner[row]] == winner
+        assert engine.snapshot(row) == snapshot
+        assert engine.codes(row) == codes
+        assert engine.game_state(row) == game_state
+
+
+@pytest.mark.parametrize("logic1, logic2", PAIRINGS)
+def test_batch_matches_controller(logic1, logic2):
+    engine = BatchEngine(len(SEEDS), seeds=SEEDS, record=True)
+    engine.run(logic1, logic2)
+    assert_matches_controller(engine, logic1, logic2)
+
+
+REST, ATTACK = ACTIONS.code("rest"), ACTIONS.code("attack")
+UP, DOWN, LEFT, RIGHT = (ACTIONS.code(name) for name in ("up", "down", "left", "right"))
+
+
+def basic_policy(obs):
+    distance = np.abs(obs.x - obs.enemy_x) + np.abs(obs.y - obs.enemy_y)
+    move = np.where(obs.x < obs.enemy_x, RIGHT, np.where(
+        obs.x > obs.enemy_x, LEFT, np.where(obs.y < obs.enemy_y, DOWN, UP)))
+    codes = np.where(distance == 1, ATTACK, move)
+    return np.where(obs.sp < 15, REST, codes)
+
+
+def test_vectorized_policy_matches_robot_logic():
+    def vector_basic(robot, game_info, memos):
+        return basic_logic(robot, game_info, memos)
+    vector_basic.batch_policy = basic_policy
+
+    engine = BatchEngine(len(SEEDS), seeds=SEEDS, record=True)
+    engine.run(vector_basic, shadow_logic)
+    assert_matches_controller(engine, basic_logic, shadow_logic)
+
+
+def test_invalid_action_raises():
+    with pytest.raises(ValueError):
+        BatchEngine(2).run(lambda robot, game_info, memos: "dance", basic_logic)
+
+
+def test_play_batch_derives_seeds():
+    first = play_batch(trapster_logic, phantom_logic, 6, seed=3)
+    second = play_batch(trapster_logic, phantom_logic, 6, seed=3)
+
+    assert first.seeds == second.seeds
+    assert len(set(first.seeds)) == 6
+    assert np.array_equal(first.hp, second.hp)
+    assert np.array_equal(first.turns, second.turns)
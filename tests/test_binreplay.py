@@ -0,0 +1,72 @@
+import json
+import sys
+
+import pytest
+
+sys.path.append('./pcrb')
+
+import binreplay
+from arena import Arena
+from binreplay import BinaryReplay
+from controller import GameController
+from replay import dumps, load_replay
+from robot import Robot
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from robots.robot_09_trapster import robot_logic as trapster_logic
+
+
+def play(simultaneous=False, **settings):
+    controller = GameController(headless=True, seed=2, max_turn=60, simultaneous=simultaneous, **settings)
+    robot1 = Robot("Robot A", 1, 3, adaptive_logic, controller)
+    robot2 = Robot("Robot B", 7, 3, trapster_logic, controller)
+    controller.set_robots(robot1, robot2)
+    return controller.game_loop()[1]
+
+
+@pytest.mark.parametrize("settings", [{}, {"simultaneous": True, "hash_states": True}])
+def test_round_trip_is_lossless(tmp_path, settings):
+    game_state = play(**settings)
+    path = tmp_path / "game.pcrb"
+    binreplay.write(path, game_state)
+
+    replay = BinaryReplay(path)
+    assert replay.extras == {}  # エンジンの出力はすべて列で表せる
+    assert dumps(replay.game_state()) == dumps(game_state)
+    assert dumps(load_replay(path)) == dumps(game_state)
+    assert dumps(load_replay(path.read_bytes())) == dumps(game_state)
+
+
+def test_columns_and_seeking(tmp_path):
+    game_state = play()
+    path = tmp_path / "game.pcrb"
+    binreplay.write(path, game_state)
+    replay = BinaryReplay(path)
+
+    hp = replay.column("hp")
+    assert not hp.flags.writeable and hp.shape == (len(game_state) - 1, 2)
+    assert hp[:, 1].tolist() == [entry["robots"][1]["hp"] for entry in game_state[1:]]
+    assert replay.header["settings"]["seed"] == 2
+    assert replay.at_turn(7) == game_state[8]
+    assert replay[-1] == game_state[-1]
+    with pytest.raises(KeyError):
+        replay.at_turn(10_000)
+
+
+def test_json_converter_keeps_unusual_entries(tmp_path):
+    arena = Arena(headless=True, seed=1, max_turn=30)
+    arena.add_robot("A1", 1, 3, adaptive_logic, team="A")
+    arena.add_robot("B1", 7, 3, random_walker_logic, team="B")
+    arena.add_robot("B2", 7, 5, random_walker_logic, team="B")
+    game_state = arena.game_loop()[1]
+    game_state[3] = dict(game_state[3], note="checked")  # 列にないキー
+    source = tmp_path / "game_state.json"
+    source.write_text(json.dumps(game_state, indent=4))
+
+    binreplay.from_json(source, tmp_path / "game.pcrb")
+    replay = BinaryReplay(tmp_path / "game.pcrb")
+    assert list(replay.extras) == [2]
+    assert replay.column("x").shape == (len(game_state) - 1, 3)
+
+    binreplay.to_json(tmp_path / "game.pcrb", tmp_path / "game_state.ndjson.gz")
+    assert load_replay(tmp_path / "game_state.ndjson.gz") == json.loads(json.dumps(game_state))
@@ -0,0 +1,72 @@
+import sys
+import random
+
+sys.path.append('./pcrb')
+
+from board import Board
+from robot import Robot
+from controller import GameController
+
+
+def robot_logic(robot, game_info, memos):
+    return "teleport"
+
+
+def test_board_index_tracks_robots_and_traps():
+    controller = GameController(x_max=5, y_max=4, headless=True)
+    robot1 = Robot("robot1", 0, 0, robot_logic, controller)
+    robot2 = Robot("robot2", 4, 3, robot_logic, controller)
+    controller.set_robots(robot1, robot2)
+
+    assert controller.is_position_occupied(0, 0)
+    assert controller.board.robot_at(4, 3) is robot2
+    assert not controller.is_position_occupied(1, 0)
+
+    robot1.move("right", 1)
+    assert not controller.is_position_occupied(0, 0)
+    assert controller.board.robot_at(1, 0) is robot1
+
+    robot1.trap("trap_down", 2)
+    assert controller.is_trap_at_position(1, 1)
+    assert controller.board.trap_owner(1, 1) is robot1
+    assert (1, 1) in robot1.trap.traps
+
+
+def test_random_free_cell_skips_occupied_cells():
+    board = Board(3, 2)
+    board.place("a", 0, 0)
+    board.place("b", 2, 1)
+    rng = random.Random(0)
+
+    cells = {board.random_free_cell(rng) for _ in range(200)}
+
+    assert cells == {(1, 0), (2, 0), (0, 1), (1, 1)}
+
+
+def test_teleport_lands_on_the_only_free_cell():
+    controller = GameController(x_max=3, y_max=1, headless=True)
+    robot1 = Robot("robot1", 0, 0, robot_logic, controller)
+    robot2 = Robot("robot2", 1, 0, robot_logic, controller)
+    controller.set_robots(robot1, robot2)
+
+    controller.run_logic(robot1)
+
+    assert robot1.position == (2, 0)
+    assert robot1.sp == 30
+    assert controller.board.robot_at(2, 0) is robot1
+    assert not controller.is_position_occupied(0, 0)
+
+
+def test_robots_at_distance_scans_only_the_ring():
+    board = Board(9, 7)
+    board.place("near", 4, 2)
+    board.place("ring_top", 4, 1)
+    board.place("ring_right", 6, 3)
+    board.place("ring_left", 3, 4)
+    board.place("far", 8, 6)
+    assert board.robots_at_distance(4, 3, 1) == ["near"]
+    assert board.robots_at_distance(4, 3, 2) == ["ring_top", "ring_right", "ring_left"]
+    assert board.robots_at_distance(0, 0, 1) == []
+
+    board.remove("near", 4, 2)
+    assert board.robots_at_distance(4, 3, 1) == []
@@ -4,6 +4,7 @@ sys.path.append('./pcrb')
 
 from robot import Robot
 from controller import GameController
+from sinks import NullSink  # game_log.txt などをリポジトリに書き出さない
 from pcrb.constants import PLAYER_ROBOT_NAME
 
 
@@ -18,7 +19,7 @@ def robot_logic(robot, game_info, memos):
 
 
 def test_camouflage():
-    controller = GameController()
+    controller = GameController(sink=NullSink())
 
     # ロボット1の初期位置
     robot1 = Robot(PLAYER_ROBOT_NAME, 1, 3, robot_logic, controller)
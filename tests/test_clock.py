@@ -0,0 +1,105 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append('./pcrb')
+
+from clock import ChessClock, TimeControl
+from constants import PLAYER_ROBOT_NAME
+from controller import GameController
+from pool import MatchContext
+from robot import Robot
+
+
+def returns(action):
+    def robot_logic(robot, game_info, memos):
+        return action
+    return robot_logic
+
+
+def slow_on(turns, action="attack", delay=0.05):
+    def robot_logic(robot, game_info, memos):
+        if game_info["turn"] in turns:
+            time.sleep(delay)
+        return action, {"turn": game_info["turn"]}
+    return robot_logic
+
+
+def play(logic1, logic2, **settings):
+    controller = GameController(headless=True, seed=1, **settings)
+    robot1 = Robot("Robot A", 3, 3, logic1, controller)
+    robot2 = Robot("Robot B", 4, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    winner, game_state = controller.game_loop()
+    return controller, winner, game_state
+
+
+def test_clock_bank_and_increment():
+    clock = ChessClock(TimeControl(bank=1.0, increment=0.5, move_limit=0.8))
+    assert clock.budget(0) == 0.8
+    assert not clock.charge(0, 0.6)
+    assert clock.remaining[0] == pytest.approx(0.9)
+    assert clock.charge(0, 0.85)  # 1 手の上限を超えた
+    assert clock.charge(0, 0.7)  # 持ち時間が尽きた
+    assert clock.remaining[0] == 0.5
+    assert clock.timeouts == [2, 0]
+    assert clock.calls == [3, 0]
+    with pytest.raises(ValueError):
+        TimeControl(penalty="explode")
+
+
+def test_calls_are_measured_without_time_control():
+    controller, _, game_state = play(returns("rest"), returns("rest"), max_turn=6, cycle_detection=False)
+    assert controller.clock.calls == [3, 2]
+    assert "clock" not in game_state[0]
+
+
+def test_default_penalty_replaces_the_action():
+    control = TimeControl(move_limit=0.02, penalty="default", default_action="defend")
+    controller, _, game_state = play(slow_on({3}), returns("rest"), max_turn=6, time_control=control)
+    assert [entry["action"]["action"] for entry in game_state[2:]] == ["attack", "rest", "defend", "rest", "attack"]
+    assert controller.memos1[1] == {}
+    assert game_state[0]["settings"]["time_control"]["move_limit"] == 0.02
+    clock = game_state[0]["clock"]
+    assert clock["Robot A"]["timeouts"] == 1 and clock["Robot B"]["timeouts"] == 0
+    assert clock["Robot A"]["longest"] >= 0.05
+
+
+def test_skip_penalty_does_nothing():
+    control = {"move_limit": 0.02, "penalty": "skip"}
+    controller, _, game_state = play(slow_on({1}), returns("rest"), max_turn=3, time_control=control)
+    assert game_state[2]["action"]["action"] is None
+    assert controller.action_codes[1] == 0
+    assert controller.robot2.hp == 100
+
+
+def test_forfeit_penalty_ends_the_match():
+    control = TimeControl(bank=0.03, penalty="forfeit")
+    controller, winner, game_state = play(returns("rest"), slow_on({2, 4}, action="rest", delay=0.02),
+                                          max_turn=50, time_control=control)
+    assert winner is controller.robot1
+    assert controller.robot2.hp == 0
+    assert game_state[-1]["turn"] == 4
+
+
+def test_executor_stops_waiting_after_the_budget():
+    control = TimeControl(move_limit=0.05, penalty="skip")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        start = time.perf_counter()
+        controller, _, game_state = play(
+            slow_on({1}, delay=0.5), returns("rest"), max_turn=2, simultaneous=True, executor=executor,
+            time_control=control)
+        elapsed = time.perf_counter() - start
+    assert elapsed < 0.4
+    assert [entry["action"] for entry in game_state[2]["actions"]] == [None, "rest"]
+    assert game_state[0]["clock"]["Robot A"]["timeouts"] == 1
+
+
+def test_context_switches_time_control():
+    context = MatchContext()
+    _, game_state = context.play(returns("rest"), returns("rest"), seed=1, time_control={"bank": 60})
+    assert game_state[0]["clock"][PLAYER_ROBOT_NAME]["calls"] == 50
+    _, game_state = context.play(returns("rest"), returns("rest"), seed=1)
+    assert "clock" not in game_state[0]
@@ -0,0 +1,60 @@
+import sys
+
+sys.path.append('./pcrb')
+
+from robot import Robot
+from controller import GameController
+from robots.robot_01_rest_only import robot_logic as rest_only_logic
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_04_defensive import robot_logic as defensive_logic
+from robots.robot_06_tactician import robot_logic as tactician_logic
+from robots.robot_08_defender_bot import robot_logic as defender_logic
+
+
+def counting(logic):
+    calls = []
+
+    def wrapper(robot, game_info, memos):
+        calls.append(game_info["turn"])
+        return logic(robot, game_info, memos)
+
+    wrapper.deterministic = getattr(logic, "deterministic", False)
+    wrapper.sp_horizon = getattr(logic, "sp_horizon", None)
+    return wrapper, calls
+
+
+def play(logic1, logic2, cycle_detection, max_turn=100):
+    controller = GameController(headless=True, seed=1, max_turn=max_turn, cycle_detection=cycle_detection)
+    robot1 = Robot("Robot A", 1, 3, logic1, controller)
+    robot2 = Robot("Robot B", 7, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    winner, game_state = controller.game_loop()
+    return winner.name, game_state, robot1.snapshot(), robot2.snapshot(), bytes(controller.action_codes)
+
+
+def test_stalemate_is_fast_forwarded_with_identical_result():
+    logic1, calls = counting(rest_only_logic)
+    fast = play(logic1, defensive_logic, True, max_turn=1000)
+
+    assert fast == play(rest_only_logic, defensive_logic, False, max_turn=1000)
+    assert len(fast[1]) == 1001
+    assert fast[1][-1]["turn"] == 999
+    assert len(calls) < 20
+
+
+def test_exact_cycle_matches_full_simulation():
+    assert play(tactician_logic, defender_logic, True) == play(tactician_logic, defender_logic, False)
+
+
+def test_undeclared_bots_are_simulated_every_turn():
+    logic1, calls = counting(random_walker_logic)
+    play(logic1, rest_only_logic, True)
+    assert len(calls) == 50
+
+
+def test_sp_drift_needs_declared_horizon():
+    logic1, calls = counting(rest_only_logic)
+    logic1.sp_horizon = None
+
+    assert play(logic1, defensive_logic, True) == play(rest_only_logic, defensive_logic, False)
+    assert len(calls) == 50
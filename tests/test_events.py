@@ -0,0 +1,84 @@
+import sys
+
+sys.path.append('./pcrb')
+
+import events
+from controller import GameController
+from events import EventLog
+from robot import Robot
+from sinks import BufferSink
+from tournament import round_robin
+
+
+def returns(action):
+    def robot_logic(robot, game_info, memos):
+        return action
+    return robot_logic
+
+
+def play(logic1, logic2, max_turn=10, **settings):
+    controller = GameController(max_turn=max_turn, seed=1, cycle_detection=False, **settings)
+    robot1 = Robot("Robot A", 3, 3, logic1, controller)
+    robot2 = Robot("Robot B", 4, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    winner, game_state = controller.game_loop()
+    return controller, game_state
+
+
+def test_headless_controller_records_events_only_on_request():
+    controller, game_state = play(returns("attack"), returns("rest"), headless=True)
+    assert controller.events is None
+    assert "events" not in game_state[0]
+
+    controller, game_state = play(returns("attack"), returns("rest"), headless=True, events=True)
+    counts = controller.events.counts()
+    assert counts == {"attack_hit": 5, "rest": 4}
+    summary = game_state[0]["events"]
+    assert summary["Robot A"]["damage_dealt"] == 100
+    assert summary["Robot B"]["damage_taken"] == 100
+    assert summary["Robot B"]["wasted_turns"] == 0
+
+
+def test_parry_stun_and_wasted_turns_are_counted():
+    controller, game_state = play(returns("attack"), returns("parry"), max_turn=6, headless=True, events=True)
+    summary = game_state[0]["events"]
+    assert summary["Robot A"]["stunned"] == 1
+    assert summary["Robot A"]["wasted_turns"] >= 1
+    assert summary["Robot A"]["damage_dealt"] == 20  # パリィを構える前の 1 回だけ
+
+
+def test_buffer_sink_renders_event_messages_lazily():
+    sink = BufferSink()
+    controller, _ = play(returns("attack"), returns("defend"), max_turn=4, sink=sink)
+    kinds = controller.events.column("kinds")
+    assert list(kinds) == [events.ATTACK_HIT, events.DEFEND, events.ATTACK_HIT]
+
+    messages = [message for _, message in sink.lines]
+    assert "Robot A attacks Robot B at (4, 3) for 20 damage." in messages
+    # 防御で軽減されたダメージは従来どおり float のまま書く
+    assert "Robot A attacks Robot B at (4, 3) for 10.0 damage." in messages
+    assert "Turn 3: Robot A attacks Robot B at (4, 3) for 10.0 damage.\n" in sink.text()
+
+
+def test_event_log_grows_and_builds_columns():
+    robot1 = Robot("Robot A", 1, 1, None, None)
+    robot2 = Robot("Robot B", 2, 1, None, None)
+    log = EventLog(capacity=2)
+    log.emit(1, events.MOVE, robot1, arg=events.DIRECTION_INDEX["right"], x=2, y=1, amount=100, extra=50)
+    log.emit(2, events.STEAL, robot2, robot1, amount=15)
+    log.emit(3, events.NO_SP, robot1, arg=events.ACTION_INDEX["ranged_attack"])
+    assert len(log) == 3 and log.capacity == 4
+
+    assert list(log.column("actors")) == [0, 1, 0]
+    assert list(log.column("targets")) == [-1, 0, -1]
+    assert list(log.column("amounts")) == [100.0, 15.0, 0.0]
+    assert log.message(0) == "Robot A moved right to (2, 1), HP: 100, SP: 50"
+    assert log.message(2) == "Robot A does not have enough SP to perform a ranged attack!"
+    assert log.summary()["Robot B"]["sp_stolen"] == 15
+
+
+def test_round_robin_results_include_event_summaries():
+    bots = {"attacker": returns("attack"), "rester": returns("rest")}
+    results = round_robin(bots, seed=3, max_turn=10, events=True)
+    assert all(len(result["events"]) == 2 for result in results)
+    assert all("events" not in result for result in round_robin(bots, seed=3, max_turn=10))
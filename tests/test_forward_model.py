@@ -0,0 +1,71 @@
+import sys
+
+sys.path.append('./pcrb')
+
+from robot import Robot
+from controller import GameController
+from robots.robot_09_trapster import robot_logic as trapster_logic
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+
+
+def make_controller(logic1, logic2, **kwargs):
+    controller = GameController(headless=True, **kwargs)
+    robot1 = Robot("Robot A", 1, 3, logic1, controller)
+    robot2 = Robot("Robot B", 7, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    return controller
+
+
+def play_turns(controller, turns):
+    actions = []
+    for _ in range(turns):
+        robot = controller.robot1 if controller.turn % 2 != 0 else controller.robot2
+        response = robot.robot_logic(robot, controller.build_game_info(robot), [])
+        actions.append(response if isinstance(response, str) else response[0])
+        controller.run_logic(robot)
+        controller.turn += 1
+    return actions
+
+
+def test_snapshot_restore_roundtrip():
+    controller = make_controller(trapster_logic, adaptive_logic)
+    play_turns(controller, 6)
+    snapshot = controller.snapshot()
+
+    play_turns(controller, 5)
+    assert controller.snapshot() != snapshot
+
+    controller.restore(snapshot)
+    assert controller.snapshot() == snapshot
+    assert controller.board.robot_at(*controller.robot1.position) is controller.robot1
+    hash(snapshot.robot1)
+
+
+def test_simulate_matches_real_play_without_touching_live_match():
+    live = make_controller(trapster_logic, adaptive_logic, seed=7)
+    start = live.snapshot()
+
+    reference = make_controller(trapster_logic, adaptive_logic, seed=7)
+    actions = play_turns(reference, 12)
+
+    predicted = live.simulate(actions)
+
+    assert live.snapshot() == start
+    assert live.game_state[-1]["turn"] == 0
+    assert predicted == reference.snapshot()
+
+
+def test_forward_model_is_offered_to_robot_logic():
+    seen = []
+
+    def lookahead_logic(robot, game_info, memos):
+        model = game_info["forward_model"]
+        after = model.simulate(["right"])
+        seen.append((model.snapshot.robot1.x, after.robot1.x))
+        return "right"
+
+    controller = make_controller(lookahead_logic, adaptive_logic, forward_model=True)
+    controller.run_logic(controller.robot1)
+
+    assert seen == [(1, 2)]
+    assert controller.robot1.x == 2
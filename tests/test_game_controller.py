@@ -4,6 +4,7 @@ sys.path.append('./pcrb')
 
 from robot import Robot
 from controller import GameController
+from sinks import NullSink  # game_log.txt などをリポジトリに書き出さない
 
 
 def robot_logic_a(robot, game_info, memos=None):
@@ -15,7 +16,7 @@ def robot_logic_b(robot, game_info, memos=None):
 
 
 def test_adjust_action():
-    controller = GameController(max_turn=100, x_max=9, y_max=7)
+    controller = GameController(max_turn=100, x_max=9, y_max=7, sink=NullSink())
 
     robot1 = Robot("robot1", 0, 0, robot_logic_a, controller)
     robot2 = Robot("robot2", 0, 1, robot_logic_a, controller)
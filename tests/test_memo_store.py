@@ -0,0 +1,120 @@
+import sys
+import pickle
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+sys.path.append('./pcrb')
+
+from controller import GameController
+from memo import MemoStore
+from robot import Robot
+
+
+def test_store_reads_like_a_list():
+    store = MemoStore()
+    store.append({"a": 1, "b": "x"})
+    store.append({})
+    store.append({"b": None, "c": 2.5})
+    assert len(store) == 3
+    assert store == [{"a": 1, "b": "x"}, {}, {"b": None, "c": 2.5}]
+    assert store[-1] == {"b": None, "c": 2.5}
+    assert list(store[-1]) == ["b", "c"]
+    assert store[1:] == [{}, {"b": None, "c": 2.5}]
+    with pytest.raises(IndexError):
+        store[3]
+
+
+def test_invalid_memos_are_rejected():
+    store = MemoStore()
+    for memo in ({1: "a"}, {"a": [1]}, ["a"]):
+        with pytest.raises(ValueError):
+            store.append(memo)
+    assert len(store) == 0
+
+
+def test_limit_keeps_recent_memos_and_drops_unused_keys():
+    store = MemoStore(limit=4)
+    for turn in range(100):
+        store.append({f"key{turn}": turn})
+    assert 4 <= len(store) < 8
+    assert store.total == 100
+    assert store[-1] == {"key99": 99}
+    assert len(store._columns) == len(store)
+    assert len(store._shape_keys) == len(store)
+
+
+def test_view_is_read_only_window():
+    store = MemoStore()
+    view = store.view(window=2)
+    assert len(view) == 0
+    for turn in range(5):
+        store.append({"turn": turn})
+    assert view == [{"turn": 3}, {"turn": 4}]
+    assert view[0] == {"turn": 3}
+    with pytest.raises(TypeError):
+        view[0]["turn"] = 10
+    assert not hasattr(view, "append")
+    copied = pickle.loads(pickle.dumps(view))
+    assert copied == view
+    store.append({"turn": 5})
+    assert copied[-1] == {"turn": 4}
+
+
+def test_controller_passes_views_to_robots():
+    seen = []
+
+    def recording(robot, game_info, memos):
+        seen.append(len(memos))
+        return "rest", {"turn": game_info["turn"]}
+    recording.memo_window = 2
+
+    def reckless(robot, game_info, memos):
+        return "rest", {"position": robot.position}
+
+    controller = GameController(headless=True, seed=1, max_turn=8)
+    controller.set_robots(
+        Robot("Robot A", 1, 3, recording, controller),
+        Robot("Robot B", 7, 3, lambda robot, game_info, memos: "rest", controller),
+    )
+    controller.game_loop()
+    assert seen == [0, 1, 2, 2]
+    assert controller.memos1[-1] == {"turn": 7}
+
+    controller = GameController(headless=True, seed=1)
+    robot = Robot("Robot A", 1, 3, reckless, controller)
+    controller.set_robots(robot, Robot("Robot B", 7, 3, reckless, controller))
+    with pytest.raises(ValueError):
+        controller.run_logic(robot)
+
+
+def test_robot_can_return_its_last_memo():
+    def echo(robot, game_info, memos):
+        # 渡された読み取り専用の行をそのまま返す
+        return "rest", memos[-1] if memos else {"count": 0}
+
+    controller = GameController(headless=True, seed=1, max_turn=6)
+    controller.set_robots(Robot("Robot A", 1, 3, echo, controller), Robot("Robot B", 7, 3, echo, controller))
+    controller.game_loop()
+    assert list(controller.memos1) == [{"count": 0}] * 3
+    with pytest.raises(ValueError):
+        MemoStore().append(MappingProxyType({"bad": [1]}))
+
+
+def remembers(robot, game_info, memos):
+    return "rest", {"seen": len(memos), "turn": game_info["turn"]}
+
+
+remembers.memo_window = 3
+
+
+def test_process_executor_receives_only_the_window():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        controller = GameController(headless=True, seed=1, simultaneous=True, max_turn=10, executor=executor)
+        controller.set_robots(
+            Robot("Robot A", 1, 3, remembers, controller),
+            Robot("Robot B", 7, 3, remembers, controller),
+        )
+        controller.game_loop()
+    assert [memo["seen"] for memo in controller.memos1] == [0, 1, 2, 3, 3, 3, 3, 3, 3]
@@ -4,6 +4,7 @@ sys.path.append('./pcrb')
 
 from robot import Robot
 from controller import GameController
+from sinks import NullSink  # game_log.txt などをリポジトリに書き出さない
 
 
 def robot_logic1(robot, game_info, memos=None):
@@ -44,7 +45,7 @@ def robot_logic2(robot, game_info, memos=None):
 
 
 def test():
-    controller = GameController(max_turn=100, x_max=9, y_max=7)
+    controller = GameController(max_turn=100, x_max=9, y_max=7, sink=NullSink())
 
     robot1 = Robot("robot1", 0, 0, robot_logic1, controller)
     robot2 = Robot("robot2", 0, 1, robot_logic2, controller)
@@ -0,0 +1,120 @@
+import sys
+import pickle
+
+import pytest
+
+sys.path.append('./pcrb')
+
+from controller import GameController
+from observation import GameInfo, RobotView
+from robot import Robot
+from ruleset import DEFAULT_RULESET
+
+
+def rest(robot, game_info, memos):
+    return "rest"
+
+
+def setup(**settings):
+    controller = GameController(headless=True, seed=1, **settings)
+    robot1 = Robot("Robot A", 1, 3, rest, controller)
+    robot2 = Robot("Robot B", 7, 3, rest, controller)
+    controller.set_robots(robot1, robot2)
+    return controller, robot1, robot2
+
+
+def test_game_info_reads_like_the_old_dict():
+    controller, robot1, robot2 = setup()
+    info = controller.build_game_info(robot1)
+    assert isinstance(info, GameInfo)
+    assert dict(info) == {
+        "turn": 1, "enemy_hp": 100, "enemy_position": (7, 3), "max_turn": 100,
+        "board_size": {"x_max": 9, "y_max": 7},
+    }
+    assert info["board_size"]["x_max"] == 9
+    assert info.enemy_position == (7, 3)
+    assert "enemy_sp" not in info
+    assert info.get("enemy_traps", []) == []
+    with pytest.raises(KeyError):
+        info["enemy_sp"]
+    with pytest.raises(TypeError):
+        info["turn"] = 5
+
+
+def test_game_info_is_updated_in_place():
+    controller, robot1, robot2 = setup()
+    info = controller.build_game_info(robot1)
+    robot2.start_turn()
+    robot2.trap("trap_left", 2)
+    robot1.start_turn()
+    robot1.scan(3)
+    controller.turn = 3
+    assert controller.build_game_info(robot1) is info
+    assert info["turn"] == 3
+    assert info["enemy_sp"] == robot2.sp
+    assert list(info["enemy_traps"]) == list(robot2.state.traps) == [(6, 3)]
+    assert controller.build_game_info(robot2) is not info
+
+
+def test_robot_view_is_read_only():
+    controller, robot1, _ = setup()
+    view = controller.robot_views[0]
+    assert isinstance(view, RobotView)
+    assert (view.name, view.hp, view.sp, view.position) == ("Robot A", 100, 50, (1, 3))
+    assert view.attack.cost == DEFAULT_RULESET.attack.cost
+    assert view.parry.cooldown_counter == 0 and not view.scan.is_active
+    with pytest.raises(AttributeError):
+        view.sp = 1000
+    with pytest.raises(AttributeError):
+        view.parry.is_active = True
+    with pytest.raises(AttributeError):
+        view.attack.use_sp
+    with pytest.raises(TypeError):
+        view.attack(view, 1)
+    assert not hasattr(view, "controller")
+    robot1.rest(1)
+    assert view.sp == robot1.sp
+
+
+def test_robot_view_follows_ruleset():
+    cheap = DEFAULT_RULESET.variant(name="cheap", attack={"cost": 3})
+    controller, robot1, _ = setup(ruleset=cheap)
+    assert controller.robot_views[0].attack.cost == 3
+
+
+def test_bots_cannot_mutate_engine_state():
+    def cheater(robot, game_info, memos):
+        for attempt in (
+                lambda: setattr(robot, "hp", 1000), lambda: robot.move(robot, 1, "right"),
+                lambda: setattr(game_info, "enemy_hp", 0), lambda: setattr(game_info, "_enemy_hp", 0),
+                lambda: robot.parry.state_fields.clear()):
+            with pytest.raises((AttributeError, TypeError)):
+                attempt()
+        # ロボット・コントローラ・ルールは属性としては持たない
+        model = game_info["forward_model"]
+        for obj in (robot, robot.parry, game_info, model):
+            assert not any(isinstance(getattr(obj, name, None), (Robot, GameController)) for name in dir(obj))
+        for name in ("_robot", "_rule", "_controller", "_enemy_hp"):
+            assert not hasattr(robot, name) and not hasattr(robot.parry, name)
+            assert not hasattr(game_info, name) and not hasattr(model, name)
+        return "rest"
+
+    controller = GameController(headless=True, seed=1, max_turn=3, forward_model=True)
+    controller.set_robots(Robot("Robot A", 1, 3, cheater, controller), Robot("Robot B", 7, 3, rest, controller))
+    controller.game_loop()
+
+
+def test_pickled_observations_are_snapshots():
+    cheap = DEFAULT_RULESET.variant(name="cheap", attack={"cost": 3})
+    controller, robot1, robot2 = setup(ruleset=cheap)
+    robot1.start_turn()
+    robot1.scan(1)
+    info = controller.build_game_info(robot1)
+    copied_info = pickle.loads(pickle.dumps(info))
+    assert copied_info["enemy_traps"] == []
+    assert dict(copied_info, enemy_traps=None) == dict(info, enemy_traps=None)
+    view = pickle.loads(pickle.dumps(controller.robot_views[0]))
+    assert (view.name, view.sp, view.position) == ("Robot A", robot1.sp, (1, 3))
+    assert view.scan.is_active and view.attack.cost == 3
+    robot1.rest(2)
+    assert view.sp != robot1.sp
@@ -4,10 +4,11 @@ sys.path.append('./pcrb')
 
 from robot import Robot
 from controller import GameController
+from sinks import NullSink  # game_log.txt などをリポジトリに書き出さない
 
 
 def test():
-    controller = GameController(max_turn=100, x_max=9, y_max=7)
+    controller = GameController(max_turn=100, x_max=9, y_max=7, sink=NullSink())
 
     robot = Robot("Alpha", 0, 0, None, controller)
     target = Robot("TargetDummy", 0, 1, None, controller)
@@ -0,0 +1,56 @@
+import sys
+
+sys.path.append('./pcrb')
+
+from robot import Robot
+from controller import GameController
+from pool import MatchPool, worker_pool
+from tournament import round_robin
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from robots.robot_09_trapster import robot_logic as trapster_logic
+
+
+def fresh_game(logic1, logic2, seed):
+    controller = GameController(headless=True, seed=seed)
+    robot1 = Robot("Robot A", 1, 3, logic1, controller)
+    robot2 = Robot("Robot B", 7, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    winner, game_state = controller.game_loop()
+    return winner.name, game_state
+
+
+def test_reused_context_matches_fresh_controller(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    pool = MatchPool()
+
+    with pool.context() as context:
+        first = context.play(trapster_logic, adaptive_logic, "Robot A", "Robot B", seed=1)
+        first = (first[0].name, first[1])
+        second = context.play(adaptive_logic, trapster_logic, "Robot A", "Robot B", seed=2)
+        second = (second[0].name, second[1])
+        assert context.matches_played == 2
+
+    assert first == fresh_game(trapster_logic, adaptive_logic, 1)
+    assert second == fresh_game(adaptive_logic, trapster_logic, 2)
+    assert first[1] is not second[1]
+    assert list(tmp_path.iterdir()) == []
+    assert capsys.readouterr().out == ""
+
+
+def test_pool_reuses_context_per_settings():
+    pool = MatchPool()
+    with pool.context(max_turn=50) as context:
+        pass
+
+    assert pool.acquire(max_turn=50) is context
+    assert pool.acquire(max_turn=60) is not context
+
+
+def test_worker_pool_round_robin():
+    bots = {"adaptive": adaptive_logic, "trapster": trapster_logic}
+    results = round_robin(bots, rounds=2)
+
+    assert len(results) == 4
+    assert {(r["robot1"], r["robot2"]) for r in results} == {("adaptive", "trapster"), ("trapster", "adaptive")}
+    assert all(r["winner"] in bots for r in results)
+    assert worker_pool() is worker_pool()
@@ -0,0 +1,75 @@
+import sys
+
+sys.path.append('./pcrb')
+
+import pytest
+
+from actions import ACTIONS, Action
+from registry import ActionRegistry, NONE_CODE, STUN_CODE
+from robot import Robot
+import controller as controller_module
+from controller import GameController
+
+
+def test_every_action_has_unique_byte_code():
+    names = ACTIONS.names()
+    codes = [ACTIONS.code(name) for name in names]
+
+    assert len(set(codes)) == len(codes)
+    assert all(STUN_CODE < code <= 0xFF for code in codes)
+    assert ACTIONS.code(None) == NONE_CODE
+    assert ACTIONS.code("stun") == STUN_CODE
+    for name in ["attack", "up", "trap_left", "ranged_attack", "scan"]:
+        assert name in ACTIONS
+
+
+def test_encode_decode_roundtrip():
+    actions = [None, "right", "attack", "stun", "trap_down", "rest"]
+    data = ACTIONS.encode(actions)
+
+    assert len(data) == len(actions)
+    assert ACTIONS.decode(data) == actions
+
+
+def test_new_action_registers_without_controller_changes(monkeypatch):
+    # 既存の行動を同じコードで登録した registry に新しい行動を足し、コントローラの参照だけを差し替える
+    registry = ActionRegistry()
+    for attr in dict.fromkeys(spec.attr for spec in ACTIONS):
+        registry.register(type(ACTIONS.rule(attr)))
+    calls = []
+
+    class Shout(Action):
+        action_names = ()
+        robot_attr = "shout"
+
+        def __call__(self, actor, turn):
+            calls.append((actor.name, turn))
+
+    Shout.action_names = ("shout",)  # グローバルの ACTIONS には登録しない
+    registry.register(Shout)
+    monkeypatch.setattr(controller_module, "ACTIONS", registry)
+
+    controller = GameController(headless=True, max_turn=3, cycle_detection=False)
+    robot1 = Robot("robot1", 1, 3, lambda robot, game_info, memos: "shout", controller)
+    robot2 = Robot("robot2", 7, 3, lambda robot, game_info, memos: "rest", controller)
+    controller.set_robots(robot1, robot2)
+    _, game_state = controller.game_loop()
+
+    assert calls == [("robot1", 1)]
+    assert [entry["action"]["action"] for entry in game_state[1:]] == [None, "shout", "rest"]
+    assert registry.decode(controller.action_codes) == [None, "shout", "rest"]
+    assert registry.code("shout") == len(ACTIONS.names()) + 2
+    with pytest.raises(ValueError):
+        controller.resolve_action(robot1, robot2, "unknown")
+
+
+def test_controller_records_action_codes():
+    controller = GameController(headless=True)
+    robot1 = Robot("robot1", 0, 0, lambda robot, game_info, memos: "right", controller)
+    robot2 = Robot("robot2", 5, 5, lambda robot, game_info, memos: "rest", controller)
+    controller.set_robots(robot1, robot2)
+
+    action, _ = controller.run_logic(robot1)
+    controller.save_game_state(robot1.name, action)
+
+    assert ACTIONS.decode(controller.action_codes) == [None, "right"]
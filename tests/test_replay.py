@@ -0,0 +1,73 @@
+import gzip
+import io
+import json
+import sys
+
+sys.path.append('./pcrb')
+
+import replay
+from clock import TimeControl
+from controller import GameController
+from replay import ReplayWriter, iter_replay, load_replay
+from robot import Robot
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from sinks import FileSink
+
+
+def play(tmp_path, state_path, **settings):
+    sink = FileSink(str(tmp_path / "game_log.txt"), state_path)
+    controller = GameController(sink=sink, seed=2, max_turn=30, **settings)
+    robot1 = Robot("Robot A", 1, 3, adaptive_logic, controller)
+    robot2 = Robot("Robot B", 7, 3, random_walker_logic, controller)
+    controller.set_robots(robot1, robot2)
+    winner, game_state = controller.game_loop()
+    return json.loads(json.dumps(game_state))
+
+
+def test_file_sink_streams_turns_and_final_header(tmp_path):
+    path = tmp_path / "game_state.ndjson"
+    game_state = play(tmp_path, str(path), events=True, time_control=TimeControl(bank=10))
+
+    lines = path.read_text().splitlines()
+    assert len(lines) == len(game_state) + 1
+    assert "clock" not in json.loads(lines[0])
+    assert set(json.loads(lines[-1])[replay.FINAL]) == {"clock", "events"}
+    assert load_replay(path) == game_state
+
+
+def test_gzip_and_in_memory_sources(tmp_path):
+    path = tmp_path / "game_state.ndjson.gz"
+    game_state = play(tmp_path, str(path))
+    with gzip.open(path, "rt") as f:
+        assert json.loads(f.readline()) == game_state[0]
+
+    data = path.read_bytes()
+    assert load_replay(path) == game_state
+    assert load_replay(data) == game_state
+    assert load_replay(io.BytesIO(data)) == game_state
+    assert load_replay(io.StringIO(replay.dumps(game_state))) == game_state
+
+
+def test_legacy_json_array_is_still_readable(tmp_path):
+    path = tmp_path / "game_state.json"
+    game_state = play(tmp_path, None)
+    path.write_text(json.dumps(game_state, indent=4))
+    assert load_replay(path) == game_state
+
+
+def test_truncated_replay_keeps_complete_lines(tmp_path):
+    path = tmp_path / "game_state.ndjson"
+    writer = ReplayWriter(str(path), flush=True)
+    writer.header({"settings": {"max_turn": 10}})
+    writer.turn({"turn": 1})
+    writer.turn({"turn": 2})
+    # 書き込み途中で止まった試合（close も final 行もない）
+    with open(path, "a") as f:
+        f.write('{"turn": 3, "rob')
+
+    assert [entry.get("turn") for entry in iter_replay(path)] == [None, 1, 2]
+
+    gz_path = tmp_path / "game_state.ndjson.gz"
+    gz_path.write_bytes(gzip.compress(path.read_bytes())[:-12])
+    assert [entry.get("turn") for entry in iter_replay(gz_path)][:2] == [None, 1]
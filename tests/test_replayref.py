@@ -0,0 +1,54 @@
+import sys
+
+import pytest
+
+sys.path.append('./pcrb')
+
+from app import play_game
+from replay import dumps
+from replayref import CodeStore, ReplayMismatchError, ReplayRef, engine_version
+from robots import robot_05_adaptive_strategist, robot_09_trapster
+
+COUNTER_BOT = """
+turns = 0
+
+def robot_logic(robot, game_info, memos):
+    global turns
+    turns += 1
+    return "attack" if turns % 3 == 0 else "right"
+"""
+
+
+def test_reference_regenerates_the_same_replay():
+    store = CodeStore()
+    codes = store.add_module(robot_05_adaptive_strategist), store.add_module(robot_09_trapster)
+    _, game_state = play_game(robot_05_adaptive_strategist.robot_logic, robot_09_trapster.robot_logic, seed=11)
+
+    ref = ReplayRef.from_game_state(game_state, codes)
+    text = ref.dumps()
+    assert len(text) < 150 and len(dumps(game_state)) > 2000
+    assert ReplayRef.loads(text) == ref and ref.engine == engine_version()
+
+    regenerated = ReplayRef.loads(text).regenerate(store)
+    assert dumps(regenerated[1:]) == dumps(game_state[1:])
+    assert regenerated[0]["settings"]["seed"] == 11
+
+
+def test_code_store_loads_sources_and_detects_mismatches():
+    store = CodeStore()
+    counter = store.add(COUNTER_BOT)
+    trapster = store.add_module(robot_09_trapster)
+    _, game_state = play_game(store.logic(counter), robot_09_trapster.robot_logic, seed=3)
+    ref = ReplayRef.from_game_state(game_state, (counter, trapster))
+
+    # モジュールの状態（turns）が残っているので、同じコードでも結果が変わる
+    with pytest.raises(ReplayMismatchError):
+        ref.regenerate(store)
+    with pytest.raises(KeyError):
+        ref._replace(codes=("0" * 16, trapster)).regenerate(store)
+
+
+def test_timed_out_match_is_not_referenced():
+    _, game_state = play_game(robot_09_trapster.robot_logic, robot_09_trapster.robot_logic, seed=3)
+    game_state[0]["clock"]["Player Robot"]["timeouts"] = 1
+    assert ReplayRef.from_game_state(game_state, ("a", "b")) is None
@@ -0,0 +1,76 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append('./pcrb')
+
+from app import play_game
+from replay import dumps
+from replaystore import ReplayStore, logic_hash
+from robots import robot_03_random_walker, robot_05_adaptive_strategist, robot_09_trapster
+from tournament import round_robin
+
+STRATEGIST = logic_hash(robot_05_adaptive_strategist.robot_logic)
+TRAPSTER = logic_hash(robot_09_trapster.robot_logic)
+WALKER = logic_hash(robot_03_random_walker.robot_logic)
+
+
+def _play(logic1, logic2, seed):
+    return play_game(logic1, logic2, seed=seed)[1]
+
+
+def test_identical_matches_share_one_blob(tmp_path):
+    store = ReplayStore(tmp_path)
+    logic1, logic2 = robot_05_adaptive_strategist.robot_logic, robot_09_trapster.robot_logic
+    digests = store.add_many((_play(logic1, logic2, seed), (STRATEGIST, TRAPSTER)) for seed in (1, 2, 3))
+    # 決定的なロボット同士ならシードが違っても本体は同じ
+    assert len(set(digests)) == 1
+    assert len(store) == 3 and store.blob_count() == 1
+    assert len(list(tmp_path.glob("blobs/*/*.ndjson.gz"))) == 1
+
+    # 同じ試合をもう一度保存しても増えない
+    store.add(_play(logic1, logic2, 1), (STRATEGIST, TRAPSTER))
+    assert len(store) == 3
+
+
+def test_get_returns_the_original_game_state(tmp_path):
+    store = ReplayStore(tmp_path)
+    game_state = _play(robot_03_random_walker.robot_logic, robot_09_trapster.robot_logic, 7)
+    store.add(game_state, (WALKER, TRAPSTER))
+    (record,) = store.find()
+    assert record.seed == 7 and record.turns == game_state[-1]["turn"]
+    assert dumps(store.get(record.id)) == dumps(game_state)
+    # 読み込んだ本体はキャッシュから同じものを返す
+    assert store.turns(record.hash) is store.turns(record.hash)
+
+
+def test_find_by_bot_opponent_seed_and_winner(tmp_path):
+    store = ReplayStore(tmp_path)
+    walker, trapster = robot_03_random_walker.robot_logic, robot_09_trapster.robot_logic
+    store.add_many([
+        (_play(walker, trapster, 1), (WALKER, TRAPSTER)),
+        (_play(trapster, walker, 2), (TRAPSTER, WALKER)),
+        (_play(walker, walker, 3), (WALKER, WALKER)),
+    ])
+    assert [record.seed for record in store.find(bot=TRAPSTER)] == [1, 2]
+    assert [record.seed for record in store.find(bot=WALKER, opponent=TRAPSTER)] == [1, 2]
+    assert [record.seed for record in store.find(bot=WALKER, opponent=WALKER)] == [3]
+    assert [record.seed for record in store.find(seed=2)] == [2]
+    wins = store.find(winner=TRAPSTER)
+    assert wins and all(TRAPSTER in (record.bot1, record.bot2) for record in wins)
+    assert len(store.find(limit=2)) == 2
+
+
+def test_round_robin_saves_replays_from_worker_processes(tmp_path):
+    bots = {
+        "strategist": robot_05_adaptive_strategist.robot_logic,
+        "trapster": robot_09_trapster.robot_logic,
+    }
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = round_robin(bots, rounds=2, executor=executor, seed=5, store=str(tmp_path))
+    store = ReplayStore(tmp_path)
+    assert len(store) == len(results) == 4
+    # 先攻・後攻ごとに同じ本体を共有する
+    assert store.blob_count() == 2
+    for result in results:
+        (record,) = store.find(digest=result["replay"], seed=result["seed"])
+        assert store.get(record.id)[-1]["turn"] == result["turns"]
@@ -0,0 +1,71 @@
+import random
+import sys
+
+sys.path.append('./pcrb')
+
+from robot import Robot
+from controller import GameController
+from rng import call_with_rng, child_seed
+from tournament import parallel_round_robin, round_robin
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_07_basic_bot import robot_logic as basic_logic
+from robots.robot_11_phantom_Jumper import robot_logic as phantom_logic
+from robots.robot_14_invictus import robot_logic as invictus_logic
+
+
+def play(logic1, logic2, seed):
+    controller = GameController(headless=True, seed=seed)
+    robot1 = Robot("Robot A", 1, 3, logic1, controller)
+    robot2 = Robot("Robot B", 7, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    winner, game_state = controller.game_loop()
+    return winner.name, game_state
+
+
+def test_same_seed_reproduces_match():
+    first = play(random_walker_logic, invictus_logic, 42)
+    assert first == play(random_walker_logic, invictus_logic, 42)
+    assert first[1][0]["settings"]["seed"] == 42
+
+    other_seeds = [play(random_walker_logic, invictus_logic, seed)[1] for seed in range(5)]
+    assert any(game_state != first[1] for game_state in other_seeds)
+
+
+def test_teleport_uses_match_rng():
+    assert play(phantom_logic, random_walker_logic, 3) == play(phantom_logic, random_walker_logic, 3)
+
+
+def test_robot_logic_does_not_consume_global_random():
+    random.seed(0)
+    expected = random.random()
+
+    random.seed(0)
+    play(random_walker_logic, invictus_logic, 1)
+    assert random.random() == expected
+
+
+def test_call_with_rng_restores_module_globals():
+    rng = random.Random(5)
+    expected = random.Random(5).choice(["left", "right", "rest"])
+
+    assert call_with_rng(random_walker_logic, rng, None, {}, []) == expected
+    assert random_walker_logic.__globals__["random"] is random
+
+
+def test_child_seed_is_stable():
+    assert child_seed(1, "robot1") == child_seed(1, "robot1")
+    assert child_seed(1, "robot1") != child_seed(1, "robot2")
+    assert 0 <= child_seed(2**70, 3) < 2**63
+
+
+def test_concurrent_matches_with_the_same_random_bot():
+    bots = {"walker": random_walker_logic, "basic": basic_logic, "invictus": invictus_logic}
+    expected = round_robin(bots, rounds=10, seed=5)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # スレッドを頻繁に切り替えて差し替えの競合を起こしやすくする
+    try:
+        for _ in range(5):
+            assert parallel_round_robin(bots, rounds=10, workers=8, seed=5) == expected
+    finally:
+        sys.setswitchinterval(interval)
+    assert random_walker_logic.__globals__["random"] is random
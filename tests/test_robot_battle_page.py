@@ -23,3 +23,16 @@ def test():
             assert winner.name in [PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME]
             assert isinstance(game_state, list)
 
+
+
+def test_saved_robot_battles_return_replay_references():
+    from replayref import CodeStore, ReplayRef
+
+    module = importlib.import_module("robots.robot_07_basic_bot")
+    store = CodeStore()
+    player_code = store.add_module(module)
+    results = robot_battle_page.battle_with_saved_robots(module.robot_logic, 1, store, player_code)
+    assert results and all(isinstance(replay, ReplayRef) for _, _, replay in results)
+
+    game_state = robot_battle_page.open_replay(results[0][2], store)
+    assert game_state[0]["settings"]["seed"] == results[0][2].settings["seed"]
@@ -0,0 +1,61 @@
+import sys
+
+sys.path.append('./pcrb')
+
+import pytest
+
+from robot import Robot, RobotState
+from controller import GameController
+
+
+def test_robot_has_no_instance_dict():
+    controller = GameController(headless=True)
+    robot = Robot("robot", 0, 0, None, controller)
+
+    assert not hasattr(robot, "__dict__")
+    assert isinstance(robot.state, RobotState)
+    with pytest.raises(AttributeError):
+        robot.unknown_attribute = 1
+
+
+def test_action_rules_are_shared_and_state_is_per_robot():
+    controller = GameController(headless=True)
+    robot1 = Robot("robot1", 0, 0, None, controller)
+    robot2 = Robot("robot2", 0, 1, None, controller)
+    controller.set_robots(robot1, robot2)
+
+    assert robot1.parry.rule is robot2.parry.rule
+    assert Robot.parry is robot1.parry.rule
+    assert robot1.attack.cost == 10
+    # 行動のビューはロボットごとに 1 度だけ作る
+    assert robot1.parry is robot1.parry and robot1.parry is not robot2.parry
+    with pytest.raises(AttributeError):
+        robot1.unknown_action
+
+    robot1.parry(1)
+
+    assert robot1.parry.is_active
+    assert robot1.state.parry_cooldown == 2
+    assert not robot2.parry.is_active
+    assert robot2.parry.cooldown_counter == 0
+
+
+def test_bound_action_writes_through_to_state():
+    controller = GameController(headless=True)
+    robot = Robot("robot", 0, 0, None, controller)
+
+    robot.defend.is_active = True
+    assert robot.state.defend_active
+
+    robot.reset(2, 2)
+    assert not robot.defend.is_active
+    assert robot.position == (2, 2)
+    with pytest.raises(AttributeError):
+        robot.attack.is_active = True
+
+
+def test_set_position_without_controller():
+    robot = Robot("robot", 0, 0, None, None)
+
+    robot.set_position(3, 4)
+    assert robot.position == (3, 4)
@@ -0,0 +1,103 @@
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.append('./pcrb')
+
+from actions import ACTIONS
+from batch import BatchEngine
+from constants import PLAYER_ROBOT_NAME, ENEMY_ROBOT_NAME
+from controller import GameController
+from pool import MatchContext
+from robot import Robot
+from ruleset import DEFAULT_RULESET, Ruleset
+from tournament import ruleset_round_robin
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from robots.robot_09_trapster import robot_logic as trapster_logic
+from robots.robot_10_energy_thief import robot_logic as thief_logic
+
+
+CHEAP = DEFAULT_RULESET.variant(name="cheap", initial_hp=60, attack={"cost": 4, "power": 30}, defend={"reduction": 0.25})
+
+
+def returns(action):
+    def robot_logic(robot, game_info, memos):
+        return action
+    return robot_logic
+
+
+def test_default_ruleset_uses_class_attributes():
+    assert DEFAULT_RULESET.attack.cost == ACTIONS.rule("attack").cost
+    assert DEFAULT_RULESET.steal == (10, 15)
+    assert (DEFAULT_RULESET.initial_hp, DEFAULT_RULESET.initial_sp) == (100, 50)
+
+
+def test_json_round_trip(tmp_path):
+    path = tmp_path / "cheap.json"
+    CHEAP.save(path)
+    loaded = Ruleset.load(path)
+    assert loaded == CHEAP and loaded.name == "cheap"
+    assert Ruleset.from_dict({"actions": {"scan": {"duration": 3}}}).scan.duration == 3
+    with open(path) as f:
+        assert json.load(f)["actions"]["attack"] == {"power": 30, "cost": 4}
+
+
+def test_unknown_values_are_rejected():
+    with pytest.raises(ValueError):
+        Ruleset(actions={"attack": {"range": 3}})
+    with pytest.raises(ValueError):
+        DEFAULT_RULESET.variant(fireball={"cost": 1})
+    with pytest.raises(AttributeError):
+        DEFAULT_RULESET.attack = None
+
+
+def test_controller_reads_values_from_ruleset():
+    controller = GameController(headless=True, seed=1, ruleset=CHEAP)
+    robot1 = Robot("Robot A", 3, 3, returns("attack"), controller)
+    robot2 = Robot("Robot B", 4, 3, returns("defend"), controller)
+    controller.set_robots(robot1, robot2)
+    assert robot1.hp == 60
+
+    robot1.attack(robot2, 1)
+    assert (robot1.sp, robot2.hp) == (46, 30)
+    robot2.defend(2)
+    robot1.attack(robot2, 3)
+    assert robot2.hp == 22.5
+    assert controller.game_state[0]["settings"]["ruleset"]["name"] == "cheap"
+    assert "ruleset" not in GameController(headless=True).game_state[0]["settings"]
+
+
+def test_context_switches_rulesets_between_matches():
+    context = MatchContext()
+    default = context.play(trapster_logic, adaptive_logic, seed=3)[1]
+    cheap = context.play(trapster_logic, adaptive_logic, seed=3, ruleset=CHEAP)[1]
+    again = context.play(trapster_logic, adaptive_logic, seed=3)[1]
+    assert default == again
+    assert cheap[1]["robots"][0]["hp"] == 60
+    assert cheap != default
+
+
+def test_ruleset_variants_run_in_parallel():
+    bots = {"trapster": trapster_logic, "thief": thief_logic}
+    rulesets = [DEFAULT_RULESET, CHEAP]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        parallel = ruleset_round_robin(bots, rulesets, rounds=2, executor=executor, seed=5)
+    assert parallel == ruleset_round_robin(bots, rulesets, rounds=2, seed=5)
+    assert set(parallel) == {"default", "cheap"}
+    assert len(parallel["cheap"]) == 4
+
+
+def test_batch_engine_uses_ruleset():
+    seeds = [0, 1, 2]
+    engine = BatchEngine(len(seeds), seeds=seeds, record=True, ruleset=CHEAP)
+    engine.run(thief_logic, adaptive_logic)
+    for row, seed in enumerate(seeds):
+        controller = GameController(headless=True, seed=seed, ruleset=CHEAP)
+        controller.set_robots(
+            Robot(PLAYER_ROBOT_NAME, 1, 3, thief_logic, controller),
+            Robot(ENEMY_ROBOT_NAME, 7, 3, adaptive_logic, controller),
+        )
+        controller.game_loop()
+        assert engine.game_state(row) == controller.game_state
@@ -0,0 +1,104 @@
+import importlib
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append('./pcrb')
+
+from actions import ACTIONS
+from ruletable import RuleError, compile_rules
+from tournament import batch_round_robin
+from app import is_safe_code, play_game
+from table_robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from table_robots.robot_07_basic_bot import robot_logic as basic_logic
+from table_robots.robot_09_trapster import robot_logic as trapster_logic
+
+TABLE_BOTS = ("robot_05_adaptive_strategist", "robot_06_tactician", "robot_07_basic_bot", "robot_09_trapster")
+
+
+class FakeRobot:
+    def __init__(self, x, y, sp, hp=100):
+        self.x, self.y, self.sp, self.hp = x, y, sp, hp
+        self.position = (x, y)
+
+
+class FakeObservation:
+    """BatchObservation と同じ属性を持つ配列の束"""
+
+    def __init__(self, robots, enemies):
+        self.x = np.array([robot.x for robot in robots])
+        self.y = np.array([robot.y for robot in robots])
+        self.sp = np.array([robot.sp for robot in robots])
+        self.hp = np.array([robot.hp for robot in robots])
+        self.enemy_x = np.array([enemy[0] for enemy in enemies])
+        self.enemy_y = np.array([enemy[1] for enemy in enemies])
+        self.enemy_hp = np.full(len(robots), 100)
+        self.scan_active = np.zeros(len(robots), dtype=bool)
+
+
+def game_info(enemy):
+    return {"enemy_position": enemy, "enemy_hp": 100, "turn": 1, "max_turn": 100,
+            "board_size": {"x_max": 9, "y_max": 7}}
+
+
+@pytest.mark.parametrize("logic", [adaptive_logic, basic_logic, trapster_logic])
+def test_policy_agrees_with_robot_logic(logic):
+    rng = np.random.default_rng(0)
+    robots = [FakeRobot(int(x), int(y), int(sp)) for x, y, sp in zip(
+        rng.integers(0, 9, 300), rng.integers(0, 7, 300), rng.integers(0, 60, 300))]
+    enemies = [(int(x), int(y)) for x, y in zip(rng.integers(0, 9, 300), rng.integers(0, 7, 300))]
+
+    expected = [ACTIONS.code(logic(robot, game_info(enemy), [])) for robot, enemy in zip(robots, enemies)]
+    assert logic.batch_policy(FakeObservation(robots, enemies)).tolist() == expected
+
+
+def test_macro_without_match_falls_through():
+    logic = compile_rules([("True", "trap_toward")], default="defend")
+    assert logic(FakeRobot(2, 2, 50), game_info((2, 2)), []) == "defend"
+    assert logic(FakeRobot(2, 2, 50), game_info((2, 4)), []) == "trap_down"
+
+
+def test_cycle_detection_hints():
+    assert basic_logic.deterministic is True
+    assert basic_logic.sp_horizon == 16
+    turn_based = compile_rules([("turn > 10", "attack")])
+    assert not hasattr(turn_based, "deterministic")
+    relative = compile_rules([("sp > enemy_sp", "attack")])
+    assert not hasattr(relative, "sp_horizon")
+
+
+@pytest.mark.parametrize("condition", ["sp < limit", "__import__('os')", "sp / 2 > 1", "sp and distance"])
+def test_rejects_unsupported_conditions(condition):
+    with pytest.raises(RuleError):
+        compile_rules([(condition, "rest")])
+
+
+def test_rejects_unknown_action():
+    with pytest.raises(RuleError):
+        compile_rules([("True", "dance")])
+
+
+def test_batch_round_robin():
+    results = batch_round_robin({"adaptive": adaptive_logic, "trapster": trapster_logic}, matches=20, seed=1)
+
+    assert [(r["robot1"], r["robot2"]) for r in results] == [("adaptive", "trapster"), ("trapster", "adaptive")]
+    assert all(0 <= r["wins"] <= 20 for r in results)
+    assert results == batch_round_robin({"adaptive": adaptive_logic, "trapster": trapster_logic}, matches=20, seed=1)
+
+
+@pytest.mark.parametrize("name", TABLE_BOTS)
+def test_table_bots_play_like_the_hand_written_bots(name):
+    table = importlib.import_module(f"table_robots.{name}").robot_logic
+    hand_written = importlib.import_module(f"robots.{name}").robot_logic
+    opponent = importlib.import_module("robots.robot_14_invictus").robot_logic
+    for seed in (1, 2):
+        assert play_game(table, opponent, seed=seed)[1][1:] == play_game(hand_written, opponent, seed=seed)[1][1:]
+        assert play_game(opponent, table, seed=seed)[1][1:] == play_game(opponent, hand_written, seed=seed)[1][1:]
+
+
+def test_example_bots_are_valid_uploads():
+    # サンプルのボットはアップロードでもそのまま使える（ルール表版は ruletable を import するので対象外）
+    for name in TABLE_BOTS:
+        with open(f"pcrb/robots/{name}.py", encoding="utf-8") as f:
+            assert is_safe_code(f.read())[0]
@@ -0,0 +1,128 @@
+import gc
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append('./pcrb')
+
+from robot import Robot
+from controller import GameController
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_06_tactician import robot_logic as tactician_logic
+
+
+def returns(action):
+    def robot_logic(robot, game_info, memos):
+        return action
+    return robot_logic
+
+
+def setup(action1, action2, pos1, pos2, **settings):
+    controller = GameController(headless=True, seed=1, simultaneous=True, **settings)
+    robot1 = Robot("Robot A", *pos1, returns(action1), controller)
+    robot2 = Robot("Robot B", *pos2, returns(action2), controller)
+    controller.set_robots(robot1, robot2)
+    return controller, robot1, robot2
+
+
+def test_moves_into_the_same_cell_both_fail():
+    controller, robot1, robot2 = setup("right", "left", (2, 3), (4, 3))
+    controller.run_simultaneous()
+    assert (robot1.position, robot2.position) == ((2, 3), (4, 3))
+    assert (robot1.sp, robot2.sp) == (50, 50)
+
+
+def test_swapping_positions_fails():
+    controller, robot1, robot2 = setup("right", "left", (3, 3), (4, 3))
+    controller.run_simultaneous()
+    assert (robot1.position, robot2.position) == ((3, 3), (4, 3))
+
+
+def test_move_into_vacated_cell_succeeds():
+    controller, robot1, robot2 = setup("right", "down", (3, 3), (4, 3))
+    controller.run_simultaneous()
+    assert (robot1.position, robot2.position) == ((4, 3), (4, 4))
+
+
+def test_attack_hits_after_move():
+    controller, robot1, robot2 = setup("attack", "left", (2, 3), (4, 3))
+    controller.run_simultaneous()
+    assert robot2.position == (3, 3)
+    assert robot2.hp == 80
+
+
+def test_parry_counters_attack_in_the_same_turn():
+    controller, robot1, robot2 = setup("attack", "parry", (3, 3), (4, 3))
+    controller.run_simultaneous()
+    assert robot2.hp == 100
+    assert robot1.stun_counter > 0
+
+
+def test_mutual_knockout():
+    controller, robot1, robot2 = setup("attack", "attack", (3, 3), (4, 3), max_turn=10)
+    robot1._hp = robot2._hp = 20
+    winner, game_state = controller.game_loop()
+    assert robot1.hp == robot2.hp == 0
+    assert winner is robot2  # 同点は従来どおり robot2
+    assert len(game_state) == 3  # 設定・初期状態・1 ターン目
+    assert [entry["action"] for entry in game_state[2]["actions"]] == ["attack", "attack"]
+    assert bytes(controller.action_codes) == bytes([0, 2, 2])
+
+
+def test_both_robots_see_the_same_turn():
+    seen = []
+
+    def recording(robot, game_info, memos):
+        seen.append((robot.name, game_info["turn"], game_info["enemy_position"]))
+        return "rest", {"turn": game_info["turn"]}
+
+    controller = GameController(headless=True, seed=1, simultaneous=True, max_turn=4)
+    robot1 = Robot("Robot A", 1, 3, recording, controller)
+    robot2 = Robot("Robot B", 7, 3, recording, controller)
+    controller.set_robots(robot1, robot2)
+    controller.game_loop()
+    assert seen == [
+        ("Robot A", 1, (7, 3)), ("Robot B", 1, (1, 3)),
+        ("Robot A", 2, (7, 3)), ("Robot B", 2, (1, 3)),
+        ("Robot A", 3, (7, 3)), ("Robot B", 3, (1, 3)),
+    ]
+    assert len(controller.memos1) == len(controller.memos2) == 3
+
+
+def test_bots_are_evaluated_concurrently():
+    def sleeping(robot, game_info, memos):
+        time.sleep(0.05)
+        return "rest"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        controller = GameController(headless=True, seed=1, simultaneous=True, max_turn=5, executor=executor)
+        controller.set_robots(
+            Robot("Robot A", 1, 3, sleeping, controller),
+            Robot("Robot B", 7, 3, sleeping, controller),
+        )
+        gc.disable()  # 計測中に世代別 GC の全体回収（テスト全体では 0.2 秒ほど）が入らないようにする
+        try:
+            start = time.perf_counter()
+            controller.game_loop()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+    # 4 ターン × 2 体を順に呼ぶと 0.4 秒かかる
+    assert elapsed < 0.35
+
+
+def test_seeded_match_is_reproducible_with_executor():
+    def play(executor):
+        controller = GameController(headless=True, seed=5, simultaneous=True, max_turn=60, executor=executor)
+        controller.set_robots(
+            Robot("Robot A", 1, 3, random_walker_logic, controller),
+            Robot("Robot B", 7, 3, tactician_logic, controller),
+        )
+        winner, game_state = controller.game_loop()
+        return winner.name, game_state, bytes(controller.action_codes)
+
+    sequential = play(None)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert play(executor) == sequential
+    assert sequential == play(None)
+    assert len(sequential[2]) == 1 + 2 * (len(sequential[1]) - 2)
@@ -0,0 +1,78 @@
+import sys
+
+sys.path.append('./pcrb')
+
+from robot import Robot
+from controller import GameController
+from replay import dumps, load_replay
+from sinks import BufferSink, CallbackSink, legacy_sink
+
+
+def robot_logic(robot, game_info, memos):
+    enemy_position = game_info['enemy_position']
+    if robot.sp < 20:
+        return "rest"
+    elif abs(robot.position[0] - enemy_position[0]) + abs(robot.position[1] - enemy_position[1]) == 1:
+        return "attack"
+    elif robot.position[0] < enemy_position[0]:
+        return "right"
+    else:
+        return "left"
+
+
+def play(controller):
+    robot1 = Robot("Robot A", 1, 3, robot_logic, controller)
+    robot2 = Robot("Robot B", 7, 3, robot_logic, controller)
+    controller.set_robots(robot1, robot2)
+    return controller.game_loop()
+
+
+def test_headless_does_not_print_or_write_files(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    winner, game_state = play(GameController(max_turn=30, headless=True))
+
+    assert capsys.readouterr().out == ""
+    assert list(tmp_path.iterdir()) == []
+    assert game_state[-1]["robots"][0]["name"] == "Robot A"
+
+
+def test_buffer_sink_collects_logs_and_states():
+    sink = BufferSink()
+    _, game_state = play(GameController(max_turn=30, sink=sink))
+
+    assert sink.states == game_state[1:]
+    assert any("moved right" in message for _, message in sink.lines)
+    assert sink.text().startswith("Turn 1: ")
+
+
+def test_callback_sink_receives_final_game_state():
+    finished = []
+    _, game_state = play(GameController(max_turn=10, sink=CallbackSink(on_finish=finished.append)))
+
+    assert finished == [game_state]
+
+
+def test_legacy_sink_truncates_old_log(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    log = tmp_path / "game_log.txt"
+    log.write_text("Turn 1: from an earlier session\n")
+
+    sink = legacy_sink()
+    assert log.read_text() == ""
+
+    sink.log(1, "hello")
+    sink.reset()
+    assert log.read_text() == ""
+
+
+def test_default_controller_keeps_writing_game_state_json(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+
+    _, game_state = play(GameController(max_turn=10))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["game_log.txt", "game_state.json"]
+    # ファイル名は従来のままで、中身は NDJSON
+    lines = (tmp_path / "game_state.json").read_text().splitlines()
+    assert len(lines) > 1 and all(line.startswith("{") for line in lines)
+    assert dumps(load_replay(str(tmp_path / "game_state.json"))) == dumps(game_state)
@@ -0,0 +1,73 @@
+import sys
+import json
+import os
+import random
+
+sys.path.append('./pcrb')
+
+from robot import Robot
+from controller import GameController
+from sinks import RotatingFileSink
+
+
+def walker_with_memo(robot, game_info, memos):
+    # 倒れずに最後まで続き、毎ターンメモを書くロボット
+    return random.choice(["left", "right", "rest"]), {"turn": game_info["turn"]}
+
+
+def play(max_turn, **kwargs):
+    controller = GameController(max_turn=max_turn, seed=4, **kwargs)
+    controller.set_robots(
+        Robot("Robot A", 1, 3, walker_with_memo, controller),
+        Robot("Robot B", 7, 3, walker_with_memo, controller),
+    )
+    winner, game_state = controller.game_loop()
+    return controller, winner, game_state
+
+
+def test_soak_mode_keeps_only_latest_state_and_bounded_memos():
+    controller, winner, game_state = play(5000, headless=True, soak=True, memo_limit=10)
+    assert len(game_state) == 2
+    assert game_state[-1]["turn"] == 4999
+    assert len(controller.action_codes) == 0
+    assert 10 <= len(controller.memos1) < 20
+    assert controller.memos1[-1] == {"turn": 4999}
+
+    full, full_winner, full_state = play(5000, headless=True)
+    assert full_state[-1] == game_state[-1]
+    assert full_winner.name == winner.name
+    assert game_state[0]["settings"] == full_state[0]["settings"]
+
+
+def test_soak_mode_keeps_the_event_log_bounded():
+    controller, _, game_state = play(5000, headless=True, soak=True, events=True)
+    assert len(controller.events) <= 256 and controller.events.capacity <= 512
+
+    # 捨てたイベントも集計には残る
+    full, _, full_state = play(5000, headless=True, events=True)
+    assert len(full.events) > 1000
+    assert game_state[0]["events"] == full_state[0]["events"]
+
+
+def test_memo_limit_without_soak():
+    controller, _, game_state = play(300, headless=True, memo_limit=5)
+    assert len(game_state) == 301
+    assert 5 <= len(controller.memos2) < 10
+    assert controller.memos2[-1] == {"turn": 298}
+
+
+def test_rotating_sink_bounds_files(tmp_path):
+    log_path = str(tmp_path / "game_log.txt")
+    state_path = str(tmp_path / "game_state.ndjson")
+    sink = RotatingFileSink(log_path, state_path, max_bytes=20_000, backup_count=2)
+    play(3000, sink=sink, soak=True)
+
+    names = sorted(os.listdir(tmp_path))
+    assert names == [
+        "game_log.txt", "game_log.txt.1", "game_log.txt.2",
+        "game_state.ndjson", "game_state.ndjson.1", "game_state.ndjson.2",
+    ]
+    assert all(os.path.getsize(tmp_path / name) <= 20_000 for name in names)
+    with open(state_path) as f:
+        last = json.loads(f.read().splitlines()[-1])
+    assert last["turn"] == 2999
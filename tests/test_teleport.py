@@ -5,6 +5,7 @@ sys.path.append('./')
 
 from pcrb.robot import Robot
 from pcrb.controller import GameController
+from pcrb.sinks import NullSink  # game_log.txt などをリポジトリに書き出さない
 from pcrb.constants import PLAYER_ROBOT_NAME
 
 
@@ -16,7 +17,7 @@ def robot_logic(robot, game_info, memos):
 
 
 def test_teleport():
-    controller = GameController()
+    controller = GameController(sink=NullSink())
 
     # ロボットの初期位置
     robot_a = Robot(PLAYER_ROBOT_NAME, 1, 1, robot_logic, controller)
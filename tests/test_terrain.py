@@ -0,0 +1,110 @@
+import sys
+import random
+
+sys.path.append('./pcrb')
+
+from board import Board
+from robot import Robot
+from controller import GameController
+from terrain import Terrain, UNREACHABLE, load_map
+from draw import draw_board_v2
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_06_tactician import robot_logic as tactician_logic
+
+MAP = """
+#######
+#A.#..#
+#..#.B#
+#.....#
+#######
+"""
+
+
+def rest(robot, game_info, memos):
+    return "rest"
+
+
+def test_map_text_is_parsed():
+    terrain = Terrain.from_text(MAP)
+    assert (terrain.x_max, terrain.y_max) == (7, 5)
+    assert terrain.starts == {"A": (1, 1), "B": (5, 2)}
+    assert terrain.is_wall(3, 1) and not terrain.is_wall(3, 3)
+
+
+def test_distance_field_goes_around_walls_and_is_cached():
+    terrain = Terrain.from_text(MAP)
+    assert terrain.distance((2, 1), (4, 1)) == 6  # 壁を回り込む
+    assert terrain.distance((0, 0), (4, 1)) == UNREACHABLE
+    assert terrain.distance_field((4, 1)) is terrain.distance_field((4, 1))
+    assert terrain.next_steps((2, 1), (4, 1)) == [(0, 1)]
+    # 罠を避けると遠回りになる
+    assert terrain.distance((1, 3), (5, 3), avoid=[(3, 3)]) == UNREACHABLE
+    assert terrain.distance((2, 1), (4, 1), avoid=[(1, 3)]) == 6
+
+
+def test_distance_field_ignores_cells_off_the_map():
+    terrain = Terrain.from_text(MAP)
+    # (8, 1) は 1 行下の床 (1, 2) に回り込まない
+    assert set(terrain.distance_field((8, 1))) == {UNREACHABLE}
+    assert set(terrain.distance_field((2, 5))) == {UNREACHABLE}
+    assert terrain.distance((2, 1), (4, 1), avoid=[(9, 2)]) == 6  # (2, 3) を塞がない
+
+
+def test_precompute_covers_every_floor_cell():
+    terrain = Terrain.from_text(MAP, max_fields=2)
+    terrain.precompute()
+    floor = sum(1 for wall in terrain.walls if not wall)
+    assert len(terrain._fields) == floor
+
+
+def test_load_map_shares_terrain():
+    assert load_map("crossroads.txt") is load_map("crossroads.txt")
+
+
+def test_walls_block_moves_traps_and_teleports():
+    controller = GameController(headless=True, seed=1, terrain=Terrain.from_text(MAP))
+    robot1 = Robot("Robot A", 2, 1, rest, controller)
+    robot2 = Robot("Robot B", 5, 2, rest, controller)
+    controller.set_robots(robot1, robot2)
+
+    robot1.move("right", 1)
+    assert robot1.position == (2, 1) and robot1.sp == 50
+    robot1.trap("trap_right", 1)
+    assert not robot1.trap.traps
+
+    board = Board(3, 1, walls=bytes([0, 1, 0]))
+    rng = random.Random(0)
+    assert {board.random_free_cell(rng) for _ in range(50)} == {(0, 0), (2, 0)}
+
+
+def test_game_info_carries_next_step_and_distance():
+    controller = GameController(headless=True, seed=1, terrain=Terrain.from_text(MAP))
+    robot1 = Robot("Robot A", 2, 1, rest, controller)
+    robot2 = Robot("Robot B", 4, 1, rest, controller)
+    controller.set_robots(robot1, robot2)
+
+    info = controller.build_game_info(robot1)
+    assert info["enemy_distance"] == 6
+    assert info["next_step"] == "down"
+    # robot2 の "up" は "down" に補正されるので、補正後に下へ動く行動名を返す
+    info = controller.build_game_info(robot2)
+    assert info["next_step"] == "up"
+
+
+def test_match_on_map_file_keeps_robots_off_walls():
+    controller = GameController(headless=True, seed=3, terrain="crossroads.txt", max_turn=200)
+    assert controller.robot1_initial_position == {"x": 1, "y": 1}
+    pos1, pos2 = controller.robot1_initial_position, controller.robot2_initial_position
+    controller.set_robots(
+        Robot("Robot A", pos1["x"], pos1["y"], random_walker_logic, controller),
+        Robot("Robot B", pos2["x"], pos2["y"], tactician_logic, controller),
+    )
+    _, game_state = controller.game_loop()
+    terrain = controller.terrain
+    for entry in game_state[1:]:
+        for robot in entry["robots"]:
+            assert not terrain.is_wall(*robot["position"])
+    walls = game_state[0]["settings"]["walls"]
+    fig = draw_board_v2(game_state[-1], terrain.x_max, terrain.y_max,
+                        red_robot_name="Robot A", blue_robot_name="Robot B", is_show=False, walls=walls)
+    assert fig is not None
@@ -0,0 +1,145 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.append('./pcrb')
+
+import zobrist
+from actions import ACTIONS
+from controller import GameController
+from robot import Robot
+from robots.robot_03_random_walker import robot_logic as random_walker_logic
+from robots.robot_05_adaptive_strategist import robot_logic as adaptive_logic
+from robots.robot_09_trapster import robot_logic as trapster_logic
+from robots.robot_10_energy_thief import robot_logic as thief_logic
+from robots.robot_11_phantom_Jumper import robot_logic as jumper_logic
+from robots.robot_13_strategic_scanner import robot_logic as scanner_logic
+from sinks import CallbackSink
+
+
+def setup(logic1, logic2, seed=1, **settings):
+    controller = GameController(headless=True, seed=seed, **settings)
+    robot1 = Robot("Robot A", 1, 3, logic1, controller)
+    robot2 = Robot("Robot B", 7, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    return controller, robot1, robot2
+
+
+@pytest.mark.parametrize("simultaneous", [False, True])
+@pytest.mark.parametrize("logic1, logic2", [
+    (trapster_logic, thief_logic),
+    (jumper_logic, scanner_logic),
+    (adaptive_logic, random_walker_logic),
+])
+def test_incremental_hash_matches_full_recomputation(logic1, logic2, simultaneous):
+    mismatches = []
+
+    def check(state):
+        for robot in (robot1, robot2):
+            if robot.zobrist_hash != zobrist.snapshot_hash(robot.snapshot()):
+                mismatches.append((state["turn"], robot.name))
+
+    controller = GameController(sink=CallbackSink(on_state=check), seed=5, max_turn=60, simultaneous=simultaneous)
+    robot1 = Robot("Robot A", 1, 3, logic1, controller)
+    robot2 = Robot("Robot B", 7, 3, logic2, controller)
+    controller.set_robots(robot1, robot2)
+    controller.game_loop()
+
+    assert mismatches == []
+
+
+ZOO = sorted(
+    name[:-3] for name in os.listdir(os.path.join(os.path.dirname(__file__), "..", "pcrb", "robots"))
+    if name.startswith("robot_") and name.endswith(".py"))
+
+
+def every_action_logic(robot, game_info, memos):
+    # 見本のロボットが使わない parry / scan なども含め、全ての行動を順に試す
+    names = ACTIONS.names()
+    if robot.sp < 30:
+        return "rest"
+    return names[game_info["turn"] // 2 % len(names)]
+
+
+def zoo_logic(name):
+    if name == "every_action":
+        return every_action_logic
+    return importlib.import_module(f"robots.{name}").robot_logic
+
+
+@pytest.mark.parametrize("name1", ZOO + ["every_action"])
+def test_hash_matches_full_recomputation_across_the_zoo(name1):
+    # 差分更新が漏れていないか、全ロボットの総当たりで毎ターン一から計算し直して比べる
+    mismatches = []
+
+    def check(state):
+        for robot in (robot1, robot2):
+            if robot.zobrist_hash != zobrist.snapshot_hash(robot.snapshot()):
+                mismatches.append((name1, name2, state["turn"], robot.name))
+
+    for name2 in ZOO + ["every_action"]:
+        controller = GameController(sink=CallbackSink(on_state=check), seed=7)
+        robot1 = Robot("Robot A", 1, 3, zoo_logic(name1), controller)
+        robot2 = Robot("Robot B", 7, 3, zoo_logic(name2), controller)
+        controller.set_robots(robot1, robot2)
+        controller.game_loop()
+
+    assert mismatches == []
+
+
+def test_hash_depends_on_state_only():
+    controller, robot1, robot2 = setup(trapster_logic, thief_logic)
+    start = controller.state_hash()
+    snapshots = robot1.snapshot(), robot2.snapshot()
+
+    robot1.move("right", 1)
+    robot1.trap("trap_up", 1)
+    assert controller.state_hash() != start
+
+    robot1.restore(snapshots[0])
+    robot2.restore(snapshots[1])
+    assert controller.state_hash() == start
+    # 手番の偶奇も区別する
+    controller.turn += 1
+    assert controller.state_hash() != start
+    # 防御で小数になった HP も整数と同じ値として扱う
+    assert zobrist.key("hp", 90.0) == zobrist.key("hp", 90)
+
+
+def test_replay_hashes_and_first_divergence():
+    _, game_state1 = setup(adaptive_logic, random_walker_logic, seed=3, hash_states=True)[0].game_loop()
+    _, game_state2 = setup(adaptive_logic, random_walker_logic, seed=3, hash_states=True)[0].game_loop()
+    _, game_state3 = setup(adaptive_logic, random_walker_logic, seed=4, hash_states=True)[0].game_loop()
+
+    assert all(len(entry["hash"]) == 16 for entry in game_state1[1:])
+    assert zobrist.first_divergence(game_state1, game_state2) is None
+    turn = zobrist.first_divergence(game_state1, game_state3)
+    assert turn is not None
+    assert [entry["hash"] for entry in game_state1[1:turn + 1]] == [entry["hash"] for entry in game_state3[1:turn + 1]]
+
+
+def test_keys_are_computed_without_a_table():
+    # 上限のない値（SP など）でも表に覚えないので、長い試合でメモリが増えない
+    keys = {zobrist.key("sp", sp) for sp in range(100_000)}
+    assert len(keys) == 100_000
+    assert zobrist.key("sp", 10**6) != zobrist.key("hp", 10**6)
+    assert zobrist.key("trap", (1, 2)) != zobrist.key("trap", (2, 1))
+    assert not hasattr(zobrist.KEYS["sp"], "__dict__")
+
+
+def test_hash_is_computed_on_demand_and_kept_up_to_date():
+    controller, robot1, _ = setup(trapster_logic, thief_logic)
+    snapshot = robot1.snapshot()
+    before = robot1.zobrist_hash
+
+    robot1.restore(snapshot)
+    assert robot1.zobrist_hash == before
+    # 計算済みのハッシュはルールの書き換えで差分更新される
+    robot1.parry(1)
+    robot1.trap("trap_up", 1)
+    robot1.defend.is_active = True
+    assert robot1.zobrist_hash == zobrist.snapshot_hash(robot1.snapshot())
+    robot1.start_turn()
+    assert robot1.zobrist_hash == zobrist.snapshot_hash(robot1.snapshot())